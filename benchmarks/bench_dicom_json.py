@@ -0,0 +1,49 @@
+import io
+import json
+
+import pytest
+from pydicom import dcmread
+
+from pydicomutils.IODs.EnhancedSRTID1500 import EnhancedSRTID1500
+
+from bench_structured_reports import build_enhanced_sr_tid_1500_in_bulk
+
+"""Size of the report converted to DICOM JSON, the route through a file
+and dcmread takes minutes beyond this
+"""
+NUMBER_OF_MEASUREMENT_GROUPS = 10000
+
+
+@pytest.fixture(scope="module")
+def enhanced_sr(reference_ct_files):
+    return build_enhanced_sr_tid_1500_in_bulk(
+        reference_ct_files, NUMBER_OF_MEASUREMENT_GROUPS
+    )
+
+
+def to_dicom_json_via_file(iod):
+    """DICOM JSON as it was created before IOD.to_dicom_json"""
+    return json.dumps(dcmread(io.BytesIO(iod.to_bytes())).to_json_dict())
+
+
+def bench_enhanced_sr_tid_1500_to_dicom_json_via_file(benchmark, enhanced_sr):
+    # a single round, it takes more than a minute
+    benchmark.pedantic(to_dicom_json_via_file, args=(enhanced_sr,), rounds=1)
+
+
+@pytest.mark.parametrize("encoder", ["json", "orjson"])
+def bench_enhanced_sr_tid_1500_to_dicom_json(track, enhanced_sr, encoder):
+    if encoder == "orjson":
+        pytest.importorskip("orjson")
+    track(enhanced_sr.to_dicom_json, encoder=encoder)
+
+
+def bench_enhanced_sr_tid_1500_from_dicom_json(benchmark, enhanced_sr):
+    json_dataset = enhanced_sr.to_dicom_json()
+    result = benchmark.pedantic(
+        EnhancedSRTID1500.from_dicom_json,
+        args=(json_dataset,),
+        kwargs={"new_instance": False},
+        rounds=3,
+    )
+    assert len(result.imaging_measurements.children) == NUMBER_OF_MEASUREMENT_GROUPS
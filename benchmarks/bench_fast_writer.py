@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pydicomutils.IODs.CSPS import CSPS
+from pydicomutils.IODs.GSPS import GSPS
+from pydicomutils.IODs.IOD import IODTypes
+
+from bench_images import (
+    build_cr_image,
+    build_ct_image,
+    build_enhanced_ct_image,
+    build_sc_image,
+    build_wsm_image,
+)
+from bench_presentation_states import build_presentation_state
+from bench_structured_reports import (
+    build_basic_sr_text,
+    build_comprehensive_3d_sr_tid_1500,
+    build_enhanced_sr_tid_1500,
+    build_kos,
+)
+from conftest import write_to_buffer
+
+"""Builders of one instance of each IOD, by IOD type. There is no IOD
+class for the Comprehensive SR.
+"""
+BUILDERS = {
+    IODTypes.CRImage: lambda refs: build_cr_image(
+        np.zeros((512, 512), dtype=np.uint16)
+    ),
+    IODTypes.CTImage: lambda refs: build_ct_image(
+        np.zeros((512, 512), dtype=np.uint16)
+    ),
+    IODTypes.EnhancedCTImage: lambda refs: build_enhanced_ct_image(
+        np.zeros((8, 256, 256), dtype=np.uint16)
+    ),
+    IODTypes.SCImage: lambda refs: build_sc_image(
+        np.zeros((256, 256, 3), dtype=np.uint8)
+    ),
+    IODTypes.GSPS: lambda refs: build_presentation_state(GSPS, refs, 100),
+    IODTypes.CSPS: lambda refs: build_presentation_state(CSPS, refs, 100),
+    IODTypes.BasicTextSR: lambda refs: build_basic_sr_text(refs[:1], 100),
+    IODTypes.EnhancedSR: lambda refs: build_enhanced_sr_tid_1500(refs, 100),
+    IODTypes.Comprehensive3DSR: lambda refs: build_comprehensive_3d_sr_tid_1500(
+        refs, 100
+    ),
+    IODTypes.KOS: lambda refs: build_kos(refs),
+    IODTypes.WSMImage: lambda refs: build_wsm_image(
+        np.zeros((1024, 1024, 3), dtype=np.uint8), (256, 256)
+    ),
+}
+
+
+@pytest.mark.parametrize("fast", [False, True])
+@pytest.mark.parametrize("iod_type", list(BUILDERS), ids=lambda iod_type: iod_type.name)
+def bench_write(track, reference_ct_files, iod_type, fast):
+    iod = BUILDERS[iod_type](reference_ct_files)
+    # the fast writer gives the same bytes as dcmwrite
+    assert iod.to_bytes(fast=True) == iod.to_bytes()
+    track(write_to_buffer, iod, fast=fast)
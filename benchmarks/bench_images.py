@@ -0,0 +1,138 @@
+import io
+
+import numpy as np
+import pytest
+
+from pydicomutils.IODs.CRImage import CRImage
+from pydicomutils.IODs.CTImage import CTImage
+from pydicomutils.IODs.EnhancedCTImage import EnhancedCTImage
+from pydicomutils.IODs.SCImage import SCImage
+from pydicomutils.IODs.WSMImage import WSMImage
+from pydicomutils.geometry import VolumeGeometry
+from pydicomutils.io.series_export import export_series
+from pydicomutils.io.series_writer import SeriesWriter
+from pydicomutils.uid_generator import generate_uid
+
+from conftest import write_to_buffer
+
+
+def build_ct_image(pixel_array):
+    ct_image = CTImage()
+    ct_image.create_empty_iod()
+    ct_image.initiate()
+    ct_image.add_pixel_data(pixel_array)
+    return ct_image
+
+
+def build_enhanced_ct_image(pixel_array):
+    enhanced_ct_image = EnhancedCTImage()
+    enhanced_ct_image.create_empty_iod()
+    enhanced_ct_image.initiate()
+    enhanced_ct_image.add_pixel_data(pixel_array)
+    return enhanced_ct_image
+
+
+def build_cr_image(pixel_array):
+    cr_image = CRImage()
+    cr_image.create_empty_iod()
+    cr_image.initiate()
+    cr_image.add_pixel_data(pixel_array)
+    return cr_image
+
+
+def build_sc_image(pixel_array):
+    sc_image = SCImage()
+    sc_image.create_empty_iod()
+    sc_image.initiate()
+    sc_image.add_pixel_data(pixel_array, photometric_interpretation="RGB")
+    return sc_image
+
+
+def build_wsm_image(pixel_array, tile_size):
+    wsm_image = WSMImage()
+    wsm_image.create_empty_iod()
+    wsm_image.initiate()
+    wsm_image.add_pixel_data(
+        pixel_array,
+        photometric_interpretation="RGB",
+        pixel_spacing=[0.0005, 0.0005],
+        tile_size=tile_size,
+    )
+    return wsm_image
+
+
+def bench_ct_image_build(track):
+    pixel_array = np.zeros((512, 512), dtype=np.uint16)
+    track(build_ct_image, pixel_array)
+
+
+def bench_ct_image_build_and_write(track):
+    pixel_array = np.zeros((512, 512), dtype=np.uint16)
+    track(lambda: write_to_buffer(build_ct_image(pixel_array)))
+
+
+def bench_ct_series_build_and_write(track):
+    pixel_array = np.zeros((64, 512, 512), dtype=np.uint16)
+    track(
+        lambda: [
+            write_to_buffer(build_ct_image(slice_array)) for slice_array in pixel_array
+        ]
+    )
+
+
+def bench_ct_series_write_with_series_writer(track):
+    pixel_array = np.zeros((64, 512, 512), dtype=np.uint16)
+
+    def write_series():
+        writer = SeriesWriter(build_ct_image(pixel_array[0]))
+        for ind, slice_array in enumerate(pixel_array):
+            writer.write(
+                io.BytesIO(),
+                SOPInstanceUID=generate_uid(),
+                InstanceNumber=str(ind + 1),
+                ImagePositionPatient=["0.0", "0.0", str(float(ind))],
+                PixelData=slice_array,
+            )
+
+    track(write_series)
+
+
+@pytest.mark.parametrize("num_workers", [1, 4])
+def bench_ct_series_export(track, tmp_path, num_workers):
+    pixel_array = np.zeros((64, 512, 512), dtype=np.uint16)
+    track(
+        lambda: export_series(
+            build_ct_image(pixel_array[0]),
+            pixel_array,
+            tmp_path,
+            geometry=VolumeGeometry(np.eye(4)),
+            num_workers=num_workers,
+        )
+    )
+
+
+def bench_enhanced_ct_image_build_and_write(track):
+    pixel_array = np.zeros((64, 512, 512), dtype=np.uint16)
+    track(lambda: write_to_buffer(build_enhanced_ct_image(pixel_array)))
+
+
+def bench_cr_image_build_and_write(track):
+    pixel_array = np.zeros((2048, 2048), dtype=np.uint16)
+    track(lambda: write_to_buffer(build_cr_image(pixel_array)))
+
+
+def bench_sc_image_build_and_write(track):
+    pixel_array = np.zeros((1024, 1024, 3), dtype=np.uint8)
+    track(lambda: write_to_buffer(build_sc_image(pixel_array)))
+
+
+@pytest.mark.parametrize("tile_size", [(256, 256), (512, 512), (1024, 1024)])
+def bench_wsm_image_build(track, tile_size):
+    pixel_array = np.zeros((2048, 2048, 3), dtype=np.uint8)
+    track(build_wsm_image, pixel_array, tile_size)
+
+
+@pytest.mark.parametrize("tile_size", [(256, 256), (512, 512), (1024, 1024)])
+def bench_wsm_image_build_and_write(track, tile_size):
+    pixel_array = np.zeros((2048, 2048, 3), dtype=np.uint8)
+    track(lambda: write_to_buffer(build_wsm_image(pixel_array, tile_size)))
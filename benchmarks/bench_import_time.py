@@ -0,0 +1,77 @@
+import subprocess
+import sys
+
+import pytest
+
+MODULES = [
+    "pydicomutils.IODs",
+    "pydicomutils.IODs.CTImage",
+    "pydicomutils.IODs.WSMImage",
+    "pydicomutils.IODs.EnhancedCTImage",
+    "pydicomutils.IODs.EnhancedSRTID1500",
+    "pydicomutils.IODs.Comprehensive3DSRTID1500",
+]
+
+"""Modules only needed to write, convert or run IODs, imported where they are
+used and not by importing any IOD. numpy is not among them, pydicom imports
+it if it is installed.
+"""
+DEFERRED_MODULES = [
+    "asyncio",
+    "orjson",
+    "pydicomutils.geometry",
+    "pydicomutils.io.async_io",
+    "pydicomutils.io.deflate",
+    "pydicomutils.io.dicom_json",
+    "pydicomutils.io.fast_writer",
+    "pydicomutils.io.sr_stream",
+]
+
+
+def import_time(module):
+    """Import a module in a fresh interpreter with python -X importtime
+
+    Arguments:
+        module {str} -- Name of module to import
+
+    Returns:
+        dict -- Cumulative import time in microseconds of the module itself,
+                of the pydicomutils modules and of the whole import, and the
+                DEFERRED_MODULES that were imported
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    times = dict()
+    total_time = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # the names of nested imports are indented, top level imports are not
+        if not name[1:].startswith(" "):
+            total_time += int(cumulative)
+        times[name.strip()] = int(cumulative)
+    return {
+        "module_us": times[module],
+        "pydicom_us": times.get("pydicom", 0),
+        "total_us": total_time,
+        "deferred_modules": [name for name in DEFERRED_MODULES if name in times],
+    }
+
+
+@pytest.mark.parametrize("module", MODULES)
+def bench_import_time(benchmark, module):
+    """Wall time of starting an interpreter and importing a module
+
+    The -X importtime breakdown of the last run is stored as extra info.
+    None of the DEFERRED_MODULES may be imported with the module.
+    """
+    result = benchmark.pedantic(import_time, args=(module,), rounds=5)
+    benchmark.extra_info.update(result)
+    assert not result["deferred_modules"]
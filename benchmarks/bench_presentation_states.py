@@ -0,0 +1,53 @@
+import pytest
+
+from pydicomutils.IODs.CSPS import CSPS
+from pydicomutils.IODs.GSPS import GSPS
+
+from conftest import write_to_buffer
+
+NUMBER_OF_OBJECTS = [10, 100, 1000]
+
+
+def build_presentation_state(iod_class, referenced_dcm_files, number_of_objects):
+    presentation_state = iod_class()
+    presentation_state.create_empty_iod()
+    presentation_state.initiate(referenced_dcm_files)
+    presentation_state.add_graphical_layer("BENCHMARK", 1)
+    for ind in range(number_of_objects):
+        referenced_dcm_file = referenced_dcm_files[ind % len(referenced_dcm_files)]
+        if ind % 2 == 0:
+            presentation_state.add_graphic_object(
+                referenced_dcm_file,
+                "BENCHMARK",
+                [10.0, 10.0, 100.0, 10.0, 100.0, 100.0, 10.0, 100.0, 10.0, 10.0],
+                "POLYLINE",
+                cielab_value=[65535, 32768, 32768],
+                line_thickness=2.0,
+            )
+        else:
+            presentation_state.add_text_object(
+                referenced_dcm_file,
+                "BENCHMARK",
+                f"Finding {ind}",
+                [50.0, 50.0],
+                cielab_value=[65535, 32768, 32768],
+            )
+    return presentation_state
+
+
+@pytest.mark.parametrize("number_of_objects", NUMBER_OF_OBJECTS)
+def bench_gsps_build_and_write(track, reference_ct_files, number_of_objects):
+    track(
+        lambda: write_to_buffer(
+            build_presentation_state(GSPS, reference_ct_files, number_of_objects)
+        )
+    )
+
+
+@pytest.mark.parametrize("number_of_objects", NUMBER_OF_OBJECTS)
+def bench_csps_build_and_write(track, reference_ct_files, number_of_objects):
+    track(
+        lambda: write_to_buffer(
+            build_presentation_state(CSPS, reference_ct_files, number_of_objects)
+        )
+    )
@@ -0,0 +1,208 @@
+import io
+
+import numpy as np
+import pytest
+
+from pydicomutils.IODs.BasicSRText import BasicSRText
+from pydicomutils.IODs.Comprehensive3DSRTID1500 import Comprehensive3DSRTID1500
+from pydicomutils.IODs.EnhancedSRTID1500 import EnhancedSRTID1500
+from pydicomutils.IODs.KOS import KOS
+from pydicomutils.IODs.sequences.Sequences import ConceptCodeSequenceItem
+
+from conftest import write_to_buffer
+
+NUMBER_OF_MEASUREMENT_GROUPS = [10, 100, 1000]
+
+
+def build_kos(referenced_dcm_files):
+    kos = KOS()
+    kos.create_empty_iod()
+    kos.initiate(referenced_dcm_files)
+    kos.add_key_documents(referenced_dcm_files)
+    return kos
+
+
+def build_basic_sr_text(referenced_dcm_files, number_of_text_nodes):
+    basic_sr_text = BasicSRText()
+    basic_sr_text.create_empty_iod()
+    basic_sr_text.initiate(referenced_dcm_files)
+    for ind in range(number_of_text_nodes):
+        basic_sr_text.add_text_node(
+            f"Finding number {ind} described in free text",
+            ["121071", "DCM", "Finding"],
+        )
+    return basic_sr_text
+
+
+def build_enhanced_sr_tid_1500(referenced_dcm_files, number_of_groups):
+    enhanced_sr = EnhancedSRTID1500()
+    enhanced_sr.create_empty_iod()
+    enhanced_sr.initiate(referenced_dcm_files)
+    for ind in range(number_of_groups):
+        enhanced_sr.add_linear_measurement_single_axis(
+            referenced_dcm_files[ind % len(referenced_dcm_files)],
+            12.5,
+            [10.0, 10.0, 40.0, 40.0],
+            ["410668003", "SCT", "Length"],
+            ["108369006", "SCT", "Neoplasm"],
+            ["39607008", "SCT", "Lung"],
+        )
+    return enhanced_sr
+
+
+def build_enhanced_sr_tid_1500_in_bulk(referenced_dcm_files, number_of_groups):
+    enhanced_sr = EnhancedSRTID1500()
+    enhanced_sr.create_empty_iod()
+    enhanced_sr.initiate(referenced_dcm_files)
+    enhanced_sr.add_measurements(
+        {
+            "dcm_ref": [
+                referenced_dcm_files[ind % len(referenced_dcm_files)]
+                for ind in range(number_of_groups)
+            ],
+            "linear_measurement": np.full(number_of_groups, 12.5),
+            "graphic_data": np.tile([10.0, 10.0, 40.0, 40.0], (number_of_groups, 1)),
+        },
+        measurement_type=["410668003", "SCT", "Length"],
+        finding=["108369006", "SCT", "Neoplasm"],
+        finding_site=["39607008", "SCT", "Lung"],
+    )
+    return enhanced_sr
+
+
+def build_comprehensive_3d_sr_tid_1500(referenced_dcm_files, number_of_groups):
+    comprehensive_3d_sr = Comprehensive3DSRTID1500(referenced_dcm_files)
+    finding_type = ConceptCodeSequenceItem("108369006", "SCT", "Neoplasm")
+    finding_site = ConceptCodeSequenceItem("39607008", "SCT", "Lung")
+    for ind in range(number_of_groups):
+        comprehensive_3d_sr.add_qualitative_finding(
+            referenced_dcm_files[ind % len(referenced_dcm_files)],
+            finding_type,
+            finding_site=finding_site,
+            location_data=[20.0, 20.0],
+            location_type="POINT",
+        )
+    return comprehensive_3d_sr
+
+
+def build_comprehensive_3d_sr_tid_1500_in_bulk(referenced_dcm_files, number_of_groups):
+    comprehensive_3d_sr = Comprehensive3DSRTID1500(referenced_dcm_files)
+    comprehensive_3d_sr.add_qualitative_findings(
+        [
+            {"dcm_file": referenced_dcm_files[ind % len(referenced_dcm_files)]}
+            for ind in range(number_of_groups)
+        ],
+        finding_type=ConceptCodeSequenceItem("108369006", "SCT", "Neoplasm"),
+        finding_site=ConceptCodeSequenceItem("39607008", "SCT", "Lung"),
+        location_data=[20.0, 20.0],
+        location_type="POINT",
+    )
+    return comprehensive_3d_sr
+
+
+@pytest.mark.parametrize("number_of_references", [8, 64])
+def bench_kos_build_and_write(track, reference_ct_files, number_of_references):
+    track(lambda: write_to_buffer(build_kos(reference_ct_files[:number_of_references])))
+
+
+@pytest.mark.parametrize("number_of_text_nodes", NUMBER_OF_MEASUREMENT_GROUPS)
+def bench_basic_sr_text_build_and_write(
+    track, reference_ct_files, number_of_text_nodes
+):
+    track(
+        lambda: write_to_buffer(
+            build_basic_sr_text(reference_ct_files[:1], number_of_text_nodes)
+        )
+    )
+
+
+@pytest.mark.parametrize("number_of_groups", NUMBER_OF_MEASUREMENT_GROUPS)
+def bench_enhanced_sr_tid_1500_build_and_write(
+    track, reference_ct_files, number_of_groups
+):
+    track(
+        lambda: write_to_buffer(
+            build_enhanced_sr_tid_1500(reference_ct_files, number_of_groups)
+        )
+    )
+
+
+@pytest.mark.parametrize("number_of_groups", NUMBER_OF_MEASUREMENT_GROUPS)
+def bench_enhanced_sr_tid_1500_bulk_build_and_write(
+    track, reference_ct_files, number_of_groups
+):
+    track(
+        lambda: write_to_buffer(
+            build_enhanced_sr_tid_1500_in_bulk(reference_ct_files, number_of_groups)
+        )
+    )
+
+
+@pytest.mark.parametrize("number_of_groups", NUMBER_OF_MEASUREMENT_GROUPS)
+def bench_comprehensive_3d_sr_tid_1500_build_and_write(
+    track, reference_ct_files, number_of_groups
+):
+    track(
+        lambda: write_to_buffer(
+            build_comprehensive_3d_sr_tid_1500(reference_ct_files, number_of_groups)
+        )
+    )
+
+
+@pytest.mark.parametrize("number_of_groups", NUMBER_OF_MEASUREMENT_GROUPS)
+def bench_comprehensive_3d_sr_tid_1500_bulk_build_and_write(
+    track, reference_ct_files, number_of_groups
+):
+    track(
+        lambda: write_to_buffer(
+            build_comprehensive_3d_sr_tid_1500_in_bulk(
+                reference_ct_files, number_of_groups
+            )
+        )
+    )
+
+
+@pytest.mark.parametrize("deflate_level", [None, 1, 6, 9])
+def bench_enhanced_sr_tid_1500_write_deflated(
+    benchmark, track, reference_ct_files, deflate_level
+):
+    enhanced_sr = build_enhanced_sr_tid_1500(reference_ct_files, 1000)
+    kwargs = dict()
+    if deflate_level is not None:
+        kwargs = {"deflate": True, "deflate_level": deflate_level}
+    number_of_bytes = track(write_to_buffer, enhanced_sr, **kwargs)
+    benchmark.extra_info["number_of_bytes"] = number_of_bytes
+
+
+def _stream_groups(enhanced_sr, referenced_dcm_files, number_of_groups, batch_size=100):
+    for start in range(0, number_of_groups, batch_size):
+        size = min(batch_size, number_of_groups - start)
+        yield from enhanced_sr.create_measurement_groups(
+            {
+                "dcm_ref": [
+                    referenced_dcm_files[ind % len(referenced_dcm_files)]
+                    for ind in range(start, start + size)
+                ],
+                "linear_measurement": np.full(size, 12.5),
+                "graphic_data": np.tile([10.0, 10.0, 40.0, 40.0], (size, 1)),
+            },
+            measurement_type=["410668003", "SCT", "Length"],
+            finding=["108369006", "SCT", "Neoplasm"],
+            finding_site=["39607008", "SCT", "Lung"],
+        )
+
+
+def write_streaming_to_buffer(enhanced_sr, referenced_dcm_files, number_of_groups):
+    buffer = io.BytesIO()
+    enhanced_sr.write_streaming(
+        buffer, _stream_groups(enhanced_sr, referenced_dcm_files, number_of_groups)
+    )
+    return buffer.tell()
+
+
+@pytest.mark.parametrize("number_of_groups", NUMBER_OF_MEASUREMENT_GROUPS)
+def bench_enhanced_sr_tid_1500_write_streaming(
+    track, reference_ct_files, number_of_groups
+):
+    enhanced_sr = build_enhanced_sr_tid_1500(reference_ct_files, 0)
+    track(write_streaming_to_buffer, enhanced_sr, reference_ct_files, number_of_groups)
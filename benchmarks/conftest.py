@@ -0,0 +1,93 @@
+import io
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from pydicomutils.IODs.CTImage import CTImage
+from pydicomutils.uid_generator import configure_uid_generator
+
+"""Number of synthetic CT images available as references to the
+presentation state and SR benchmarks
+"""
+NUMBER_OF_REFERENCE_IMAGES = 64
+
+
+def measure_peak_memory(func, *args, **kwargs):
+    """Run func once and return the peak amount of memory allocated meanwhile
+
+    Arguments:
+        func {callable} -- Function to measure
+
+    Returns:
+        int -- Peak traced memory in bytes
+    """
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def write_to_buffer(iod, **kwargs):
+    """Serialise an IOD to an in-memory buffer and return the number of bytes
+
+    Keyword arguments are passed on to write_to_file, e.g. deflate=True.
+    """
+    buffer = io.BytesIO()
+    iod.write_to_file(buffer, **kwargs)
+    return buffer.tell()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def deterministic_uids():
+    configure_uid_generator(deterministic=True, seed=1)
+    yield
+    configure_uid_generator()
+
+
+@pytest.fixture
+def track(benchmark):
+    """Benchmark a function and record its peak memory usage
+
+    The peak memory is measured in a separate run, since tracing allocations
+    would otherwise distort the timings. It is stored as
+    peak_memory_bytes in the extra info of the benchmark.
+    """
+
+    def run(func, *args, **kwargs):
+        benchmark.extra_info["peak_memory_bytes"] = measure_peak_memory(
+            func, *args, **kwargs
+        )
+        return benchmark(func, *args, **kwargs)
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def reference_ct_files(tmp_path_factory):
+    """Synthetic CT series written to disk, used as referenced images"""
+    folder = tmp_path_factory.mktemp("reference_ct")
+    ct_files = list()
+    for ind in range(NUMBER_OF_REFERENCE_IMAGES):
+        ct_image = CTImage()
+        ct_image.create_empty_iod()
+        ct_image.initiate()
+        if ct_files:
+            ct_image.dataset.StudyInstanceUID = first.StudyInstanceUID
+            ct_image.dataset.SeriesInstanceUID = first.SeriesInstanceUID
+            ct_image.dataset.PatientID = first.PatientID
+        else:
+            first = ct_image.dataset
+        ct_image.dataset.PatientName = "BENCHMARK^PATIENT"
+        ct_image.dataset.PatientSex = "O"
+        ct_image.dataset.InstanceNumber = str(ind + 1)
+        ct_image.dataset.ImagePositionPatient = ["0.0", "0.0", str(float(ind))]
+        ct_image.add_pixel_data(np.zeros((256, 256), dtype=np.uint16))
+        ct_file = os.path.join(folder, f"{ind + 1:06d}.dcm")
+        ct_image.write_to_file(ct_file)
+        ct_files.append(ct_file)
+    return ct_files
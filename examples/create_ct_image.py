@@ -8,6 +8,7 @@ import SimpleITK as sitk
 from pydicom import uid
 
 from pydicomutils.IODs.CTImage import CTImage
+from pydicomutils.io.batch_writer import BatchWriter
 
 # Create logger
 logger = logging.getLogger(__name__)
@@ -66,68 +67,75 @@ def run():
     # Initiate metadata on instance level
     logger.info("CT")
     instance_no = 0
-    for slice_ind in range(0, img.GetSize()[2]):
-        instance_no += 1
-        ct_image = CTImage()
-        ct_image.create_empty_iod()
-        ct_image.initiate()
-        ct_image.set_dicom_attribute("PatientID", patient_id)
-        ct_image.set_dicom_attribute("StudyInstanceUID", study_instance_uid)
-        ct_image.set_dicom_attribute("StudyID", study_id)
-        ct_image.set_dicom_attribute("AccessionNumber", accession_number)
-        ct_image.set_dicom_attribute("StudyDate", study_date)
-        ct_image.set_dicom_attribute("StudyTime", study_time)
-        ct_image.set_dicom_attribute("SeriesInstanceUID", series_instance_uid)
-        ct_image.set_dicom_attribute("SeriesNumber", series_number)
-        ct_image.set_dicom_attribute("SeriesDate", series_date)
-        ct_image.set_dicom_attribute("SeriesTime", series_time)
-        ct_image.set_dicom_attribute("FrameOfReferenceUID", frame_of_reference_uid)
-        ct_image.set_dicom_attribute("StudyDescription", study_description)
-        ct_image.set_dicom_attribute("SeriesDescription", series_description)
-        ct_image.set_dicom_attribute("BodyPartExamined", body_part_examined)
-        ct_image.set_dicom_attribute("PatientPosition", patient_position)
-        ct_image.set_dicom_attribute("ContentDate", datetime.now().strftime("%Y%m%d"))
-        ct_image.set_dicom_attribute("ContentTime", datetime.now().strftime("%H%M%S"))
-        ct_image.set_dicom_attribute("InstanceNumber", str(instance_no))
-        ct_image.set_dicom_attribute(
-            "ImageOrientationPatient",
-            [
-                str(img_orientation[0])[:16],
-                str(img_orientation[1])[:16],
-                str(img_orientation[2])[:16],
-                str(img_orientation[3])[:16],
-                str(img_orientation[4])[:16],
-                str(img_orientation[5])[:16],
-            ],
-        )
-        ct_image.set_dicom_attribute(
-            "ImagePositionPatient",
-            [
-                str(img_position[0] + slice_ind * img_orientation[6])[:16],
-                str(img_position[1] + slice_ind * img_orientation[7])[:16],
-                str(img_position[2] + slice_ind * img_orientation[8])[:16],
-            ],
-        )
-        ct_image.set_dicom_attribute("SliceThickness", str(img.GetSpacing()[2]))
-        ct_image.add_pixel_data(
-            np.array(arr[:, :, slice_ind] + 1024, dtype=np.uint16),
-            pixel_spacing=[
-                str(img.GetSpacing()[0])[:16],
-                str(img.GetSpacing()[1])[:16],
-            ],
-        )
-        os.makedirs(
-            os.path.join(
-                study_folder, "series_" + str(ct_image.dataset.SeriesNumber).zfill(3)
-            ),
-            exist_ok=True,
-        )
-        output_file = os.path.join(
-            study_folder,
-            "series_" + str(ct_image.dataset.SeriesNumber).zfill(3),
-            str(ct_image.dataset.InstanceNumber).zfill(6) + ".dcm",
-        )
-        ct_image.write_to_file(output_file)
+    with BatchWriter(num_workers=4, max_queue_size=32) as writer:
+        for slice_ind in range(0, img.GetSize()[2]):
+            instance_no += 1
+            ct_image = CTImage()
+            ct_image.create_empty_iod()
+            ct_image.initiate()
+            ct_image.set_dicom_attribute("PatientID", patient_id)
+            ct_image.set_dicom_attribute("StudyInstanceUID", study_instance_uid)
+            ct_image.set_dicom_attribute("StudyID", study_id)
+            ct_image.set_dicom_attribute("AccessionNumber", accession_number)
+            ct_image.set_dicom_attribute("StudyDate", study_date)
+            ct_image.set_dicom_attribute("StudyTime", study_time)
+            ct_image.set_dicom_attribute("SeriesInstanceUID", series_instance_uid)
+            ct_image.set_dicom_attribute("SeriesNumber", series_number)
+            ct_image.set_dicom_attribute("SeriesDate", series_date)
+            ct_image.set_dicom_attribute("SeriesTime", series_time)
+            ct_image.set_dicom_attribute("FrameOfReferenceUID", frame_of_reference_uid)
+            ct_image.set_dicom_attribute("StudyDescription", study_description)
+            ct_image.set_dicom_attribute("SeriesDescription", series_description)
+            ct_image.set_dicom_attribute("BodyPartExamined", body_part_examined)
+            ct_image.set_dicom_attribute("PatientPosition", patient_position)
+            ct_image.set_dicom_attribute(
+                "ContentDate", datetime.now().strftime("%Y%m%d")
+            )
+            ct_image.set_dicom_attribute(
+                "ContentTime", datetime.now().strftime("%H%M%S")
+            )
+            ct_image.set_dicom_attribute("InstanceNumber", str(instance_no))
+            ct_image.set_dicom_attribute(
+                "ImageOrientationPatient",
+                [
+                    str(img_orientation[0])[:16],
+                    str(img_orientation[1])[:16],
+                    str(img_orientation[2])[:16],
+                    str(img_orientation[3])[:16],
+                    str(img_orientation[4])[:16],
+                    str(img_orientation[5])[:16],
+                ],
+            )
+            ct_image.set_dicom_attribute(
+                "ImagePositionPatient",
+                [
+                    str(img_position[0] + slice_ind * img_orientation[6])[:16],
+                    str(img_position[1] + slice_ind * img_orientation[7])[:16],
+                    str(img_position[2] + slice_ind * img_orientation[8])[:16],
+                ],
+            )
+            ct_image.set_dicom_attribute("SliceThickness", str(img.GetSpacing()[2]))
+            ct_image.add_pixel_data(
+                np.array(arr[:, :, slice_ind] + 1024, dtype=np.uint16),
+                pixel_spacing=[
+                    str(img.GetSpacing()[0])[:16],
+                    str(img.GetSpacing()[1])[:16],
+                ],
+            )
+            os.makedirs(
+                os.path.join(
+                    study_folder,
+                    "series_" + str(ct_image.dataset.SeriesNumber).zfill(3),
+                ),
+                exist_ok=True,
+            )
+            output_file = os.path.join(
+                study_folder,
+                "series_" + str(ct_image.dataset.SeriesNumber).zfill(3),
+                str(ct_image.dataset.InstanceNumber).zfill(6) + ".dcm",
+            )
+            writer.submit(ct_image, output_file)
+    logger.info(f"Writer stats: {writer.stats()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+import os
+import logging
+
+import numpy as np
+import SimpleITK as sitk
+
+from pydicomutils.IODs.EnhancedCTImage import EnhancedCTImage
+from pydicomutils.geometry import VolumeGeometry
+
+# Create logger
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+file_handler = logging.FileHandler("pydicomutils_examples.log")
+formatter = logging.Formatter("%(asctime)s : %(levelname)s : %(name)s : %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(formatter)
+logger.addHandler(stream_handler)
+
+
+def run():
+    logger.info("Starting")
+    file_folder = os.path.dirname(os.path.realpath(__file__))
+    output_folder = os.path.join(file_folder, "output")
+    os.makedirs(output_folder, exist_ok=True)
+
+    # Set output folder
+    study_folder = os.path.join(output_folder, "data", "ct_images", "converted_images")
+    os.makedirs(study_folder, exist_ok=True)
+
+    # Original file to convert
+    original_image_file = os.path.join(
+        file_folder, "data", "ct_images", "non_dicom", "LIDC-IDRI-0001_CT.nrrd"
+    )
+
+    # Load data from image file, as (slices, rows, columns)
+    img = sitk.ReadImage(original_image_file)
+    arr = sitk.GetArrayFromImage(img)
+
+    # Both ITK and DICOM use LPS patient coordinates
+    affine = np.eye(4)
+    affine[0:3, 0:3] = np.reshape(img.GetDirection(), (3, 3)) @ np.diag(
+        img.GetSpacing()
+    )
+    affine[0:3, 3] = img.GetOrigin()
+    geometry = VolumeGeometry(affine, shape=img.GetSize())
+
+    # The whole volume is written as one multi-frame instance
+    logger.info("Enhanced CT")
+    enhanced_ct_image = EnhancedCTImage()
+    enhanced_ct_image.create_empty_iod()
+    enhanced_ct_image.initiate()
+    enhanced_ct_image.set_dicom_attribute("StudyDescription", "CT PELVIS")
+    enhanced_ct_image.set_dicom_attribute("SeriesDescription", "Axial")
+    enhanced_ct_image.set_dicom_attribute("BodyPartExamined", "PELVIS")
+    # The image file has no slice thickness, the slices are taken to be contiguous
+    enhanced_ct_image.add_pixel_data(
+        np.array(arr, dtype=np.int16),
+        geometry=geometry,
+        slice_thickness=img.GetSpacing()[2],
+    )
+    os.makedirs(
+        os.path.join(
+            study_folder,
+            "series_" + str(enhanced_ct_image.dataset.SeriesNumber).zfill(3),
+        ),
+        exist_ok=True,
+    )
+    output_file = os.path.join(
+        study_folder,
+        "series_" + str(enhanced_ct_image.dataset.SeriesNumber).zfill(3),
+        "enhanced_ct_"
+        + str(enhanced_ct_image.dataset.InstanceNumber).zfill(6)
+        + ".dcm",
+    )
+    enhanced_ct_image.write_to_file(output_file)
+
+
+if __name__ == "__main__":
+    run()
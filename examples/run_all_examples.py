@@ -1,5 +1,6 @@
 import create_cr_image_basic_text_sr_comprehensive_3d_sr_and_gsps
 import create_ct_image
+import create_enhanced_ct_image
 import create_enhanced_sr_tid_1500
 import create_enhanced_sr_tid_1500_linear_measurements
 import create_gsps_and_kos
@@ -9,6 +10,7 @@ import create_wsm_image
 if __name__ == "__main__":
     create_cr_image_basic_text_sr_comprehensive_3d_sr_and_gsps.run()
     create_ct_image.run()
+    create_enhanced_ct_image.run()
     create_enhanced_sr_tid_1500.run()
     create_enhanced_sr_tid_1500_linear_measurements.run()
     create_gsps_and_kos.run()
@@ -1,25 +1,17 @@
 import numpy as np
-import pydicom
+
+from pydicomutils.io.series_loader import load_series
 
 
 def read_and_sort_dicom_files(dcm_files, return_dcm_files=False):
-    # list, read, sort template dicom files
-    dcm_handlers = [pydicom.dcmread(item, force=True) for item in dcm_files]
-
-    # sort in ascending order
-    z_positions = []
-    for dcm_handler in dcm_handlers:
-        x = dcm_handler.ImageOrientationPatient[0:3]
-        y = dcm_handler.ImageOrientationPatient[3:6]
-        z_dir = np.cross(x, y)
-        z_positions.append(np.dot(z_dir, dcm_handler.ImagePositionPatient))
-    sorted_dcm_handlers = [x for (y, x) in sorted(zip(z_positions, dcm_handlers))]
-    sorted_dcm_files = [x for (y, x) in sorted(zip(z_positions, dcm_files))]
+    # read geometry of template dicom files and sort in ascending order, the
+    # returned handles read the remaining attributes and pixels on first access
+    series = load_series(dcm_files)
 
     if return_dcm_files:
-        return sorted_dcm_files
+        return series.dcm_files
     else:
-        return sorted_dcm_handlers
+        return series.slices
 
 
 def construct_T_R_S_from_dcm_handlers(dcm_handlers):
@@ -3,15 +3,12 @@ Script to create new UIDs for specified DICOM tag in DICOM objects available
 in specified folder.
 """
 
-import os
-import glob
 import argparse
 
-import pydicom
-from pydicom import DataElement
+from pydicomutils.io import tag_rewriter
 
 
-def create_new_uids(folder, dicom_tag, dry_run=True):
+def create_new_uids(folder, dicom_tag, dry_run=True, num_workers=None):
     """Search folder (and subfolders) for DICOM files and create new UIDs for specified DICOM tag
 
     Parameters
@@ -19,34 +16,22 @@ def create_new_uids(folder, dicom_tag, dry_run=True):
     folder : Folder to (recursively) search for DICOM objects
     dicom_tag : DICOM tag specifying which UID to create new UIDs for (format as "0x0020000D")
     dry_run : Dry run, (True)/False
+    num_workers : Number of worker processes, (None) for one per CPU
     """
-    # find dcm files
-    dcm_files = glob.glob(os.path.join(folder, "**", "*.dcm"), recursive=True)
-    dcm_dict = dict()
-    # loop over dcm files
-    for dcm_file in dcm_files:
-        dcm = pydicom.read_file(dcm_file)
-        # if dicom tag exists in current dcm file
-        if int(dicom_tag, 16) in dcm:
-            # record replaceed uid and set new uid
-            uid = dcm[dicom_tag].value
-            if uid not in dcm_dict:
-                dcm_dict[uid] = pydicom.uid.generate_uid()
-            dcm[dicom_tag] = DataElement(int(dicom_tag, 16), "UI", dcm_dict[uid])
-        else:
-            # add dicom tag with new uid
-            uid = pydicom.uid.generate_uid()
-            dcm[dicom_tag] = DataElement(int(dicom_tag, 16), "UI", uid)
-        if not dry_run:
-            # write dcm file to disk
-            pydicom.dcmwrite(dcm_file, dcm, write_like_original=False)
+    report = tag_rewriter.create_new_uids(
+        folder, [dicom_tag], dry_run=dry_run, num_workers=num_workers
+    )
     if dry_run:
         print("Uids to update")
-        print(dcm_file)
+        for old_uid, new_uid in report.uid_map.items():
+            print(old_uid, "->", new_uid)
+    for dcm_file, error in report.errors.items():
+        print("Failed to process", dcm_file, error)
+    print(report)
 
 
-def main(folder, dicom_tag, dry_run):
-    create_new_uids(folder, dicom_tag, dry_run)
+def main(folder, dicom_tag, dry_run, num_workers):
+    create_new_uids(folder, dicom_tag, dry_run, num_workers)
 
 
 if __name__ == "__main__":
@@ -62,6 +47,14 @@ if __name__ == "__main__":
         dest="dicom_tag",
         help="DICOM tag to create new uids for",
     )
+    parser.add_argument(
+        "-n",
+        action="store",
+        type=int,
+        default=None,
+        dest="num_workers",
+        help="Number of worker processes",
+    )
     parser.add_argument("-dr", action="store_true", dest="dry_run", help="Dry run")
     parser.add_argument("-ndr", action="store_false", dest="dry_run", help="No dry run")
     parser.set_defaults(dry_run=True)
@@ -70,4 +63,4 @@ if __name__ == "__main__":
     opts = parser.parse_args()
 
     # call main function
-    main(opts.folder, opts.dicom_tag, opts.dry_run)
+    main(opts.folder, opts.dicom_tag, opts.dry_run, opts.num_workers)
@@ -2,15 +2,12 @@
 Script to set value of specified DICOM tag in DICOM objects available in specified folder.
 """
 
-import os
 import argparse
-import glob
 
-import pydicom
-from pydicom import DataElement
+from pydicomutils.io import tag_rewriter
 
 
-def set_dicom_tag(folder, dicom_tag, VR, value, dry_run=True):
+def set_dicom_tag(folder, dicom_tag, VR, value, dry_run=True, num_workers=None):
     """Search folder (and subfolders) for DICOM files and set value of specified DICOM tag
 
     Parameters
@@ -20,31 +17,26 @@ def set_dicom_tag(folder, dicom_tag, VR, value, dry_run=True):
     VR : Value representation of DICOM tag to set, needed in case the DICOM tag is missing
     value : Value to set
     dry_run : Dry run, (True)/False
+    num_workers : Number of worker processes, (None) for one per CPU
     """
-    # find dcm files
-    dcm_files = glob.glob(os.path.join(folder, "**", "*.dcm"), recursive=True)
-    replaced_dcm_values = set()
-    # loop over dcm files
-    for dcm_file in dcm_files:
-        dcm = pydicom.read_file(dcm_file)
-        # if dicom tag exists in current dcm file
-        if int(dicom_tag, 16) in dcm:
-            # record replaced value and set new value
-            replaced_dcm_values.add(dcm[dicom_tag].value)
-            dcm[dicom_tag] = DataElement(int(dicom_tag, 16), VR, value)
-        else:
-            # add dicom tag with new value
-            dcm.add_new(dicom_tag, VR, value)
-        if not dry_run:
-            # write dcm file to disk
-            pydicom.dcmwrite(dcm_file, dcm, write_like_original=False)
+    report = tag_rewriter.set_dicom_tag(
+        folder, dicom_tag, VR, value, dry_run=dry_run, num_workers=num_workers
+    )
     if dry_run:
+        replaced_dcm_values = set()
+        for changes in report.changes.values():
+            replaced_dcm_values.update(
+                str(old_value) for _, old_value, _ in changes if old_value is not None
+            )
         print("Values of DICOM tag", dicom_tag, "that will be replaced with", value)
         print(list(replaced_dcm_values))
+    for dcm_file, error in report.errors.items():
+        print("Failed to process", dcm_file, error)
+    print(report)
 
 
-def main(folder, dicom_tag, VR, value, dry_run):
-    set_dicom_tag(folder, dicom_tag, VR, value, dry_run)
+def main(folder, dicom_tag, VR, value, dry_run, num_workers):
+    set_dicom_tag(folder, dicom_tag, VR, value, dry_run, num_workers)
 
 
 if __name__ == "__main__":
@@ -74,6 +66,14 @@ if __name__ == "__main__":
         dest="value",
         help="Value to set DICOM tag to",
     )
+    parser.add_argument(
+        "-n",
+        action="store",
+        type=int,
+        default=None,
+        dest="num_workers",
+        help="Number of worker processes",
+    )
     parser.add_argument("-dr", action="store_true", dest="dry_run", help="Dry run")
     parser.add_argument("-ndr", action="store_false", dest="dry_run", help="No dry run")
     parser.set_defaults(dry_run=True)
@@ -82,4 +82,11 @@ if __name__ == "__main__":
     opts = parser.parse_args()
 
     # call main function
-    main(opts.folder, opts.dicom_tag, opts.VR, opts.value, opts.dry_run)
+    main(
+        opts.folder,
+        opts.dicom_tag,
+        opts.VR,
+        opts.value,
+        opts.dry_run,
+        opts.num_workers,
+    )
@@ -1,11 +1,15 @@
 from datetime import datetime
 
-from pydicom import Dataset, uid, dcmread
+from pydicom import Dataset
 
 from .IOD import IOD, IODTypes, SOP_CLASS_UID_MODALITY_DICT
 from .modules.specific_sr_modules import SRDocumentSeriesModule, SRDocumentGeneralModule
 from .modules.specific_sr_modules import SRDocumentContentModule
 from .sequences.Sequences import generate_sequence, generate_CRPES_sequence
+from .sequences.Sequences import get_dataset_from_dcm
+from ..uid_generator import generate_uid
+from ..io.references import harvest_references
+from ..profiling import instrument
 
 class BasicSRText(IOD):
     """Implementation of the Basic SR Text IOD
@@ -13,6 +17,7 @@ class BasicSRText(IOD):
     def __init__(self):
         super().__init__(IODTypes.BasicTextSR)
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
         Parameters
@@ -22,6 +27,7 @@ class BasicSRText(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(self, dataset_to_copy_from,
                                        include_iod_specific=True,
                                        include_optional=False):
@@ -46,17 +52,20 @@ class BasicSRText(IOD):
                     module.copy_optional_dicom_attributes(dataset_to_copy_from, 
                                                           self.dataset)
     
+    @instrument
     def initiate(self, referenced_dcm_files=None):
         """Initiate the IOD by setting some dummy values for
         required attributes
         
         Keyword Arguments:
-            referenced_dcm_files {[dcm_file1, dcm_file2, ...]} -- List of file paths (default: {None})
+            referenced_dcm_files {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords (default: {None})
         """
         super().initiate()
         if referenced_dcm_files:
+            # each referenced file is read once, header only
+            referenced_dcm_files = harvest_references(referenced_dcm_files)
             # some attributes to inherit from referenced dcm files
-            ds = dcmread(referenced_dcm_files[0])
+            ds = get_dataset_from_dcm(referenced_dcm_files[0])
             self.dataset.PatientID = ds.PatientID
             self.dataset.PatientName = ds.PatientName
             self.dataset.PatientSex = ds.PatientSex
@@ -70,7 +79,7 @@ class BasicSRText(IOD):
             self.dataset.StudyTime = ds.StudyTime
         # sr document series module
         self.dataset.Modality = SOP_CLASS_UID_MODALITY_DICT[self.iod_type]
-        self.dataset.SeriesInstanceUID = uid.generate_uid()
+        self.dataset.SeriesInstanceUID = generate_uid()
         # sr document general module
         self.dataset.InstanceNumber = str(1)
         self.dataset.CompletionFlag = "COMPLETE"
@@ -92,6 +101,7 @@ class BasicSRText(IOD):
                                                                  }])
         self.dataset.ContinuityOfContent = "SEPARATE"
 
+    @instrument
     def add_text_node(self, text_value, concept_name_code):
         """Inserts a text node into the ContentSequence of the basic SR report
         
@@ -1,8 +1,10 @@
-from pydicom import Dataset, uid
+from pydicom import Dataset
 
 from .IOD import IOD, IODTypes
 from .modules.general_modules import FrameOfReferenceModule, ImagePlaneModule
 from .modules.specific_image_modules import CTImageModule
+from ..uid_generator import generate_uid
+from ..profiling import instrument
 
 class CTImage(IOD):
     """Implementation of the CT Image IOD
@@ -11,6 +13,7 @@ class CTImage(IOD):
     def __init__(self):
         super().__init__(IODTypes.CTImage)
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
         Parameters
@@ -20,6 +23,7 @@ class CTImage(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(self, dataset_to_copy_from,
                                        include_iod_specific=True,
                                        include_optional=False):
@@ -44,6 +48,7 @@ class CTImage(IOD):
                     module.copy_optional_dicom_attributes(dataset_to_copy_from, 
                                                           self.dataset)
 
+    @instrument
     def initiate(self):
         """Initiate the IOD by setting some dummy values for
         required attributes
@@ -51,7 +56,7 @@ class CTImage(IOD):
         super().initiate()
 
         # Frame of reference module
-        self.dataset.FrameOfReferenceUID = uid.generate_uid()
+        self.dataset.FrameOfReferenceUID = generate_uid()
         # General image module
         # Image plane module
         self.dataset.PixelSpacing = ["1.0", "1.0"]
@@ -69,6 +74,7 @@ class CTImage(IOD):
         self.dataset.RescaleSlope = "1.0"
         self.dataset.RescaleType = "HU"
 
+    @instrument
     def add_pixel_data(self, pixel_array,
                        photometric_interpretation="MONOCHROME2",
                        pixel_spacing=None,
@@ -3,7 +3,6 @@ from datetime import datetime
 from pathlib import Path
 
 from pydicom import Dataset, dcmread
-from pydicom.uid import generate_uid
 
 from .IOD import IOD, IODTypes, SOP_CLASS_UID_MODALITY_DICT
 from .modules.specific_sr_modules import SRDocumentSeriesModule, SRDocumentGeneralModule
@@ -11,13 +10,39 @@ from .modules.specific_sr_modules import SRDocumentContentModule
 from .sequences.Sequences import (
     generate_sequence,
     generate_CRPES_sequence,
-    update_and_insert_additional_DICOM_attributes_in_ds,
 )
 from .sequences.Sequences import (
-    generate_reference_sop_sequence_json,
     ConceptCodeSequenceItem,
     ConceptNameCodeSequenceItem,
+    get_dataset_from_dcm,
 )
+from .sequences.ContentItems import (
+    FINDING,
+    FINDING_CATEGORY,
+    FINDING_SITE,
+    IMAGE_REGION,
+    MEASUREMENT_GROUP,
+    QUALITATIVE_EVALUATIONS,
+    TRACKING_IDENTIFIER,
+    TRACKING_UNIQUE_IDENTIFIER,
+    CodeTable,
+    as_code,
+    as_content_item,
+    code_item,
+    container_item,
+    content_sequence,
+    image_item,
+    image_library_entry,
+    measurement_report_content,
+    parse_measurement_report,
+    resolve_references,
+    scoord_item,
+    text_item,
+    uidref_item,
+)
+from ..uid_generator import generate_uid
+from ..io.references import harvest_references
+from ..profiling import instrument
 
 
 class Comprehensive3DSRTID1500(IOD):
@@ -52,91 +77,94 @@ class Comprehensive3DSRTID1500(IOD):
             ],
         )
         self.dataset.ContinuityOfContent = "SEPARATE"
-        self.dataset.ContentSequence = generate_sequence(
-            "ContentSequence",
-            [
-                {
-                    "RelationshipType": "HAS CONCEPT MOD",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "121049", "DCM", "Language of Content Item and Descendants"
-                        ).as_dict()
-                    ],
-                    "ConceptCodeSequence": [
-                        ConceptCodeSequenceItem("eng", "RFC5646", "English").as_dict()
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "HAS CONCEPT MOD",
-                            "ValueType": "CODE",
-                            "ConceptNameCodeSequence": [
-                                ConceptNameCodeSequenceItem(
-                                    "121046", "DCM", "Country of Language"
-                                ).as_dict()
-                            ],
-                            "ConceptCodeSequence": [
-                                ConceptCodeSequenceItem(
-                                    "US", "ISO3166_1", "United States"
-                                ).as_dict()
-                            ],
-                        }
-                    ],
-                },
-                {
-                    "RelationshipType": "HAS CONCEPT MOD",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "121058", "DCM", "Procedure Reported"
-                        ).as_dict()
-                    ],
-                    "ConceptCodeSequence": [
-                        ConceptCodeSequenceItem(
-                            "363679005", "SCT", "Imaging Procedure"
-                        ).as_dict()
-                    ],
-                },
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CONTAINER",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "111028", "DCM", "Image Library"
-                        ).as_dict()
-                    ],
-                    "ContinuityOfContent": "SEPARATE",
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "CONTAINS",
-                            "ValueType": "CONTAINER",
-                            "ConceptNameCodeSequence": [
-                                ConceptNameCodeSequenceItem(
-                                    "126200", "DCM", "Image Library Group"
-                                ).as_dict()
-                            ],
-                            "ContinuityOfContent": "SEPARATE",
-                            "ContentSequence": [],
-                        }
-                    ],
-                },
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CONTAINER",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "126010", "DCM", "Imaging Measurements"
-                        ).as_dict()
-                    ],
-                    "ContinuityOfContent": "SEPARATE",
-                    "ContentSequence": [],
-                },
-            ],
-        )
+        # the content is built as a content tree, see materialize
+        self.content = measurement_report_content()
+        self.image_library = self.content[2].children[0]
+        self.imaging_measurements = self.content[3]
+        # references of files added to the report, by file path
+        self._resolved_files = dict()
 
         if referenced_dcms:
             self.__initiate__(referenced_dcms)
 
+    @classmethod
+    def from_dataset(cls, dataset, new_instance=True):
+        """Load an existing report, to add measurement groups to it
+
+        The content of the report is not copied. Only the image library and
+        the measurement groups are unpacked, and the groups are indexed by
+        their tracking identifiers, so that groups can be added, replaced
+        or removed without rebuilding the rest of the report.
+
+        A changed report is a new SOP instance, so by default the report gets
+        a new SOP Instance UID and content date and time, and the original is
+        referenced in the Predecessor Documents Sequence.
+
+        Usage:
+            comprehensive_3d_sr = Comprehensive3DSRTID1500.from_file("report.dcm")
+            comprehensive_3d_sr.add_qualitative_finding(...)
+            comprehensive_3d_sr.write_to_file("updated_report.dcm")
+
+        Arguments:
+            dataset {Dataset} -- The report, e.g. as read by dcmread, copied
+                                 for a new instance, else used as is if it
+                                 has file meta information
+
+        Keyword Arguments:
+            new_instance {bool} -- Make the report a new instance, succeeding
+                                   the dataset (default: {True})
+
+        Returns:
+            Comprehensive3DSRTID1500 -- The report, ready to add measurement groups to
+        """
+        sr = cls()
+        if dataset.get("SOPClassUID") != sr.iod_type.value:
+            raise ValueError(
+                f"Expected SOP Class UID {sr.iod_type.value}, "
+                f"got {dataset.get('SOPClassUID')}"
+            )
+        if new_instance or getattr(dataset, "file_meta", None) is None:
+            # the new instance is a copy, the dataset stays the original report
+            sr.copy_dataset(dataset)
+        else:
+            sr.dataset = dataset
+        if new_instance:
+            # the Predecessor Documents Sequence uses the same hierarchical
+            # SOP instance references as the evidence sequence
+            predecessor_documents = list(
+                sr.dataset.get("PredecessorDocumentsSequence", [])
+            )
+            predecessor_documents.extend(generate_CRPES_sequence([sr.dataset]))
+            sr.dataset.PredecessorDocumentsSequence = predecessor_documents
+            sr.dataset.SOPInstanceUID = generate_uid()
+            sr.dataset.ContentDate = datetime.now().strftime("%Y%m%d")
+            sr.dataset.ContentTime = datetime.now().strftime("%H%M%S")
+        if "SOPInstanceUID" in sr.dataset:
+            sr.dataset.file_meta.MediaStorageSOPInstanceUID = sr.dataset.SOPInstanceUID
+        (
+            sr.content,
+            sr.image_library,
+            sr.imaging_measurements,
+        ) = parse_measurement_report(sr.dataset)
+        return sr
+
+    @classmethod
+    def from_file(cls, dcm_file, new_instance=True):
+        """Load an existing report from file, see from_dataset
+
+        Arguments:
+            dcm_file <class 'str'> -- Path of the report
+
+        Keyword Arguments:
+            new_instance {bool} -- Make the report a new instance, succeeding
+                                   the file (default: {True})
+
+        Returns:
+            Comprehensive3DSRTID1500 -- The report, ready to add measurement groups to
+        """
+        return cls.from_dataset(dcmread(dcm_file), new_instance)
+
+    @instrument
     def copy_required_dicom_attributes(
         self, dataset_to_copy_from, include_iod_specific=True, include_optional=False
     ):
@@ -164,20 +192,18 @@ class Comprehensive3DSRTID1500(IOD):
                         dataset_to_copy_from, self.dataset
                     )
 
+    @instrument
     def __initiate__(self, referenced_dcms=None):
         """Initiate the IOD by setting some dummy values for required attributes
 
         Keyword Arguments:
-            referenced_dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths (default: {None})
+            referenced_dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords (default: {None})
         """
         super().initiate()
         if referenced_dcms:
+            referenced_dcms = self.__harvest_references__(referenced_dcms)
             # some attributes to inherit from referenced dcm files
-            ds = None
-            if isinstance(referenced_dcms[0], Dataset):
-                ds = referenced_dcms[0]
-            else:
-                ds = dcmread(referenced_dcms[0])
+            ds = get_dataset_from_dcm(referenced_dcms[0])
             self.dataset.PatientID = ds.PatientID
             self.dataset.PatientName = ds.PatientName
             self.dataset.PatientSex = ds.PatientSex
@@ -206,16 +232,15 @@ class Comprehensive3DSRTID1500(IOD):
             )
         self.dataset.PreliminaryFlag = "FINAL"
 
-        self.dataset.ContentSequence[2].ContentSequence[0].ContentSequence = (
-            generate_sequence(
-                "ContentSequence",
-                [
-                    generate_reference_sop_sequence_json(dcm_file)
-                    for dcm_file in referenced_dcms
-                ],
-            )
-        )
+        self.image_library.children = [
+            image_library_entry(dcm_file) for dcm_file in referenced_dcms or []
+        ]
+
+    def materialize(self):
+        """Convert the content tree to the Content Sequence of the dataset"""
+        self.dataset.ContentSequence = content_sequence(self.content)
 
+    @instrument
     def __initiate_measurement_group__(
         self,
         template_id: str,
@@ -230,105 +255,21 @@ class Comprehensive3DSRTID1500(IOD):
         Returns:
             [type] -- [description]
         """
-        ds = Dataset()
-        ds.RelationshipType = "CONTAINS"
-        ds.ValueType = "CONTAINER"
-        ds.ConceptNameCodeSequence = generate_sequence(
-            "ConceptNameCodeSequence",
-            [
-                ConceptNameCodeSequenceItem(
-                    "125007", "DCM", "Measurement Group"
-                ).as_dict()
-            ],
-        )
-        ds.ContentTemplateSequence = generate_sequence(
-            "ContentTemplateSequence",
-            [
-                {
-                    "MappingResource": "DCMR",
-                    "MappingResourceUID": "1.2.840.10008.8.1.1",
-                    "TemplateIdentifier": template_id,
-                }
-            ],
-        )
-        ds.ContinuityOfContent = "SEPARATE"
-        content_sequence = []
+        ds = container_item("CONTAINS", MEASUREMENT_GROUP, template_id=template_id)
         if tracking_id is not None:
-            content_sequence.append(
-                {
-                    "RelationshipType": "HAS OBS CONTEXT",
-                    "ValueType": "TEXT",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "112039", "DCM", "Tracking Identifier"
-                        ).as_dict()
-                    ],
-                    "TextValue": tracking_id,
-                }
-            )
+            ds.append(text_item("HAS OBS CONTEXT", TRACKING_IDENTIFIER, tracking_id))
         if tracking_uid is not None:
-            content_sequence.append(
-                {
-                    "RelationshipType": "HAS OBS CONTEXT",
-                    "ValueType": "UIDREF",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "112040", "DCM", "Tracking Unique Identifier"
-                        ).as_dict()
-                    ],
-                    "UID": tracking_uid,
-                }
+            ds.append(
+                uidref_item("HAS OBS CONTEXT", TRACKING_UNIQUE_IDENTIFIER, tracking_uid)
             )
         if finding_category is not None:
-            content_sequence.append(
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "276214006", "SCT", "Finding category"
-                        ).as_dict()
-                    ],
-                    "ConceptCodeSequence": [
-                        finding_category.as_dict(),
-                    ],
-                }
+            ds.append(
+                code_item("CONTAINS", FINDING_CATEGORY, as_code(finding_category))
             )
         if finding_type is not None:
-            content_sequence.append(
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "121071", "DCM", "Finding"
-                        ).as_dict()
-                    ],
-                    "ConceptCodeSequence": [
-                        finding_type.as_dict(),
-                    ],
-                }
-            )
+            ds.append(code_item("CONTAINS", FINDING, as_code(finding_type)))
         if finding_site is not None:
-            content_sequence.append(
-                {
-                    "RelationshipType": "HAS CONCEPT MOD",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        ConceptNameCodeSequenceItem(
-                            "363698007", "SCT", "Finding Site"
-                        ).as_dict()
-                    ],
-                    "ConceptCodeSequence": [
-                        finding_site.as_dict(),
-                    ],
-                }
-            )
-        ds.ContentSequence = generate_sequence(
-            "ContentSequence",
-            content_sequence,
-        )
-
+            ds.append(code_item("HAS CONCEPT MOD", FINDING_SITE, as_code(finding_site)))
         return ds
 
     def __add_qualitative_evaluations__(self, ds, qualitative_evaluations):
@@ -342,41 +283,13 @@ class Comprehensive3DSRTID1500(IOD):
             if item is None:
                 continue
             if "text_value" in item:
-                ds.ContentSequence.append(
-                    update_and_insert_additional_DICOM_attributes_in_ds(
-                        Dataset(),
-                        {
-                            "RelationshipType": "CONTAINS",
-                            "ValueType": "TEXT",
-                            "ConceptNameCodeSequence": [
-                                ConceptNameCodeSequenceItem(
-                                    "C00034375", "UMLS", "Qualitative Evaluations"
-                                ).as_dict()
-                            ],
-                            "TextValue": item["text_value"],
-                        },
-                    )
+                ds.append(
+                    text_item("CONTAINS", QUALITATIVE_EVALUATIONS, item["text_value"])
                 )
             else:
-                ds.ContentSequence.append(
-                    update_and_insert_additional_DICOM_attributes_in_ds(
-                        Dataset(),
-                        {
-                            "RelationshipType": "CONTAINS",
-                            "ValueType": "CODE",
-                            "ConceptNameCodeSequence": [
-                                ConceptNameCodeSequenceItem(
-                                    "C00034375", "UMLS", "Qualitative Evaluations"
-                                ).as_dict()
-                            ],
-                            "ConceptCodeSequence": [
-                                {
-                                    "CodeValue": item["code_value"][0],
-                                    "CodingSchemeDesignator": item["code_value"][1],
-                                    "CodeMeaning": item["code_value"][2],
-                                }
-                            ],
-                        },
+                ds.append(
+                    code_item(
+                        "CONTAINS", QUALITATIVE_EVALUATIONS, as_code(item["code_value"])
                     )
                 )
         return ds
@@ -391,27 +304,11 @@ class Comprehensive3DSRTID1500(IOD):
         for item in coded_values:
             if item is None:
                 continue
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "HAS CONCEPT MOD",
-                        "ValueType": "CODE",
-                        "ConceptNameCodeSequence": [
-                            {
-                                "CodeValue": item["ConceptNameCode"][0],
-                                "CodingSchemeDesignator": item["ConceptNameCode"][1],
-                                "CodeMeaning": item["ConceptNameCode"][2],
-                            }
-                        ],
-                        "ConceptCodeSequence": [
-                            {
-                                "CodeValue": item["ConceptCode"][0],
-                                "CodingSchemeDesignator": item["ConceptCode"][1],
-                                "CodeMeaning": item["ConceptCode"][2],
-                            }
-                        ],
-                    },
+            ds.append(
+                code_item(
+                    "HAS CONCEPT MOD",
+                    as_code(item["ConceptNameCode"]),
+                    as_code(item["ConceptCode"]),
                 )
             )
         return ds
@@ -426,11 +323,24 @@ class Comprehensive3DSRTID1500(IOD):
             tracking_uid = generate_uid()
         return tracking_uid
 
+    def __harvest_references__(self, dcms):
+        """Read each referenced file once, also for later references to it"""
+        records = dict()
+        references = harvest_references(dcms, records=records)
+        for dcm_file, record in records.items():
+            self._resolved_files[dcm_file] = (
+                record.SOPClassUID,
+                record.SOPInstanceUID,
+                None,
+            )
+        return references
+
     def __get_dataset_from_dcm_file__(self, dcm_file):
         if isinstance(dcm_file, str) or isinstance(dcm_file, Path):
-            return dcmread(dcm_file)
+            return get_dataset_from_dcm(dcm_file)
         return dcm_file
 
+    @instrument
     def add_qualitative_finding(
         self,
         dcm_file,
@@ -462,110 +372,238 @@ class Comprehensive3DSRTID1500(IOD):
             qualitative_evaluations {list} -- List of qualitative evaluations (default: {None})
             coded_values {list} -- List of coded values (default: {None})
         """
-        # Handle tracking ID and UID
-        tracking_id = self.__handle_tracking_id__(tracking_id)
-        tracking_uid = self.__handle_tracking_uid__(tracking_uid)
-        # Get the dataset from the DICOM file
-        ds_ref = self.__get_dataset_from_dcm_file__(dcm_file)
-        # Ensure that either location data or contour data is provided, not both
-        if location_data is not None and contour_data is not None:
-            raise ValueError(
-                "Either location data or contour data should be provided, not both."
+        self.add_qualitative_findings(
+            [
+                {
+                    "dcm_file": dcm_file,
+                    "finding_type": finding_type,
+                    "tracking_id": tracking_id,
+                    "tracking_uid": tracking_uid,
+                    "finding_category": finding_category,
+                    "finding_site": finding_site,
+                    "location_data": location_data,
+                    "location_type": location_type,
+                    "contour_data": contour_data,
+                    "contour_type": contour_type,
+                    "qualitative_evaluations": qualitative_evaluations,
+                    "coded_values": coded_values,
+                }
+            ]
+        )
+
+    @instrument
+    def add_qualitative_findings(self, findings, **shared):
+        """Add a batch of qualitative findings, each in its own measurement group
+
+        Each finding is a dict with the keyword arguments of
+        add_qualitative_finding. Values shared by the findings, e.g. the
+        referenced dcm_file, finding_type or location_type, can be given once
+        as keyword arguments instead, and are used for findings without their
+        own value. Each referenced file is read once, header only, equal codes
+        are converted once, and all measurement groups are appended in one go.
+
+        Usage:
+            comprehensive_3d_sr.add_qualitative_findings(
+                [{"location_data": [20.0, 20.0]}, {"location_data": [40.0, 25.0]}],
+                dcm_file="ct_1.dcm",
+                finding_type=ConceptCodeSequenceItem("108369006", "SCT", "Neoplasm"),
+                location_type="POINT",
             )
-        # Set template ID depending on using contour data or not
-        template_id = "1501" if contour_data is None else "1410"
-        # Initiate the measurement group with relevant template ID
-        # and the essential attributes
-        ds = self.__initiate_measurement_group__(
-            template_id,
-            tracking_id=tracking_id,
-            tracking_uid=tracking_uid,
-            finding_type=finding_type,
-            finding_category=finding_category,
-            finding_site=finding_site,
+
+        Arguments:
+            findings {list} -- List of dicts, one per finding
+
+        Keyword Arguments:
+            shared -- Keyword arguments of add_qualitative_finding shared by all findings
+
+        Returns:
+            list -- Tracking UIDs of the added measurement groups
+        """
+        groups, tracking_uids = self._create_qualitative_finding_groups(
+            findings, shared
         )
-        if location_data is None and contour_data is None:
-            # Set the image reference as given by the SOP Instance UID in the DICOM file
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "CONTAINS",
-                        "ValueType": "IMAGE",
-                        "ReferencedSOPSequence": [
-                            {
-                                "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                            }
-                        ],
-                    },
+        self.imaging_measurements.extend(groups)
+        return tracking_uids
+
+    def create_qualitative_findings(self, findings, **shared):
+        """Create the measurement groups of a batch of qualitative findings, see add_qualitative_findings
+
+        The groups are not added to the report, e.g. to write them with
+        write_streaming, batch by batch.
+
+        Arguments:
+            findings {list} -- List of dicts, one per finding
+
+        Keyword Arguments:
+            shared -- Keyword arguments of add_qualitative_finding shared by all findings
+
+        Returns:
+            list -- The measurement groups, in the order of findings
+        """
+        return self._create_qualitative_finding_groups(findings, shared)[0]
+
+    def _create_qualitative_finding_groups(self, findings, shared):
+        findings = [
+            {**shared, **{k: v for k, v in finding.items() if v is not None}}
+            for finding in findings
+        ]
+        for finding in findings:
+            for keyword in finding:
+                if keyword not in QUALITATIVE_FINDING_KEYWORDS:
+                    raise ValueError(f"Unknown keyword {keyword} of a finding")
+            if "dcm_file" not in finding or "finding_type" not in finding:
+                raise ValueError("Each finding needs a dcm_file and a finding_type")
+            if "location_data" in finding and "contour_data" in finding:
+                raise ValueError(
+                    "Either location data or contour data should be provided, not both."
                 )
+        references = resolve_references(
+            [finding["dcm_file"] for finding in findings], self._resolved_files
+        )
+        codes = CodeTable()
+        groups = list()
+        tracking_uids = list()
+        for finding, reference in zip(findings, references):
+            tracking_id = self.__handle_tracking_id__(finding.get("tracking_id"))
+            tracking_uid = self.__handle_tracking_uid__(finding.get("tracking_uid"))
+            ds = _create_qualitative_finding_group(
+                finding, reference, codes, tracking_id, tracking_uid
             )
-        elif location_data is not None and contour_data is None:
-            # Set the location using the providing location data and type and assuming the location is for the
-            # referenced image as given by the SOP Instance UID in the DICOM file
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "CONTAINS",
-                        "ValueType": "SCOORD",
-                        "ConceptNameCodeSequence": [
-                            ConceptNameCodeSequenceItem(
-                                "111030", "DCM", "Image Region"
-                            ).as_dict()
-                        ],
-                        "ContentSequence": [
-                            {
-                                "ReferencedSOPSequence": [
-                                    {
-                                        "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                        "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                    }
-                                ],
-                                "RelationshipType": "SELECTED FROM",
-                                "ValueType": "IMAGE",
-                            }
-                        ],
-                        "GraphicData": location_data,
-                        "GraphicType": location_type,
-                    },
+            if finding.get("coded_values") is not None:
+                ds = self.__add_coded_values__(ds, finding["coded_values"])
+            if finding.get("qualitative_evaluations") is not None:
+                ds = self.__add_qualitative_evaluations__(
+                    ds, finding["qualitative_evaluations"]
                 )
+            groups.append(ds)
+            tracking_uids.append(tracking_uid)
+        return groups, tracking_uids
+
+    @instrument
+    def write_streaming(self, output_file, measurement_groups=(), **kwargs):
+        """Write the report followed by measurement groups produced one at a time
+
+        The measurement groups, e.g. from a generator reading findings from
+        a database, are written as they are produced, in constant memory,
+        see write_streaming_report. They are not added to the report.
+
+        Usage:
+            def groups(cursor):
+                for findings in cursor:
+                    yield from comprehensive_3d_sr.create_qualitative_findings(findings, ...)
+
+            comprehensive_3d_sr.write_streaming(output_file, groups(cursor))
+
+        Arguments:
+            output_file {str or file-like} -- Complete path of file, or file-like object, to write to
+
+        Keyword Arguments:
+            measurement_groups {iterable} -- Measurement groups, as ContentItems, Datasets
+                                             are deprecated (default: {()})
+            kwargs -- Passed on to write_streaming_report, e.g. deflate="auto"
+
+        Returns:
+            int -- Number of measurement groups written from measurement_groups
+        """
+        from ..io.sr_stream import write_streaming_report
+
+        return write_streaming_report(
+            output_file, self, map(as_content_item, measurement_groups), **kwargs
+        )
+
+    def get_group(self, tracking_uid=None, tracking_id=None):
+        """Get a measurement group by tracking UID or tracking ID
+
+        Keyword Arguments:
+            tracking_uid {str} -- Tracking UID of the group (default: {None})
+            tracking_id {str} -- Tracking ID of the group, if used by one group only (default: {None})
+
+        Returns:
+            ContentItem -- The measurement group, or None if there is none
+        """
+        return self.imaging_measurements.children.get(tracking_uid, tracking_id)
+
+    def replace_group(self, tracking_uid, group):
+        """Replace a measurement group, keeping its position in the report
+
+        Arguments:
+            tracking_uid {str} -- Tracking UID of the group to replace
+            group {ContentItem} -- The new measurement group, a Dataset is deprecated
+
+        Returns:
+            ContentItem -- The replaced measurement group
+        """
+        return self.imaging_measurements.children.replace(
+            tracking_uid, as_content_item(group)
+        )
+
+    def remove_group(self, tracking_uid):
+        """Remove a measurement group
+
+        Arguments:
+            tracking_uid {str} -- Tracking UID of the group to remove
+
+        Returns:
+            ContentItem -- The removed measurement group
+        """
+        return self.imaging_measurements.children.remove(tracking_uid)
+
+
+"""Keys of a finding as given to Comprehensive3DSRTID1500.add_qualitative_findings
+"""
+QUALITATIVE_FINDING_KEYWORDS = (
+    "dcm_file",
+    "finding_type",
+    "tracking_id",
+    "tracking_uid",
+    "finding_category",
+    "finding_site",
+    "location_data",
+    "location_type",
+    "contour_data",
+    "contour_type",
+    "qualitative_evaluations",
+    "coded_values",
+)
+
+
+def _create_qualitative_finding_group(
+    finding, reference, codes, tracking_id, tracking_uid
+):
+    """Create the measurement group of a qualitative finding, as of TID 1501 or,
+    with a contour, TID 1410
+    """
+    ds = container_item(
+        "CONTAINS",
+        MEASUREMENT_GROUP,
+        template_id="1501" if "contour_data" not in finding else "1410",
+    )
+    ds.append(text_item("HAS OBS CONTEXT", TRACKING_IDENTIFIER, tracking_id))
+    ds.append(uidref_item("HAS OBS CONTEXT", TRACKING_UNIQUE_IDENTIFIER, tracking_uid))
+    if "finding_category" in finding:
+        ds.append(
+            code_item(
+                "CONTAINS", FINDING_CATEGORY, codes.get(finding["finding_category"])
             )
-        elif location_data is None and contour_data is not None:
-            # Set the region using the providing contour data and type and assuming the contour is for the
-            # referenced image as given by the SOP Instance UID in the DICOM file
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "CONTAINS",
-                        "ValueType": "SCOORD",
-                        "ConceptNameCodeSequence": [
-                            ConceptNameCodeSequenceItem(
-                                "111030", "DCM", "Image Region"
-                            ).as_dict()
-                        ],
-                        "ContentSequence": [
-                            {
-                                "ReferencedSOPSequence": [
-                                    {
-                                        "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                        "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                    }
-                                ],
-                                "RelationshipType": "SELECTED FROM",
-                                "ValueType": "IMAGE",
-                            }
-                        ],
-                        "GraphicData": contour_data,
-                        "GraphicType": contour_type,
-                    },
-                )
+        )
+    ds.append(code_item("CONTAINS", FINDING, codes.get(finding["finding_type"])))
+    if "finding_site" in finding:
+        ds.append(
+            code_item(
+                "HAS CONCEPT MOD", FINDING_SITE, codes.get(finding["finding_site"])
             )
-        # Add coded value and qualitative evaluations if provided
-        if coded_values is not None:
-            ds = self.__add_coded_values__(ds, coded_values)
-        if qualitative_evaluations is not None:
-            ds = self.__add_qualitative_evaluations__(ds, qualitative_evaluations)
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
+        )
+    if "location_data" in finding:
+        graphic_data, graphic_type = finding["location_data"], finding["location_type"]
+    elif "contour_data" in finding:
+        graphic_data, graphic_type = finding["contour_data"], finding["contour_type"]
+    else:
+        graphic_data = None
+    if graphic_data is None:
+        # reference the image as a whole
+        ds.append(image_item("CONTAINS", reference))
+    else:
+        ds.append(
+            scoord_item("CONTAINS", graphic_type, graphic_data, reference, IMAGE_REGION)
+        )
+    return ds
@@ -0,0 +1,344 @@
+from datetime import datetime
+
+from pydicom import DataElement, Dataset, Sequence
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.tag import Tag
+
+from .IOD import IOD, IODTypes
+from .modules.general_modules import (
+    AcquisitionContextModule,
+    FrameOfReferenceModule,
+    MultiFrameDimensionModule,
+    MultiFrameFunctionalGroupsModule,
+)
+from .modules.specific_image_modules import EnhancedCTImageModule
+from .sequences.Sequences import generate_sequence
+from ..uid_generator import generate_uid
+from ..profiling import instrument
+
+"""Stack ID of the frames, all frames of a volume form one stack
+"""
+STACK_ID = "1"
+
+# Tag and VR of the attributes of per-frame functional groups, looked up once
+_ELEMENTS = {
+    keyword: (Tag(tag_for_keyword(keyword)), dictionary_VR(keyword))
+    for keyword in (
+        "FrameContentSequence",
+        "StackID",
+        "InStackPositionNumber",
+        "DimensionIndexValues",
+        "PlanePositionSequence",
+        "ImagePositionPatient",
+    )
+}
+
+
+class EnhancedCTImage(IOD):
+    """Implementation of the Enhanced CT Image IOD
+
+    A whole volume is stored as one multi-frame instance, with one frame per
+    slice. Attributes that are the same for all frames, e.g. pixel spacing,
+    orientation and rescale, are stored once in the shared functional
+    groups, and only the position of each frame in the per-frame functional
+    groups.
+    """
+
+    def __init__(self):
+        super().__init__(IODTypes.EnhancedCTImage)
+
+    @instrument
+    def create_empty_iod(self):
+        """Creates and empty IOD with the required DICOM tags but no values
+
+        Parameters
+        ----------
+        """
+        super().create_empty_iod()
+
+        self.copy_required_dicom_attributes(Dataset(), include_optional=True)
+
+    @instrument
+    def copy_required_dicom_attributes(
+        self, dataset_to_copy_from, include_iod_specific=True, include_optional=False
+    ):
+        """Copies required DICOM attributes from provided dataset
+
+        Parameters
+        ----------
+        dataset_to_copy_from : Dataset to copy DICOM attributes from
+        include_iod_specific : Include IOD specific DICOM attributes in copy (True)
+        include_optional : Include optional DICOM attributes in copy (False)
+        """
+        super().copy_required_dicom_attributes(dataset_to_copy_from, include_optional)
+
+        if include_iod_specific:
+            enhanced_ct_specific_image_modules = [
+                FrameOfReferenceModule(),
+                AcquisitionContextModule(),
+                MultiFrameFunctionalGroupsModule(),
+                MultiFrameDimensionModule(),
+                EnhancedCTImageModule(),
+            ]
+            for module in enhanced_ct_specific_image_modules:
+                module.copy_required_dicom_attributes(
+                    dataset_to_copy_from, self.dataset
+                )
+                if include_optional:
+                    module.copy_optional_dicom_attributes(
+                        dataset_to_copy_from, self.dataset
+                    )
+
+    @instrument
+    def initiate(self):
+        """Initiate the IOD by setting some dummy values for required attributes"""
+        import numpy as np
+
+        from ..geometry import VolumeGeometry
+
+        super().initiate()
+        # Frame of reference module
+        self.dataset.FrameOfReferenceUID = generate_uid()
+        # Enhanced General Equipment module
+        self.dataset.Manufacturer = "UNKNOWN"
+        self.dataset.ManufacturerModelName = "UNKNOWN"
+        self.dataset.DeviceSerialNumber = "00000001"
+        self.dataset.SoftwareVersions = "0.0.1"
+        # Acquisition Context Module
+        # Enhanced CT Image Module
+        self.dataset.ImageType = ["DERIVED", "SECONDARY", "AXIAL", "NONE"]
+        self.dataset.AcquisitionDateTime = datetime.now().strftime("%Y%m%d%H%M%S")
+        self.dataset.AcquisitionDuration = 0.0
+        self.dataset.ContentQualification = "PRODUCT"
+        self.dataset.SamplesPerPixel = 1
+        self.dataset.PhotometricInterpretation = "MONOCHROME2"
+        self.dataset.BitsAllocated = 16
+        self.dataset.BitsStored = 12
+        self.dataset.HighBit = 11
+        self.dataset.PixelRepresentation = 0
+        self.dataset.PixelPresentation = "MONOCHROME"
+        self.dataset.VolumetricProperties = "VOLUME"
+        self.dataset.VolumeBasedCalculationTechnique = "NONE"
+        self.dataset.PresentationLUTShape = "IDENTITY"
+        self.dataset.LossyImageCompression = "00"
+        self.dataset.BurnedInAnnotation = "NO"
+        # Multi-frame Functional Groups Module
+        self.__set_shared_functional_groups__(
+            VolumeGeometry(np.eye(4)), "1.0", "-1024.0", generate_uid()
+        )
+        self.dataset.NumberOfFrames = 0
+        # Multi-frame Dimension Module
+        dimension_organization_uid = generate_uid()
+        self.dataset.DimensionOrganizationSequence = generate_sequence(
+            "DimensionOrganizationSequence",
+            [{"DimensionOrganizationUID": dimension_organization_uid}],
+        )
+        self.dataset.DimensionOrganizationType = "3D"
+        self.dataset.DimensionIndexSequence = generate_sequence(
+            "DimensionIndexSequence",
+            [
+                {
+                    "DimensionIndexPointer": tag_for_keyword(keyword),
+                    "FunctionalGroupPointer": tag_for_keyword("FrameContentSequence"),
+                    "DimensionOrganizationUID": dimension_organization_uid,
+                }
+                for keyword in ("StackID", "InStackPositionNumber")
+            ],
+        )
+
+    def __set_shared_functional_groups__(
+        self, geometry, slice_thickness, rescale_intercept, irradiation_event_uid
+    ):
+        import numpy as np
+
+        column_spacing, row_spacing, slice_spacing = geometry.spacing.tolist()
+        row_direction = geometry.affine[0:3, 0] / column_spacing
+        column_direction = geometry.affine[0:3, 1] / row_spacing
+        self.dataset.SharedFunctionalGroupsSequence = generate_sequence(
+            "SharedFunctionalGroupsSequence",
+            [
+                {
+                    "PixelMeasuresSequence": [
+                        {
+                            "PixelSpacing": _as_ds([row_spacing, column_spacing]),
+                            "SliceThickness": slice_thickness,
+                            "SpacingBetweenSlices": _as_ds([slice_spacing])[0],
+                        }
+                    ],
+                    "PlaneOrientationSequence": [
+                        {
+                            "ImageOrientationPatient": _as_ds(
+                                np.concatenate((row_direction, column_direction))
+                            )
+                        }
+                    ],
+                    "FrameAnatomySequence": [
+                        {
+                            "AnatomicRegionSequence": [
+                                {
+                                    "CodeValue": "38266002",
+                                    "CodingSchemeDesignator": "SCT",
+                                    "CodeMeaning": "Entire body",
+                                }
+                            ],
+                            "FrameLaterality": "U",
+                        }
+                    ],
+                    "PixelValueTransformationSequence": [
+                        {
+                            "RescaleIntercept": rescale_intercept,
+                            "RescaleSlope": "1.0",
+                            "RescaleType": "HU",
+                        }
+                    ],
+                    "IrradiationEventIdentificationSequence": [
+                        {"IrradiationEventUID": irradiation_event_uid}
+                    ],
+                    "CTImageFrameTypeSequence": [
+                        {
+                            "FrameType": list(self.dataset.ImageType),
+                            "PixelPresentation": "MONOCHROME",
+                            "VolumetricProperties": "VOLUME",
+                            "VolumeBasedCalculationTechnique": "NONE",
+                        }
+                    ],
+                }
+            ],
+        )
+
+    @instrument
+    def add_pixel_data(
+        self, pixel_array, geometry=None, bits_stored=12, slice_thickness=None
+    ):
+        """Add the pixel data of a volume, one frame per slice
+
+        The position of each frame is computed from the geometry for all
+        frames at once, and the geometry that is the same for all frames is
+        added to the shared functional groups. The slice thickness is not
+        derived from the geometry, as slices may overlap or have gaps, so
+        give the SliceThickness of the source series.
+
+        Usage:
+            geometry = VolumeGeometry(affine)
+            enhanced_ct_image.add_pixel_data(volume, geometry=geometry)
+
+        Arguments:
+            pixel_array {3D np.array} -- The pixel data as (slices, rows, columns)
+
+        Keyword Arguments:
+            geometry {VolumeGeometry} -- Geometry of the volume, e.g. from VolumeGeometry.from_series
+                                         (default: {1 mm voxels at the origin})
+            bits_stored {int} -- Bits stored of uint16 pixel data (default: {12})
+            slice_thickness {float} -- Nominal slice thickness in mm, e.g. the SliceThickness
+                                       of the source series (default: {the slice thickness
+                                       already set, 1 mm after initiate})
+        """
+        import numpy as np
+
+        from ..geometry import VolumeGeometry
+
+        if pixel_array.ndim != 3:
+            raise ValueError(
+                "The pixel data must be a volume of (slices, rows, columns), "
+                f"got shape {pixel_array.shape}"
+            )
+        if geometry is None:
+            geometry = VolumeGeometry(np.eye(4))
+        number_of_frames, rows, columns = pixel_array.shape
+        if geometry.shape is not None and tuple(geometry.shape) != (
+            columns,
+            rows,
+            number_of_frames,
+        ):
+            raise ValueError(
+                f"The geometry is for (columns, rows, slices) {geometry.shape}, "
+                f"the pixel data has shape {pixel_array.shape}"
+            )
+        if pixel_array.dtype == "uint8":
+            # Enhanced CT allows 16 bits allocated only
+            pixel_array = pixel_array.astype(np.uint16)
+            bits_allocated, bits_stored, pixel_representation = 16, 8, 0
+        elif pixel_array.dtype == "uint16":
+            bits_allocated, pixel_representation = 16, 0
+        elif pixel_array.dtype == "int16":
+            bits_allocated, bits_stored, pixel_representation = 16, 16, 1
+        else:
+            raise ValueError(
+                f"Unsupported pixel type {pixel_array.dtype}, "
+                "only uint8, uint16 and int16 are supported"
+            )
+        self.dataset.SamplesPerPixel = 1
+        self.dataset.PhotometricInterpretation = "MONOCHROME2"
+        self.dataset.Rows = rows
+        self.dataset.Columns = columns
+        self.dataset.BitsAllocated = bits_allocated
+        self.dataset.BitsStored = bits_stored
+        self.dataset.HighBit = bits_stored - 1
+        self.dataset.PixelRepresentation = pixel_representation
+        shared_groups = self.dataset.SharedFunctionalGroupsSequence[0]
+        if slice_thickness is None:
+            slice_thickness = shared_groups.PixelMeasuresSequence[0].SliceThickness
+        irradiation_event = shared_groups.IrradiationEventIdentificationSequence[0]
+        # signed pixel data is taken to be in HU already
+        self.__set_shared_functional_groups__(
+            geometry,
+            _as_ds([slice_thickness])[0],
+            "0.0" if pixel_representation else "-1024.0",
+            irradiation_event.IrradiationEventUID,
+        )
+        # position of the first pixel of each frame, for all frames at once
+        frame_indices = np.zeros((number_of_frames, 3))
+        frame_indices[:, 2] = np.arange(number_of_frames)
+        positions = _as_ds(geometry.voxel_to_patient(frame_indices))
+        self.dataset.PerFrameFunctionalGroupsSequence = Sequence(
+            [
+                _frame_functional_groups(ind + 1, position)
+                for ind, position in enumerate(positions)
+            ]
+        )
+        self.dataset.NumberOfFrames = number_of_frames
+        self.dataset.PixelData = np.ascontiguousarray(pixel_array).tobytes()
+
+
+def _as_ds(values):
+    """Format numbers as DS strings of at most 16 characters"""
+    import numpy as np
+
+    return np.char.mod("%.10g", np.asarray(values, dtype=np.float64)).tolist()
+
+
+def _element(keyword, value):
+    tag, VR = _ELEMENTS[keyword]
+    return DataElement(tag, VR, value)
+
+
+def _frame_functional_groups(in_stack_position_number, position):
+    """Per-frame functional groups of one frame, created without attribute lookups"""
+    frame_content = Dataset(
+        {
+            _ELEMENTS["StackID"][0]: _element("StackID", STACK_ID),
+            _ELEMENTS["InStackPositionNumber"][0]: _element(
+                "InStackPositionNumber", in_stack_position_number
+            ),
+            _ELEMENTS["DimensionIndexValues"][0]: _element(
+                "DimensionIndexValues", [1, in_stack_position_number]
+            ),
+        }
+    )
+    plane_position = Dataset(
+        {
+            _ELEMENTS["ImagePositionPatient"][0]: _element(
+                "ImagePositionPatient", position
+            )
+        }
+    )
+    return Dataset(
+        {
+            _ELEMENTS["FrameContentSequence"][0]: _element(
+                "FrameContentSequence", Sequence([frame_content])
+            ),
+            _ELEMENTS["PlanePositionSequence"][0]: _element(
+                "PlanePositionSequence", Sequence([plane_position])
+            ),
+        }
+    )
@@ -3,7 +3,6 @@ import random
 from datetime import datetime
 
 from pydicom import Dataset, dcmread
-from pydicom.uid import generate_uid
 
 from .IOD import IOD, IODTypes, SOP_CLASS_UID_MODALITY_DICT
 from .modules.specific_sr_modules import SRDocumentSeriesModule, SRDocumentGeneralModule
@@ -11,9 +10,54 @@ from .modules.specific_sr_modules import SRDocumentContentModule
 from .sequences.Sequences import (
     generate_sequence,
     generate_CRPES_sequence,
-    update_and_insert_additional_DICOM_attributes_in_ds,
+    get_dataset_from_dcm,
+)
+from .sequences.ContentItems import (
+    ANATOMICAL_LOCATIONS,
+    CENTER,
+    CENTER_POINT,
+    CUBIC_MILLIMETER,
+    FINDING,
+    FINDING_SITE,
+    MEASUREMENT_GROUP,
+    MILLIMETER,
+    QUALITATIVE_EVALUATIONS,
+    REFERENCED_SEGMENT,
+    SOURCE_SERIES_FOR_SEGMENTATION,
+    TRACKING_IDENTIFIER,
+    TRACKING_UNIQUE_IDENTIFIER,
+    VOLUME,
+    CodeTable,
+    accepts_dataset,
+    as_code,
+    as_content_item,
+    code_item,
+    container_item,
+    content_sequence,
+    image_item,
+    image_library_entry,
+    measurement_report_content,
+    parse_measurement_report,
+    num_item,
+    resolve_references,
+    scoord_item,
+    text_item,
+    uidref_item,
+)
+from ..uid_generator import generate_uid
+from ..io.references import harvest_references
+from ..profiling import instrument
+
+"""Columns of add_measurements with spatial coordinates on the image referenced
+by the dcm_ref of the row
+"""
+COLUMNS_ON_REFERENCED_IMAGE = (
+    "graphic_data_center",
+    "landmark_graphic_data",
+    "linear_measurement",
+    "linear_measurement_axis2",
+    "unmeasurable_reason",
 )
-from .sequences.Sequences import generate_reference_sop_sequence_json
 
 
 class EnhancedSRTID1500(IOD):
@@ -21,7 +65,91 @@ class EnhancedSRTID1500(IOD):
 
     def __init__(self):
         super().__init__(IODTypes.EnhancedSR)
+        # content tree, created by initiate
+        self.content = None
+        self.image_library = None
+        self.imaging_measurements = None
+        # references of files added to the report, by file path
+        self._resolved_files = dict()
+
+    @classmethod
+    def from_dataset(cls, dataset, new_instance=True):
+        """Load an existing report, to add measurement groups to it
+
+        The content of the report is not copied. Only the image library and
+        the measurement groups are unpacked, and the groups are indexed by
+        their tracking identifiers, so that groups can be added, replaced
+        or removed without rebuilding the rest of the report.
+
+        A changed report is a new SOP instance, so by default the report gets
+        a new SOP Instance UID and content date and time, and the original is
+        referenced in the Predecessor Documents Sequence.
+
+        Usage:
+            enhanced_sr = EnhancedSRTID1500.from_file("report.dcm")
+            enhanced_sr.add_landmark(...)
+            enhanced_sr.write_to_file("updated_report.dcm")
+
+        Arguments:
+            dataset {Dataset} -- The report, e.g. as read by dcmread, copied
+                                 for a new instance, else used as is if it
+                                 has file meta information
+
+        Keyword Arguments:
+            new_instance {bool} -- Make the report a new instance, succeeding
+                                   the dataset (default: {True})
+
+        Returns:
+            EnhancedSRTID1500 -- The report, ready to add measurement groups to
+        """
+        sr = cls()
+        if dataset.get("SOPClassUID") != sr.iod_type.value:
+            raise ValueError(
+                f"Expected SOP Class UID {sr.iod_type.value}, "
+                f"got {dataset.get('SOPClassUID')}"
+            )
+        if new_instance or getattr(dataset, "file_meta", None) is None:
+            # the new instance is a copy, the dataset stays the original report
+            sr.copy_dataset(dataset)
+        else:
+            sr.dataset = dataset
+        if new_instance:
+            # the Predecessor Documents Sequence uses the same hierarchical
+            # SOP instance references as the evidence sequence
+            predecessor_documents = list(
+                sr.dataset.get("PredecessorDocumentsSequence", [])
+            )
+            predecessor_documents.extend(generate_CRPES_sequence([sr.dataset]))
+            sr.dataset.PredecessorDocumentsSequence = predecessor_documents
+            sr.dataset.SOPInstanceUID = generate_uid()
+            sr.dataset.ContentDate = datetime.now().strftime("%Y%m%d")
+            sr.dataset.ContentTime = datetime.now().strftime("%H%M%S")
+        if "SOPInstanceUID" in sr.dataset:
+            sr.dataset.file_meta.MediaStorageSOPInstanceUID = sr.dataset.SOPInstanceUID
+        (
+            sr.content,
+            sr.image_library,
+            sr.imaging_measurements,
+        ) = parse_measurement_report(sr.dataset)
+        return sr
+
+    @classmethod
+    def from_file(cls, dcm_file, new_instance=True):
+        """Load an existing report from file, see from_dataset
+
+        Arguments:
+            dcm_file <class 'str'> -- Path of the report
 
+        Keyword Arguments:
+            new_instance {bool} -- Make the report a new instance, succeeding
+                                   the file (default: {True})
+
+        Returns:
+            EnhancedSRTID1500 -- The report, ready to add measurement groups to
+        """
+        return cls.from_dataset(dcmread(dcm_file), new_instance)
+
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
         Parameters
@@ -31,6 +159,7 @@ class EnhancedSRTID1500(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(
         self, dataset_to_copy_from, include_iod_specific=True, include_optional=False
     ):
@@ -58,20 +187,18 @@ class EnhancedSRTID1500(IOD):
                         dataset_to_copy_from, self.dataset
                     )
 
+    @instrument
     def initiate(self, referenced_dcms=None):
         """Initiate the IOD by setting some dummy values for required attributes
 
         Keyword Arguments:
-            referenced_dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths (default: {None})
+            referenced_dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords (default: {None})
         """
         super().initiate()
         if referenced_dcms:
+            referenced_dcms = self._harvest_references(referenced_dcms)
             # some attributes to inherit from referenced dcm files
-            ds = None
-            if isinstance(referenced_dcms[0], Dataset):
-                ds = referenced_dcms[0]
-            else:
-                ds = dcmread(referenced_dcms[0])
+            ds = get_dataset_from_dcm(referenced_dcms[0])
             self.dataset.PatientID = ds.PatientID
             self.dataset.PatientName = ds.PatientName
             self.dataset.PatientSex = ds.PatientSex
@@ -122,137 +249,43 @@ class EnhancedSRTID1500(IOD):
             ],
         )
         self.dataset.ContinuityOfContent = "SEPARATE"
-        self.dataset.ContentSequence = generate_sequence(
-            "ContentSequence",
-            [
-                {
-                    "RelationshipType": "HAS CONCEPT MOD",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121049",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Language of Content Item and Descendants",
-                        }
-                    ],
-                    "ConceptCodeSequence": [
-                        {
-                            "CodeValue": "eng",
-                            "CodingSchemeDesignator": "RFC5646",
-                            "CodeMeaning": "English",
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "HAS CONCEPT MOD",
-                            "ValueType": "CODE",
-                            "ConceptNameCodeSequence": [
-                                {
-                                    "CodeValue": "121046",
-                                    "CodingSchemeDesignator": "DCM",
-                                    "CodeMeaning": "Country of Language",
-                                }
-                            ],
-                            "ConceptCodeSequence": [
-                                {
-                                    "CodeValue": "US",
-                                    "CodingSchemeDesignator": "ISO3166_1",
-                                    "CodeMeaning": "United States",
-                                }
-                            ],
-                        }
-                    ],
-                },
-                {
-                    "RelationshipType": "HAS CONCEPT MOD",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121058",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Procedure Reported",
-                        }
-                    ],
-                    "ConceptCodeSequence": [
-                        {
-                            "CodeValue": "363679005",
-                            "CodingSchemeDesignator": "SCT",
-                            "CodeMeaning": "Imaging Procedure",
-                        }
-                    ],
-                },
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CONTAINER",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "111028",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Image Library",
-                        }
-                    ],
-                    "ContinuityOfContent": "SEPARATE",
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "CONTAINS",
-                            "ValueType": "CONTAINER",
-                            "ConceptNameCodeSequence": [
-                                {
-                                    "CodeValue": "126200",
-                                    "CodingSchemeDesignator": "DCM",
-                                    "CodeMeaning": "Image Library Group",
-                                }
-                            ],
-                            "ContinuityOfContent": "SEPARATE",
-                            "ContentSequence": [
-                                generate_reference_sop_sequence_json(dcm_file)
-                                for dcm_file in referenced_dcms
-                            ],
-                        }
-                    ],
-                },
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CONTAINER",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "126010",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Imaging Measurements",
-                        }
-                    ],
-                    "ContinuityOfContent": "SEPARATE",
-                    "ContentSequence": [],
-                },
-            ],
+        # the content is built as a content tree, see materialize
+        self.content = measurement_report_content(
+            [image_library_entry(dcm_file) for dcm_file in referenced_dcms or []]
         )
+        self.image_library = self.content[2].children[0]
+        self.imaging_measurements = self.content[3]
+
+    def materialize(self):
+        """Convert the content tree to the Content Sequence of the dataset"""
+        if self.content is not None:
+            self.dataset.ContentSequence = content_sequence(self.content)
 
+    def _resolve_reference(self, dcm):
+        return resolve_references([dcm], self._resolved_files)[0]
+
+    def _harvest_references(self, dcms):
+        """Read each referenced file once, also for later references to it"""
+        records = dict()
+        references = harvest_references(dcms, records=records)
+        for dcm_file, record in records.items():
+            self._resolved_files[dcm_file] = (
+                record.SOPClassUID,
+                record.SOPInstanceUID,
+                None,
+            )
+        return references
+
+    @instrument
     def initiate_measurement_group(self):
         """Initiate a measurement group
 
         Returns:
-            [type] -- [description]
+            ContentItem -- The measurement group container
         """
-        ds = Dataset()
-        ds.RelationshipType = "CONTAINS"
-        ds.ValueType = "CONTAINER"
-        ds.ConceptNameCodeSequence = generate_sequence(
-            "ConceptNameCodeSequence",
-            [
-                {
-                    "CodeValue": "125007",
-                    "CodingSchemeDesignator": "DCM",
-                    "CodeMeaning": "Measurement Group",
-                }
-            ],
-        )
-        ds.ContinuityOfContent = "SEPARATE"
-        # ds.ContentTemplateSequence = generate_sequence("ContentTemplateSequence", [{
-        #     "MappingResource": "DCMR",
-        #     "MappingResourceUID": "1.2.840.10008.8.1.1",
-        #     "TemplateIdentifier": "1411"}])
-        return ds
+        return container_item("CONTAINS", MEASUREMENT_GROUP)
 
+    @instrument
     def initiate_content_sequence(
         self, tracking_id, tracking_uid, finding, finding_site
     ):
@@ -263,191 +296,115 @@ class EnhancedSRTID1500(IOD):
             tracking_uid {[type]} -- [description]
             finding {[type]} -- [description]
             finding_site {[type]} -- [description]
+
+        Returns:
+            list -- Content items of the measurement group
         """
-        return generate_sequence(
-            "ContentSequence",
-            [
-                {
-                    "RelationshipType": "HAS OBS CONTEXT",
-                    "ValueType": "TEXT",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "112039",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Tracking Identifier",
-                        }
-                    ],
-                    "TextValue": tracking_id,
-                },
-                {
-                    "RelationshipType": "HAS OBS CONTEXT",
-                    "ValueType": "UIDREF",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "112040",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Tracking Unique Identifier",
-                        }
-                    ],
-                    "UID": tracking_uid,
-                },
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121071",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Finding",
-                        }
-                    ],
-                    "ConceptCodeSequence": [
-                        {
-                            "CodeValue": finding[0],
-                            "CodingSchemeDesignator": finding[1],
-                            "CodeMeaning": finding[2],
-                        }
-                    ],
-                },
-                {
-                    "RelationshipType": "HAS CONCEPT MOD",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "363698007",
-                            "CodingSchemeDesignator": "SCT",
-                            "CodeMeaning": "Finding Site",
-                        }
-                    ],
-                    "ConceptCodeSequence": [
-                        {
-                            "CodeValue": finding_site[0],
-                            "CodingSchemeDesignator": finding_site[1],
-                            "CodeMeaning": finding_site[2],
-                        }
-                    ],
-                },
-            ],
-        )
+        return [
+            text_item("HAS OBS CONTEXT", TRACKING_IDENTIFIER, tracking_id),
+            uidref_item("HAS OBS CONTEXT", TRACKING_UNIQUE_IDENTIFIER, tracking_uid),
+            code_item("CONTAINS", FINDING, as_code(finding)),
+            code_item("HAS CONCEPT MOD", FINDING_SITE, as_code(finding_site)),
+        ]
 
+    @accepts_dataset
+    @instrument
     def add_qualitative_evaluations(self, ds, qualitative_evaluations):
         """Add a qualitative evaluation
 
         Arguments:
-            ds {[type]} -- [description]
+            ds {ContentItem} -- Measurement group, a Dataset is deprecated
             qualitative_evaluations {[type]} -- [description]
         """
         for item in qualitative_evaluations:
             if item is None:
                 continue
             if "text_value" in item:
-                ds.ContentSequence.append(
-                    update_and_insert_additional_DICOM_attributes_in_ds(
-                        Dataset(),
-                        {
-                            "RelationshipType": "CONTAINS",
-                            "ValueType": "TEXT",
-                            "ConceptNameCodeSequence": [
-                                {
-                                    "CodeValue": "C00034375",
-                                    "CodingSchemeDesignator": "UMLS",
-                                    "CodeMeaning": "Qualitative Evaluations",
-                                }
-                            ],
-                            "TextValue": item["text_value"],
-                        },
-                    )
+                ds.append(
+                    text_item("CONTAINS", QUALITATIVE_EVALUATIONS, item["text_value"])
                 )
             else:
-                ds.ContentSequence.append(
-                    update_and_insert_additional_DICOM_attributes_in_ds(
-                        Dataset(),
-                        {
-                            "RelationshipType": "CONTAINS",
-                            "ValueType": "CODE",
-                            "ConceptNameCodeSequence": [
-                                {
-                                    "CodeValue": "C00034375",
-                                    "CodingSchemeDesignator": "UMLS",
-                                    "CodeMeaning": "Qualitative Evaluations",
-                                }
-                            ],
-                            "ConceptCodeSequence": [
-                                {
-                                    "CodeValue": item["code_value"][0],
-                                    "CodingSchemeDesignator": item["code_value"][1],
-                                    "CodeMeaning": item["code_value"][2],
-                                }
-                            ],
-                        },
+                ds.append(
+                    code_item(
+                        "CONTAINS", QUALITATIVE_EVALUATIONS, as_code(item["code_value"])
                     )
                 )
         return ds
 
+    @accepts_dataset
+    @instrument
     def add_coded_values(self, ds, coded_values):
         """Add coded values
 
         Arguments:
-            ds {[type]} -- [description]
+            ds {ContentItem} -- Measurement group, a Dataset is deprecated
             qualitative_evaluations {[type]} -- [description]
         """
         for item in coded_values:
             if item is None:
                 continue
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "HAS CONCEPT MOD",
-                        "ValueType": "CODE",
-                        "ConceptNameCodeSequence": [
-                            {
-                                "CodeValue": item["ConceptNameCode"][0],
-                                "CodingSchemeDesignator": item["ConceptNameCode"][1],
-                                "CodeMeaning": item["ConceptNameCode"][2],
-                            }
-                        ],
-                        "ConceptCodeSequence": [
-                            {
-                                "CodeValue": item["ConceptCode"][0],
-                                "CodingSchemeDesignator": item["ConceptCode"][1],
-                                "CodeMeaning": item["ConceptCode"][2],
-                            }
-                        ],
-                    },
+            ds.append(
+                code_item(
+                    "HAS CONCEPT MOD",
+                    as_code(item["ConceptNameCode"]),
+                    as_code(item["ConceptCode"]),
                 )
             )
         return ds
 
+    @accepts_dataset
+    @instrument
     def add_text_values(self, ds, text_values):
         """Add text values
 
         Arguments:
-            ds {[type]} -- [description]
+            ds {ContentItem} -- Measurement group, a Dataset is deprecated
             qualitative_evaluations {[type]} -- [description]
         """
         for item in text_values:
             if item is None:
                 continue
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "HAS CONCEPT MOD",
-                        "ValueType": "TEXT",
-                        "ConceptNameCodeSequence": [
-                            {
-                                "CodeValue": item["ConceptNameCode"][0],
-                                "CodingSchemeDesignator": item["ConceptNameCode"][1],
-                                "CodeMeaning": item["ConceptNameCode"][2],
-                            }
-                        ],
-                        "TextValue": item["TextValue"],
-                    },
+            ds.append(
+                text_item(
+                    "HAS CONCEPT MOD",
+                    as_code(item["ConceptNameCode"]),
+                    item["TextValue"],
                 )
             )
         return ds
 
+    def _add_measurement_group(
+        self,
+        items,
+        finding,
+        finding_site,
+        tracking_id,
+        tracking_uid,
+        qualitative_evaluations,
+        coded_values,
+        text_values,
+    ):
+        """Add a measurement group with the given measurement items"""
+        if not tracking_id:
+            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
+        if not tracking_uid:
+            tracking_uid = generate_uid()
+        ds = self.initiate_measurement_group()
+        ds.extend(
+            self.initiate_content_sequence(
+                tracking_id, tracking_uid, finding, finding_site
+            )
+        )
+        if coded_values is not None:
+            ds = self.add_coded_values(ds, coded_values)
+        ds.extend(items)
+        if text_values is not None:
+            ds = self.add_text_values(ds, text_values)
+        if qualitative_evaluations is not None:
+            ds = self.add_qualitative_evaluations(ds, qualitative_evaluations)
+        self.imaging_measurements.append(ds)
+
+    @instrument
     def add_landmark(
         self,
         dcm_file,
@@ -472,66 +429,26 @@ class EnhancedSRTID1500(IOD):
             tracking_id {[type]} -- [description] (default: {None})
             tracking_uid {[type]} -- [description] (default: {None})
         """
-        if not tracking_id:
-            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
-        if not tracking_uid:
-            tracking_uid = generate_uid()
-        ds_ref = dcmread(dcm_file)
-        ds = self.initiate_measurement_group()
-        ds.ContentSequence = self.initiate_content_sequence(
-            tracking_id, tracking_uid, finding, finding_site
-        )
-        if coded_values is not None:
-            ds = self.add_coded_values(ds, coded_values)
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "CODE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "758637006",
-                            "CodingSchemeDesignator": "SCT",
-                            "CodeMeaning": "Anatomical locations",
-                        }
-                    ],
-                    "ConceptCodeSequence": [
-                        {
-                            "CodeValue": "26216008",
-                            "CodingSchemeDesignator": "SCT",
-                            "CodeMeaning": "Center",
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "INFERRED FROM",
-                            "ValueType": "SCOORD",
-                            "ContentSequence": [
-                                {
-                                    "ReferencedSOPSequence": [
-                                        {
-                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                            "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                        }
-                                    ],
-                                    "RelationshipType": "SELECTED FROM",
-                                    "ValueType": "IMAGE",  # value type
-                                }
-                            ],
-                            "GraphicData": graphic_data,
-                            "GraphicType": "POINT",
-                        }
-                    ],
-                },
-            )
+        reference = self._resolve_reference(dcm_file)
+        self._add_measurement_group(
+            [
+                code_item(
+                    "CONTAINS",
+                    ANATOMICAL_LOCATIONS,
+                    CENTER,
+                    [scoord_item("INFERRED FROM", "POINT", graphic_data, reference)],
+                )
+            ],
+            finding,
+            finding_site,
+            tracking_id,
+            tracking_uid,
+            qualitative_evaluations,
+            coded_values,
+            text_values,
         )
-        if text_values is not None:
-            ds = self.add_text_values(ds, text_values)
-        if qualitative_evaluations is not None:
-            ds = self.add_qualitative_evaluations(ds, qualitative_evaluations)
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
 
+    @instrument
     def add_unmeasurable_measurement(
         self,
         dcm_file,
@@ -554,54 +471,26 @@ class EnhancedSRTID1500(IOD):
             tracking_id {[type]} -- [description] (default: {None})
             tracking_uid {[type]} -- [description] (default: {None})
         """
-        if not tracking_id:
-            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
-        if not tracking_uid:
-            tracking_uid = generate_uid()
-        ds_ref = dcmread(dcm_file)
-        ds = self.initiate_measurement_group()
-        ds.ContentSequence = self.initiate_content_sequence(
-            tracking_id, tracking_uid, finding, finding_site
-        )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "TEXT",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "C00034375",
-                            "CodingSchemeDesignator": "UMLS",
-                            "CodeMeaning": "Qualitative Evaluations",
-                        }
-                    ],
-                    "TextValue": reason,
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "INFERRED FROM",
-                            "ValueType": "SCOORD",
-                            "ContentSequence": [
-                                {
-                                    "ReferencedSOPSequence": [
-                                        {
-                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                            "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                        }
-                                    ],
-                                    "RelationshipType": "SELECTED FROM",
-                                    "ValueType": "IMAGE",  # value type
-                                }
-                            ],
-                            "GraphicData": graphic_data,
-                            "GraphicType": "CIRCLE",
-                        }
-                    ],
-                },
-            )
+        reference = self._resolve_reference(dcm_file)
+        self._add_measurement_group(
+            [
+                text_item(
+                    "CONTAINS",
+                    QUALITATIVE_EVALUATIONS,
+                    reason,
+                    [scoord_item("INFERRED FROM", "CIRCLE", graphic_data, reference)],
+                )
+            ],
+            finding,
+            finding_site,
+            tracking_id,
+            tracking_uid,
+            None,
+            None,
+            None,
         )
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
 
+    @instrument
     def add_linear_measurement_single_axis(
         self,
         dcm_ref,
@@ -626,85 +515,26 @@ class EnhancedSRTID1500(IOD):
             finding {[type]} -- [description]
             finding_site {[type]} -- [description]
         """
-        if not tracking_id:
-            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
-        if not tracking_uid:
-            tracking_uid = generate_uid()
-        referenced_sop_sequence = None
-        if isinstance(dcm_ref, str):
-            ds_ref = dcmread(dcm_ref)
-            referenced_sop_sequence = [
-                {
-                    "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                    "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                }
-            ]
-        else:
-            referenced_sop_sequence = [
-                {
-                    "ReferencedSOPClassUID": dcm_ref.ReferencedSOPClassUID,
-                    "ReferencedSOPInstanceUID": dcm_ref.ReferencedSOPInstanceUID,
-                }
-            ]
-            if "ReferencedFrameNumber" in dcm_ref:
-                referenced_sop_sequence[0][
-                    "ReferencedFrameNumber"
-                ] = dcm_ref.ReferencedFrameNumber
-        ds = self.initiate_measurement_group()
-        ds.ContentSequence = self.initiate_content_sequence(
-            tracking_id, tracking_uid, finding, finding_site
-        )
-        if coded_values is not None:
-            ds = self.add_coded_values(ds, coded_values)
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "NUM",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": measurement_type[0],
-                            "CodingSchemeDesignator": measurement_type[1],
-                            "CodeMeaning": measurement_type[2],
-                        }
-                    ],
-                    "MeasuredValueSequence": [
-                        {
-                            "MeasurementUnitsCodeSequence": [
-                                {
-                                    "CodeValue": "mm",
-                                    "CodingSchemeDesignator": "UCUM",
-                                    "CodeMeaning": "millimeter",
-                                }
-                            ],
-                            "NumericValue": linear_measurement,
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "INFERRED FROM",
-                            "ValueType": "SCOORD",
-                            "ContentSequence": [
-                                {
-                                    "ReferencedSOPSequence": referenced_sop_sequence,
-                                    "RelationshipType": "SELECTED FROM",
-                                    "ValueType": "IMAGE",  # value type
-                                }
-                            ],
-                            "GraphicData": graphic_data,
-                            "GraphicType": "POLYLINE",
-                        }
-                    ],
-                },
-            )
+        reference = self._resolve_reference(dcm_ref)
+        self._add_measurement_group(
+            [
+                _create_linear_measurement(
+                    as_code(measurement_type),
+                    linear_measurement,
+                    graphic_data,
+                    reference,
+                )
+            ],
+            finding,
+            finding_site,
+            tracking_id,
+            tracking_uid,
+            qualitative_evaluations,
+            coded_values,
+            text_values,
         )
-        if text_values is not None:
-            ds = self.add_text_values(ds, text_values)
-        if qualitative_evaluations is not None:
-            ds = self.add_qualitative_evaluations(ds, qualitative_evaluations)
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
 
+    @instrument
     def add_linear_measurement_double_axis(
         self,
         dcm_file,
@@ -737,122 +567,32 @@ class EnhancedSRTID1500(IOD):
             tracking_id {[type]} -- [description]
             tracking_uid {[type]} -- [description]
         """
-        if not tracking_id:
-            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
-        if not tracking_uid:
-            tracking_uid = generate_uid()
-        if isinstance(dcm_file, str):
-            ds_ref = dcmread(dcm_file)
-        else:
-            ds_ref = dcm_file
-        ds = self.initiate_measurement_group()
-        ds.ContentSequence = self.initiate_content_sequence(
-            tracking_id, tracking_uid, finding, finding_site
-        )
-        if coded_values is not None:
-            ds = self.add_coded_values(ds, coded_values)
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "NUM",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": measurement_type_axis1[0],
-                            "CodingSchemeDesignator": measurement_type_axis1[1],
-                            "CodeMeaning": measurement_type_axis1[2],
-                        }
-                    ],
-                    "MeasuredValueSequence": [
-                        {
-                            "MeasurementUnitsCodeSequence": [
-                                {
-                                    "CodeValue": "mm",
-                                    "CodingSchemeDesignator": "UCUM",
-                                    "CodeMeaning": "millimeter",
-                                }
-                            ],
-                            "NumericValue": linear_measurement_axis1,
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "INFERRED FROM",
-                            "ValueType": "SCOORD",
-                            "ContentSequence": [
-                                {
-                                    "ReferencedSOPSequence": [
-                                        {
-                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                            "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                        }
-                                    ],
-                                    "RelationshipType": "SELECTED FROM",
-                                    "ValueType": "IMAGE",  # value type
-                                }
-                            ],
-                            "GraphicData": graphic_data_axis1,
-                            "GraphicType": "POLYLINE",
-                        }
-                    ],
-                },
-            )
-        )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "NUM",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": measurement_type_axis2[0],
-                            "CodingSchemeDesignator": measurement_type_axis2[1],
-                            "CodeMeaning": measurement_type_axis2[2],
-                        }
-                    ],
-                    "MeasuredValueSequence": [
-                        {
-                            "MeasurementUnitsCodeSequence": [
-                                {
-                                    "CodeValue": "mm",
-                                    "CodingSchemeDesignator": "UCUM",
-                                    "CodeMeaning": "millimeter",
-                                }
-                            ],
-                            "NumericValue": linear_measurement_axis2,
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "INFERRED FROM",
-                            "ValueType": "SCOORD",
-                            "ContentSequence": [
-                                {
-                                    "ReferencedSOPSequence": [
-                                        {
-                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                            "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                        }
-                                    ],
-                                    "RelationshipType": "SELECTED FROM",
-                                    "ValueType": "IMAGE",  # value type
-                                }
-                            ],
-                            "GraphicData": graphic_data_axis2,
-                            "GraphicType": "POLYLINE",
-                        }
-                    ],
-                },
-            )
+        reference = self._resolve_reference(dcm_file)
+        self._add_measurement_group(
+            [
+                _create_linear_measurement(
+                    as_code(measurement_type_axis1),
+                    linear_measurement_axis1,
+                    graphic_data_axis1,
+                    reference,
+                ),
+                _create_linear_measurement(
+                    as_code(measurement_type_axis2),
+                    linear_measurement_axis2,
+                    graphic_data_axis2,
+                    reference,
+                ),
+            ],
+            finding,
+            finding_site,
+            tracking_id,
+            tracking_uid,
+            qualitative_evaluations,
+            coded_values,
+            text_values,
         )
-        if text_values is not None:
-            ds = self.add_text_values(ds, text_values)
-        if qualitative_evaluations is not None:
-            ds = self.add_qualitative_evaluations(ds, qualitative_evaluations)
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
 
+    @instrument
     def add_volume_measurement(
         self,
         seg_dcm_file,
@@ -886,124 +626,31 @@ class EnhancedSRTID1500(IOD):
             coded_values {[type]} -- [description] (default: {None})
             text_values {[type]} -- [description] (default: {None})
         """
-
-        if not tracking_id:
-            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
-        if not tracking_uid:
-            tracking_uid = generate_uid()
-        ds_ref_seg = dcmread(seg_dcm_file)
-        ds = self.initiate_measurement_group()
-        ds.ContentSequence = self.initiate_content_sequence(
-            tracking_id, tracking_uid, finding, finding_site
-        )
-        if coded_values is not None:
-            ds = self.add_coded_values(ds, coded_values)
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "ReferencedSOPSequence": [
-                        {
-                            "ReferencedSOPClassUID": ds_ref_seg.SOPClassUID,
-                            "ReferencedSOPInstanceUID": ds_ref_seg.SOPInstanceUID,
-                            "ReferencedSegmentNumber": segment_number,
-                        }
-                    ],
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "IMAGE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121191",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Referenced Segment",
-                        }
-                    ],
-                },
-            )
-        )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "UIDREF",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121232",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Source series for segmentation",
-                        }
-                    ],
-                    "UID": ds_ref_seg.ReferencedSeriesSequence[0].SeriesInstanceUID,
-                },
-            )
-        )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "NUM",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "118565006",
-                            "CodingSchemeDesignator": "SCT",
-                            "CodeMeaning": "Volume",
-                        }
-                    ],
-                    "MeasuredValueSequence": [
-                        {
-                            "MeasurementUnitsCodeSequence": [
-                                {
-                                    "CodeValue": "mm3",
-                                    "CodingSchemeDesignator": "UCUM",
-                                    "CodeMeaning": "cubic millimeter",
-                                }
-                            ],
-                            "NumericValue": volume_measurement,
-                        }
-                    ],
-                },
-            )
+        items = _create_volume_measurement(
+            get_dataset_from_dcm(seg_dcm_file), segment_number, volume_measurement
         )
         if graphic_data is not None:
-            ds_ref = dcmread(dcm_file)
-            ds.ContentSequence.append(
-                update_and_insert_additional_DICOM_attributes_in_ds(
-                    Dataset(),
-                    {
-                        "RelationshipType": "CONTAINS",
-                        "ValueType": "SCOORD",
-                        "ConceptNameCodeSequence": [
-                            {
-                                "CodeValue": "111010",
-                                "CodingSchemeDesignator": "DCM",
-                                "CodeMeaning": "Center",
-                            }
-                        ],
-                        "ContentSequence": [
-                            {
-                                "ReferencedSOPSequence": [
-                                    {
-                                        "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                        "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                    }
-                                ],
-                                "RelationshipType": "SELECTED FROM",
-                                "ValueType": "IMAGE",  # value type
-                            }
-                        ],
-                        "GraphicData": graphic_data,
-                        "GraphicType": "POINT",
-                    },
+            items.append(
+                scoord_item(
+                    "CONTAINS",
+                    "POINT",
+                    graphic_data,
+                    self._resolve_reference(dcm_file),
+                    CENTER_POINT,
                 )
             )
-        if text_values is not None:
-            ds = self.add_text_values(ds, text_values)
-        if qualitative_evaluations is not None:
-            ds = self.add_qualitative_evaluations(ds, qualitative_evaluations)
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
+        self._add_measurement_group(
+            items,
+            finding,
+            finding_site,
+            tracking_id,
+            tracking_uid,
+            qualitative_evaluations,
+            coded_values,
+            text_values,
+        )
 
+    @instrument
     def add_volume_and_linear_measurement_single_axis(
         self,
         seg_dcm_file,
@@ -1040,167 +687,482 @@ class EnhancedSRTID1500(IOD):
             coded_values {[type]} -- [description] (default: {None})
             text_values {[type]} -- [description] (default: {None})
         """
-
-        if not tracking_id:
-            tracking_id = "".join(random.choice("0123456789ABCDEF") for i in range(16))
-        if not tracking_uid:
-            tracking_uid = generate_uid()
-        ds_ref_seg = dcmread(seg_dcm_file)
-        ds_ref = dcmread(dcm_file)
-        ds = self.initiate_measurement_group()
-        ds.ContentSequence = self.initiate_content_sequence(
-            tracking_id, tracking_uid, finding, finding_site
+        reference = self._resolve_reference(dcm_file)
+        items = _create_volume_measurement(
+            get_dataset_from_dcm(seg_dcm_file), segment_number, volume_measurement
         )
-        if coded_values is not None:
-            ds = self.add_coded_values(ds, coded_values)
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "ReferencedSOPSequence": [
-                        {
-                            "ReferencedSOPClassUID": ds_ref_seg.SOPClassUID,
-                            "ReferencedSOPInstanceUID": ds_ref_seg.SOPInstanceUID,
-                            "ReferencedSegmentNumber": segment_number,
-                        }
-                    ],
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "IMAGE",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121191",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Referenced Segment",
-                        }
-                    ],
-                },
+        items.append(
+            scoord_item(
+                "CONTAINS", "POINT", graphic_data_center, reference, CENTER_POINT
             )
         )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "UIDREF",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "121232",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Source series for segmentation",
-                        }
-                    ],
-                    "UID": ds_ref_seg.ReferencedSeriesSequence[0].SeriesInstanceUID,
-                },
+        items.append(
+            _create_linear_measurement(
+                as_code(measurement_type),
+                linear_measurement,
+                graphic_data_linear_measurement,
+                reference,
             )
         )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
+        self._add_measurement_group(
+            items,
+            finding,
+            finding_site,
+            tracking_id,
+            tracking_uid,
+            qualitative_evaluations,
+            coded_values,
+            text_values,
+        )
+
+    @instrument
+    def add_measurements(
+        self, measurements, measurement_type=None, finding=None, finding_site=None
+    ):
+        """Add measurements in bulk, one measurement group per row of a table
+
+        The columns of the table correspond to the arguments of the add_*
+        methods adding one measurement group. Each row gives a group with the
+        measurements of the columns that are set in that row, e.g. a landmark,
+        a volume, or a volume and a linear measurement. The columns are
+        converted first, each referenced file being read once, header only,
+        however many rows reference it, and equal codes once. The groups are
+        then created row by row and appended to the report together.
+
+        Columns:
+            dcm_ref -- Path of referenced DICOM file, Dataset, or item with
+                       ReferencedSOPClassUID and ReferencedSOPInstanceUID,
+                       None for rows without coordinates on an image,
+                       e.g. with only a volume or qualitative evaluations
+            finding, finding_site -- Codes as [value, scheme, meaning],
+                                     optional if given as keyword argument
+            linear_measurement, graphic_data, measurement_type -- Length in mm,
+                POLYLINE of the measurement, e.g. as a Nx4 array, and its code,
+                optional if given as keyword argument, see add_linear_measurement_single_axis
+            linear_measurement_axis2, graphic_data_axis2, measurement_type_axis2 --
+                Second axis, see add_linear_measurement_double_axis
+            landmark_graphic_data -- POINT of a landmark, see add_landmark
+            unmeasurable_reason, unmeasurable_graphic_data -- Reason and CIRCLE of
+                an unmeasurable measurement, see add_unmeasurable_measurement
+            seg_ref, segment_number, volume_measurement, graphic_data_center --
+                Segmentation, segment, volume in mm3 and optional center POINT
+                on dcm_ref, see add_volume_measurement
+            qualitative_evaluations, coded_values, text_values -- Lists of the
+                row, as given to the add_* methods
+            tracking_id, tracking_uid -- Optional, generated where missing
+        All columns are optional except dcm_ref, with NaN or None for rows
+        without the value.
+
+        Usage:
+            enhanced_sr.add_measurements(
                 {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "NUM",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "118565006",
-                            "CodingSchemeDesignator": "SCT",
-                            "CodeMeaning": "Volume",
-                        }
-                    ],
-                    "MeasuredValueSequence": [
-                        {
-                            "MeasurementUnitsCodeSequence": [
-                                {
-                                    "CodeValue": "mm3",
-                                    "CodingSchemeDesignator": "UCUM",
-                                    "CodeMeaning": "cubic millimeter",
-                                }
-                            ],
-                            "NumericValue": volume_measurement,
-                        }
-                    ],
+                    "dcm_ref": ["ct_1.dcm", "ct_1.dcm", "ct_2.dcm"],
+                    "linear_measurement": np.array([12.5, 8.0, 30.2]),
+                    "graphic_data": np.array(
+                        [[10, 10, 40, 40], [50, 50, 58, 50], [20, 20, 20, 50]]
+                    ),
                 },
+                measurement_type=["410668003", "SCT", "Length"],
+                finding=["108369006", "SCT", "Neoplasm"],
+                finding_site=["39607008", "SCT", "Lung"],
             )
+
+        Arguments:
+            measurements {dict or pandas.DataFrame} -- Columns of equal length
+
+        Keyword Arguments:
+            measurement_type {list} -- Measurement type of rows with a linear measurement
+                                       and no measurement_type (default: {None})
+            finding {list} -- Finding of rows without finding (default: {None})
+            finding_site {list} -- Finding site of rows without finding_site (default: {None})
+
+        Returns:
+            list -- Tracking UIDs of the added measurement groups, in row order
+        """
+        groups, tracking_uids = self._create_measurement_groups(
+            measurements, measurement_type, finding, finding_site
         )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "SCOORD",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": "111010",
-                            "CodingSchemeDesignator": "DCM",
-                            "CodeMeaning": "Center",
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "ReferencedSOPSequence": [
-                                {
-                                    "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                    "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                }
-                            ],
-                            "RelationshipType": "SELECTED FROM",
-                            "ValueType": "IMAGE",  # value type
-                        }
-                    ],
-                    "GraphicData": graphic_data_center,
-                    "GraphicType": "POINT",
-                },
+        self.imaging_measurements.extend(groups)
+        return tracking_uids
+
+    def create_measurement_groups(
+        self, measurements, measurement_type=None, finding=None, finding_site=None
+    ):
+        """Create the measurement groups of a table of measurements, see add_measurements
+
+        The groups are not added to the report, e.g. to write them with
+        write_streaming, batch by batch.
+
+        Arguments:
+            measurements {dict or pandas.DataFrame} -- Columns of equal length
+
+        Keyword Arguments:
+            measurement_type {list} -- Measurement type of rows with a linear measurement
+                                       and no measurement_type (default: {None})
+            finding {list} -- Finding of rows without finding (default: {None})
+            finding_site {list} -- Finding site of rows without finding_site (default: {None})
+
+        Returns:
+            list -- The measurement groups, in row order
+        """
+        return self._create_measurement_groups(
+            measurements, measurement_type, finding, finding_site
+        )[0]
+
+    def _create_measurement_groups(
+        self, measurements, measurement_type, finding, finding_site
+    ):
+        number_of_rows = len(measurements["dcm_ref"])
+        codes = CodeTable()
+        findings = _get_code_column(
+            measurements, "finding", finding, number_of_rows, codes
+        )
+        finding_sites = _get_code_column(
+            measurements, "finding_site", finding_site, number_of_rows, codes
+        )
+        dcm_refs = _get_column(measurements, "dcm_ref", number_of_rows)
+        _check_references(measurements, dcm_refs)
+        rows_with_reference = [
+            ind for ind, dcm_ref in enumerate(dcm_refs) if not _is_missing(dcm_ref)
+        ]
+        references = [None] * number_of_rows
+        for ind, reference in zip(
+            rows_with_reference,
+            resolve_references(
+                [dcm_refs[ind] for ind in rows_with_reference], self._resolved_files
+            ),
+        ):
+            references[ind] = reference
+        # the measurements of each row, in the order of the add_* methods
+        items = [list() for ind in range(number_of_rows)]
+        if "volume_measurement" in measurements:
+            self._add_volume_columns(measurements, references, items)
+        if "landmark_graphic_data" in measurements:
+            landmark_graphic_data = _get_graphic_data_column(
+                measurements, "landmark_graphic_data", number_of_rows
+            )
+            for ind, graphic_data in enumerate(landmark_graphic_data):
+                if _is_missing(graphic_data):
+                    continue
+                items[ind].append(
+                    code_item(
+                        "CONTAINS",
+                        ANATOMICAL_LOCATIONS,
+                        CENTER,
+                        [
+                            scoord_item(
+                                "INFERRED FROM", "POINT", graphic_data, references[ind]
+                            )
+                        ],
+                    )
+                )
+        if "linear_measurement" in measurements:
+            _add_linear_columns(
+                measurements, "", measurement_type, references, items, codes
+            )
+        if "linear_measurement_axis2" in measurements:
+            _add_linear_columns(measurements, "_axis2", None, references, items, codes)
+        if "unmeasurable_reason" in measurements:
+            reasons = _get_column(measurements, "unmeasurable_reason", number_of_rows)
+            unmeasurable_graphic_data = _get_graphic_data_column(
+                measurements, "unmeasurable_graphic_data", number_of_rows
             )
+            for ind, reason in enumerate(reasons):
+                if _is_missing(reason):
+                    continue
+                items[ind].append(
+                    text_item(
+                        "CONTAINS",
+                        QUALITATIVE_EVALUATIONS,
+                        reason,
+                        [
+                            scoord_item(
+                                "INFERRED FROM",
+                                "CIRCLE",
+                                unmeasurable_graphic_data[ind],
+                                references[ind],
+                            )
+                        ],
+                    )
+                )
+        coded_values = _get_column(measurements, "coded_values", number_of_rows)
+        text_values = _get_column(measurements, "text_values", number_of_rows)
+        qualitative_evaluations = _get_column(
+            measurements, "qualitative_evaluations", number_of_rows
         )
-        ds.ContentSequence.append(
-            update_and_insert_additional_DICOM_attributes_in_ds(
-                Dataset(),
-                {
-                    "RelationshipType": "CONTAINS",
-                    "ValueType": "NUM",
-                    "ConceptNameCodeSequence": [
-                        {
-                            "CodeValue": measurement_type[0],
-                            "CodingSchemeDesignator": measurement_type[1],
-                            "CodeMeaning": measurement_type[2],
-                        }
-                    ],
-                    "MeasuredValueSequence": [
-                        {
-                            "MeasurementUnitsCodeSequence": [
-                                {
-                                    "CodeValue": "mm",
-                                    "CodingSchemeDesignator": "UCUM",
-                                    "CodeMeaning": "millimeter",
-                                }
-                            ],
-                            "NumericValue": linear_measurement,
-                        }
-                    ],
-                    "ContentSequence": [
-                        {
-                            "RelationshipType": "INFERRED FROM",
-                            "ValueType": "SCOORD",
-                            "ContentSequence": [
-                                {
-                                    "ReferencedSOPSequence": [
-                                        {
-                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
-                                            "ReferencedSOPInstanceUID": ds_ref.SOPInstanceUID,
-                                        }
-                                    ],
-                                    "RelationshipType": "SELECTED FROM",
-                                    "ValueType": "IMAGE",  # value type
-                                }
-                            ],
-                            "GraphicData": graphic_data_linear_measurement,
-                            "GraphicType": "POLYLINE",
-                        }
-                    ],
-                },
+        tracking_ids = _get_column(measurements, "tracking_id", number_of_rows)
+        tracking_uids = _get_column(measurements, "tracking_uid", number_of_rows)
+        groups = list()
+        for ind in range(number_of_rows):
+            if not items[ind]:
+                raise ValueError(f"Row {ind} has no measurement")
+            if _is_missing(tracking_ids[ind]):
+                tracking_ids[ind] = "%016X" % random.getrandbits(64)
+            if _is_missing(tracking_uids[ind]):
+                tracking_uids[ind] = generate_uid()
+            ds = _create_measurement_group(
+                tracking_ids[ind], tracking_uids[ind], findings[ind], finding_sites[ind]
             )
+            if not _is_missing(coded_values[ind]):
+                self.add_coded_values(ds, coded_values[ind])
+            ds.extend(items[ind])
+            if not _is_missing(text_values[ind]):
+                self.add_text_values(ds, text_values[ind])
+            if not _is_missing(qualitative_evaluations[ind]):
+                self.add_qualitative_evaluations(ds, qualitative_evaluations[ind])
+            groups.append(ds)
+        return groups, tracking_uids
+
+    def _add_volume_columns(self, measurements, references, items):
+        """Add the volume measurements of the rows with one, see add_volume_measurement"""
+        number_of_rows = len(items)
+        volume_measurements = _get_float_column(
+            measurements, "volume_measurement", number_of_rows
         )
-        if text_values is not None:
-            ds = self.add_text_values(ds, text_values)
-        if qualitative_evaluations is not None:
-            ds = self.add_qualitative_evaluations(ds, qualitative_evaluations)
-        self.dataset.ContentSequence[3].ContentSequence.append(ds)
+        seg_refs = _get_column(measurements, "seg_ref", number_of_rows)
+        segment_numbers = _get_column(measurements, "segment_number", number_of_rows)
+        graphic_data_center = (
+            _get_graphic_data_column(
+                measurements, "graphic_data_center", number_of_rows
+            )
+            if "graphic_data_center" in measurements
+            else [None] * number_of_rows
+        )
+        # each segmentation file is read once
+        segmentations = dict()
+        for ind, volume_measurement in enumerate(volume_measurements):
+            if _is_missing(volume_measurement):
+                continue
+            seg_ref = seg_refs[ind]
+            if isinstance(seg_ref, (str, os.PathLike)):
+                if seg_ref not in segmentations:
+                    segmentations[seg_ref] = get_dataset_from_dcm(seg_ref)
+                ds_ref_seg = segmentations[seg_ref]
+            else:
+                ds_ref_seg = get_dataset_from_dcm(seg_ref)
+            items[ind].extend(
+                _create_volume_measurement(
+                    ds_ref_seg, int(segment_numbers[ind]), volume_measurement
+                )
+            )
+            if not _is_missing(graphic_data_center[ind]):
+                items[ind].append(
+                    scoord_item(
+                        "CONTAINS",
+                        "POINT",
+                        graphic_data_center[ind],
+                        references[ind],
+                        CENTER_POINT,
+                    )
+                )
+
+    @instrument
+    def write_streaming(self, output_file, measurement_groups=(), **kwargs):
+        """Write the report followed by measurement groups produced one at a time
+
+        The measurement groups, e.g. from a generator reading findings from
+        a database, are written as they are produced, in constant memory,
+        see write_streaming_report. They are not added to the report.
+
+        Usage:
+            def groups(cursor):
+                for rows in cursor:
+                    yield from enhanced_sr.create_measurement_groups(rows, ...)
+
+            enhanced_sr.write_streaming(output_file, groups(cursor))
+
+        Arguments:
+            output_file {str or file-like} -- Complete path of file, or file-like object, to write to
+
+        Keyword Arguments:
+            measurement_groups {iterable} -- Measurement groups, as ContentItems, Datasets
+                                             are deprecated (default: {()})
+            kwargs -- Passed on to write_streaming_report, e.g. deflate="auto"
+
+        Returns:
+            int -- Number of measurement groups written from measurement_groups
+        """
+        from ..io.sr_stream import write_streaming_report
+
+        return write_streaming_report(
+            output_file, self, map(as_content_item, measurement_groups), **kwargs
+        )
+
+    def get_group(self, tracking_uid=None, tracking_id=None):
+        """Get a measurement group by tracking UID or tracking ID
+
+        Keyword Arguments:
+            tracking_uid {str} -- Tracking UID of the group (default: {None})
+            tracking_id {str} -- Tracking ID of the group, if used by one group only (default: {None})
+
+        Returns:
+            ContentItem -- The measurement group, or None if there is none
+        """
+        return self.imaging_measurements.children.get(tracking_uid, tracking_id)
+
+    def replace_group(self, tracking_uid, group):
+        """Replace a measurement group, keeping its position in the report
+
+        Arguments:
+            tracking_uid {str} -- Tracking UID of the group to replace
+            group {ContentItem} -- The new measurement group, a Dataset is deprecated
+
+        Returns:
+            ContentItem -- The replaced measurement group
+        """
+        return self.imaging_measurements.children.replace(
+            tracking_uid, as_content_item(group)
+        )
+
+    def remove_group(self, tracking_uid):
+        """Remove a measurement group
+
+        Arguments:
+            tracking_uid {str} -- Tracking UID of the group to remove
+
+        Returns:
+            ContentItem -- The removed measurement group
+        """
+        return self.imaging_measurements.children.remove(tracking_uid)
+
+
+def _is_missing(value):
+    # None, empty, or NaN as used by pandas for missing values
+    return value is None or value != value or value == ""
+
+
+def _get_column(table, name, number_of_rows):
+    """Get a column of a dict of arrays or a DataFrame as a list"""
+    if name not in table:
+        return [None] * number_of_rows
+    column = table[name]
+    column = column.tolist() if hasattr(column, "tolist") else list(column)
+    if len(column) != number_of_rows:
+        raise ValueError(
+            f"Column {name} has {len(column)} rows, expected {number_of_rows}"
+        )
+    return column
+
+
+def _check_references(table, dcm_refs):
+    """Check that the rows with coordinates on an image have a dcm_ref"""
+    rows_without_reference = [
+        ind for ind, dcm_ref in enumerate(dcm_refs) if _is_missing(dcm_ref)
+    ]
+    if not rows_without_reference:
+        return
+    for name in COLUMNS_ON_REFERENCED_IMAGE:
+        if name not in table:
+            continue
+        column = _get_column(table, name, len(dcm_refs))
+        for ind in rows_without_reference:
+            value = column[ind]
+            if hasattr(value, "tolist"):
+                value = value.tolist()
+            if not _is_missing(value):
+                raise ValueError(f"Row {ind} has a {name} but no dcm_ref")
+
+
+def _get_float_column(table, name, number_of_rows):
+    """Get a column of numbers as a list of floats, NaN where missing"""
+    import numpy as np
+
+    return np.asarray(
+        _get_column(table, name, number_of_rows), dtype=np.float64
+    ).tolist()
+
+
+def _get_code_column(table, name, default, number_of_rows, codes):
+    """Get a column of interned codes, with default for all rows without code"""
+    if default is not None:
+        default = codes.get(default)
+    if name not in table:
+        if default is None:
+            raise ValueError(f"Missing column {name}, and no {name} given")
+        return [default] * number_of_rows
+    return [
+        default if _is_missing(code) else codes.get(code)
+        for code in _get_column(table, name, number_of_rows)
+    ]
+
+
+def _add_linear_columns(table, axis, measurement_type, references, items, codes):
+    """Add the linear measurements of the rows with one, of the first axis
+    with axis "", or of the second with axis "_axis2"
+    """
+    number_of_rows = len(items)
+    linear_measurements = _get_float_column(
+        table, "linear_measurement" + axis, number_of_rows
+    )
+    graphic_data = _get_graphic_data_column(
+        table, "graphic_data" + axis, number_of_rows
+    )
+    measurement_types = _get_code_column(
+        table, "measurement_type" + axis, measurement_type, number_of_rows, codes
+    )
+    for ind, linear_measurement in enumerate(linear_measurements):
+        if _is_missing(linear_measurement):
+            continue
+        if measurement_types[ind] is None:
+            raise ValueError(f"Row {ind} has no measurement_type{axis}")
+        items[ind].append(
+            _create_linear_measurement(
+                measurement_types[ind],
+                linear_measurement,
+                graphic_data[ind],
+                references[ind],
+            )
+        )
+
+
+def _get_graphic_data_column(table, name, number_of_rows):
+    """Get a column of graphic data as lists of floats"""
+    if name not in table:
+        raise ValueError(f"Missing column {name}")
+    return [
+        graphic_data.tolist() if hasattr(graphic_data, "tolist") else graphic_data
+        for graphic_data in _get_column(table, name, number_of_rows)
+    ]
+
+
+def _create_measurement_group(tracking_id, tracking_uid, finding, finding_site):
+    """Create a measurement group with tracking identifiers, finding and site"""
+    return container_item(
+        "CONTAINS",
+        MEASUREMENT_GROUP,
+        children=[
+            text_item("HAS OBS CONTEXT", TRACKING_IDENTIFIER, tracking_id),
+            uidref_item("HAS OBS CONTEXT", TRACKING_UNIQUE_IDENTIFIER, tracking_uid),
+            code_item("CONTAINS", FINDING, finding),
+            code_item("HAS CONCEPT MOD", FINDING_SITE, finding_site),
+        ],
+    )
+
+
+def _create_linear_measurement(measurement_type, value, graphic_data, reference):
+    """Create a NUM item in mm, inferred from a polyline on the referenced image"""
+    return num_item(
+        "CONTAINS",
+        measurement_type,
+        value,
+        MILLIMETER,
+        [scoord_item("INFERRED FROM", "POLYLINE", graphic_data, reference)],
+    )
+
+
+def _create_volume_measurement(ds_ref_seg, segment_number, volume_measurement):
+    """Create the items of a volume measurement of a segment of a segmentation"""
+    return [
+        image_item(
+            "CONTAINS",
+            (ds_ref_seg.SOPClassUID, ds_ref_seg.SOPInstanceUID, None),
+            REFERENCED_SEGMENT,
+            segment_number=segment_number,
+        ),
+        uidref_item(
+            "CONTAINS",
+            SOURCE_SERIES_FOR_SEGMENTATION,
+            ds_ref_seg.ReferencedSeriesSequence[0].SeriesInstanceUID,
+        ),
+        num_item("CONTAINS", VOLUME, volume_measurement, CUBIC_MILLIMETER),
+    ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydicom import Dataset, dcmread
+from pydicom import Dataset
 
 from .IOD import IOD, IODTypes, SOP_CLASS_UID_MODALITY_DICT
 from .modules.specific_presentation_state_modules import PresentationSeriesModule
@@ -9,13 +9,19 @@ from .modules.specific_presentation_state_modules import PresentationStateRelati
 from .modules.specific_presentation_state_modules import DisplayedAreaModule
 from .modules.specific_presentation_state_modules import SoftcopyPresentationLUTModule
 from .sequences.Sequences import generate_sequence, generate_RS_sequence, generate_DAS_sequence
+from .sequences.Sequences import get_dataset_from_dcm
+from ..io.references import harvest_references, read_reference_record
+from ..profiling import instrument
 
 class GSPS(IOD):
     """Implementation of the Grayscale Softcopy Presentation State IOD
     """
     def __init__(self):
         super().__init__(IODTypes.GSPS)
+        # records of referenced files, by file path
+        self._reference_records = dict()
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
         Parameters
@@ -25,6 +31,7 @@ class GSPS(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(self, dataset_to_copy_from,
                                        include_iod_specific=True,
                                        include_optional=False):
@@ -51,16 +58,21 @@ class GSPS(IOD):
                     module.copy_optional_dicom_attributes(dataset_to_copy_from, 
                                                           self.dataset)
 
+    @instrument
     def initiate(self, referenced_dcm_files=None):
         """Initiate the IOD by setting some dummy values for required attributes
         
         Keyword Arguments:
-            referenced_dcm_files {[dcm_file1, dcm_file2, ...]} -- List of file paths (default: {None})
+            referenced_dcm_files {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords (default: {None})
         """
         super().initiate()
         if referenced_dcm_files:
+            # each referenced file is read once, header only
+            referenced_dcm_files = harvest_references(
+                referenced_dcm_files, records=self._reference_records
+            )
             # some attributes to inherit from referenced dcm files
-            ds = dcmread(referenced_dcm_files[0])
+            ds = get_dataset_from_dcm(referenced_dcm_files[0])
             self.dataset.PatientID = ds.PatientID
             self.dataset.PatientName = ds.PatientName
             self.dataset.PatientSex = ds.PatientSex
@@ -88,6 +100,7 @@ class GSPS(IOD):
         # soft copy presentation LUT module
         self.dataset.PresentationLUTShape = "IDENTITY"
 
+    @instrument
     def add_graphical_layer(self, layer_name, layer_order,
                             recommended_grayscale_value = None,
                             recommended_cielab_value = None,
@@ -116,6 +129,7 @@ class GSPS(IOD):
             self.dataset.GraphicLayerSequence = generate_sequence("GraphicLayerSequence", [])
         self.dataset.GraphicLayerSequence.append(ds)
 
+    @instrument
     def add_graphic_object(self, referenced_dcm_file, layer_name,
                            graphic_data, graphic_type, 
                            graphic_filled = None,
@@ -137,7 +151,7 @@ class GSPS(IOD):
             line_thickness {[type]} -- [description] (default: {None})
         """
         ds = Dataset()
-        ds_ref = dcmread(referenced_dcm_file)
+        ds_ref = read_reference_record(referenced_dcm_file, self._reference_records)
         ds.ReferencedImageSequence = generate_sequence("ReferencedImageSequence", 
                                                        [{
                                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
@@ -170,6 +184,7 @@ class GSPS(IOD):
             self.dataset.GraphicAnnotationSequence = generate_sequence("GraphicAnnotationSequence", [])
         self.dataset.GraphicAnnotationSequence.append(ds)
     
+    @instrument
     def add_text_object(self, referenced_dcm_file, layer_name,
                         text_value, anchor_point, 
                         cielab_value = None, 
@@ -187,7 +202,7 @@ class GSPS(IOD):
             shadow_style {[type]} -- [description] (default: {None})
         """
         ds = Dataset()
-        ds_ref = dcmread(referenced_dcm_file)
+        ds_ref = read_reference_record(referenced_dcm_file, self._reference_records)
         ds.ReferencedImageSequence = generate_sequence("ReferencedImageSequence", 
                                                        [{
                                                            "ReferencedSOPClassUID": ds_ref.SOPClassUID,
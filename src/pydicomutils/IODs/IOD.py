@@ -1,4 +1,7 @@
+import os
 import random
+from copy import copy
+from io import BytesIO
 from datetime import datetime
 from enum import Enum
 
@@ -22,6 +25,8 @@ from .modules.general_modules import (
 from .modules.general_modules import GeneralImageModule, ImagePixelModule
 from .modules.general_modules import SOPCommonModule
 from .sequences.Sequences import generate_sequence
+from ..uid_generator import generate_uid
+from ..profiling import instrument, is_profiling, record_bytes
 
 
 class IODTypes(Enum):
@@ -29,6 +34,7 @@ class IODTypes(Enum):
 
     CRImage = "1.2.840.10008.5.1.4.1.1.1"
     CTImage = "1.2.840.10008.5.1.4.1.1.2"
+    EnhancedCTImage = "1.2.840.10008.5.1.4.1.1.2.1"
     SCImage = "1.2.840.10008.5.1.4.1.1.7"
     GSPS = "1.2.840.10008.5.1.4.1.1.11.1"
     CSPS = "1.2.840.10008.5.1.4.1.1.11.2"
@@ -45,6 +51,7 @@ class IODTypes(Enum):
 SOP_CLASS_UID_MODALITY_DICT = {
     IODTypes.CRImage: "CR",
     IODTypes.CTImage: "CT",
+    IODTypes.EnhancedCTImage: "CT",
     IODTypes.SCImage: "SC",
     IODTypes.GSPS: "PR",
     IODTypes.CSPS: "PR",
@@ -72,13 +79,14 @@ class IOD:
         self.iod_type = iod_type
         file_meta = Dataset()
         file_meta.MediaStorageSOPClassUID = iod_type.value
-        file_meta.MediaStorageSOPInstanceUID = uid.generate_uid()
+        file_meta.MediaStorageSOPInstanceUID = generate_uid()
         file_meta.ImplementationClassUID = "1.2.752.24.16.4.1"
         self.dataset = FileDataset(None, {}, file_meta=file_meta, preamble=b"\0" * 128)
         self.dataset.is_little_endian = True
         self.dataset.is_implicit_VR = False
         self.dataset.file_meta.TransferSyntaxUID = uid.ExplicitVRLittleEndian
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
         Parameters
@@ -114,6 +122,7 @@ class IOD:
         else:
             print("Keyword", keyword, "is an unknown DICOM attribute")
 
+    @instrument
     def copy_required_dicom_attributes(
         self, dataset_to_copy_from, include_optional=True
     ):
@@ -136,7 +145,7 @@ class IOD:
                     dataset_to_copy_from, self.dataset
                 )
 
-        if self.iod_type in [IODTypes.WSMImage]:
+        if self.iod_type in [IODTypes.EnhancedCTImage, IODTypes.WSMImage]:
             general_modules = [EnhancedGeneralEquipmentModule()]
             for module in general_modules:
                 module.copy_required_dicom_attributes(
@@ -150,6 +159,7 @@ class IOD:
         if self.iod_type in [
             IODTypes.CRImage,
             IODTypes.CTImage,
+            IODTypes.EnhancedCTImage,
             IODTypes.SCImage,
             IODTypes.WSMImage,
         ]:
@@ -178,6 +188,7 @@ class IOD:
                         dataset_to_copy_from, self.dataset
                     )
 
+    @instrument
     def initiate(self):
         """Initiate the IOD by setting some dummy values for
         required attributes
@@ -187,7 +198,7 @@ class IOD:
             random.choice("0123456789ABCDEF") for i in range(16)
         )
         # general study module
-        self.dataset.StudyInstanceUID = uid.generate_uid()
+        self.dataset.StudyInstanceUID = generate_uid()
         self.dataset.StudyDate = datetime.now().strftime("%Y%m%d")
         self.dataset.StudyTime = datetime.now().strftime("%H%M%S")
         self.dataset.StudyID = "".join(
@@ -196,17 +207,18 @@ class IOD:
         self.dataset.AccessionNumber = self.dataset.StudyID
         # sop common module
         self.dataset.SOPClassUID = self.iod_type.value
-        self.dataset.SOPInstanceUID = uid.generate_uid()
+        self.dataset.SOPInstanceUID = generate_uid()
 
         if self.iod_type in [
             IODTypes.CRImage,
             IODTypes.CTImage,
+            IODTypes.EnhancedCTImage,
             IODTypes.SCImage,
             IODTypes.WSMImage,
         ]:
             # general series module
             self.dataset.Modality = SOP_CLASS_UID_MODALITY_DICT[self.iod_type]
-            self.dataset.SeriesInstanceUID = uid.generate_uid()
+            self.dataset.SeriesInstanceUID = generate_uid()
             self.dataset.SeriesNumber = str(100)
             # general image module
             self.dataset.InstanceNumber = str(1)
@@ -216,13 +228,194 @@ class IOD:
         if self.iod_type in [IODTypes.GSPS, IODTypes.CSPS]:
             # general series module
             self.dataset.Modality = SOP_CLASS_UID_MODALITY_DICT[self.iod_type]
-            self.dataset.SeriesInstanceUID = uid.generate_uid()
+            self.dataset.SeriesInstanceUID = generate_uid()
             self.dataset.SeriesNumber = str(100)
 
-    def write_to_file(self, output_file, write_like_original=False):
+    @classmethod
+    def from_dataset(cls, dataset):
+        """Creates an IOD holding the provided dataset, e.g. as read by dcmread
+        Parameters
+        ----------
+        dataset : Dataset of the IOD, its SOP Class UID selects the IOD type of an IOD
+        """
+        if cls is IOD:
+            iod = cls(IODTypes(dataset.get("SOPClassUID")))
+        else:
+            iod = cls()
+            if dataset.get("SOPClassUID") != iod.iod_type.value:
+                raise ValueError(
+                    f"Expected SOP Class UID {iod.iod_type.value}, "
+                    f"got {dataset.get('SOPClassUID')}"
+                )
+            iod.dataset.clear()
+        iod.dataset.update(dataset)
+        if "SOPInstanceUID" in dataset:
+            iod.dataset.file_meta.MediaStorageSOPInstanceUID = dataset.SOPInstanceUID
+        return iod
+
+    @classmethod
+    @instrument
+    def from_dicom_json(cls, json_dataset, bulk_data_uri_handler=None, **kwargs):
+        """Creates an IOD from DICOM JSON (PS3.18 Annex F), see io.dicom_json
+        Parameters
+        ----------
+        json_dataset : The data set as a JSON str or bytes, or as parsed to a dict
+        bulk_data_uri_handler : Returns the value of a BulkDataURI, as for Dataset.from_json
+        kwargs : Passed on to from_dataset, e.g. new_instance=False for the reports
+        """
+        # the io modules are imported where used to keep them out of the import time
+        from ..io.dicom_json import from_json
+
+        return cls.from_dataset(
+            from_json(json_dataset, bulk_data_uri_handler), **kwargs
+        )
+
+    def copy_dataset(self, dataset):
+        """Makes the dataset of the IOD a copy of the provided dataset, e.g. as
+        read by dcmread, so that setting elements of the IOD leaves the provided
+        dataset unchanged. Only the top-level elements and the file meta
+        information are copied, the items of sequences are shared
+        Parameters
+        ----------
+        dataset : Dataset to copy, with or without file meta information
+        """
+        self.dataset.clear()
+        self.dataset.update({elem.tag: copy(elem) for elem in dataset.elements()})
+        file_meta = getattr(dataset, "file_meta", None)
+        if file_meta is not None:
+            self.dataset.file_meta.update(
+                {elem.tag: copy(elem) for elem in file_meta.elements()}
+            )
+        for attr in ("preamble", "is_little_endian", "is_implicit_VR"):
+            if getattr(dataset, attr, None) is not None:
+                setattr(self.dataset, attr, getattr(dataset, attr))
+
+    def materialize(self):
+        """Brings the dataset up to date with content kept in another form while
+        the IOD is built, e.g. the content tree of structured reports, before
+        the dataset is written
+        """
+
+    @instrument
+    def write_to_file(
+        self,
+        output_file,
+        write_like_original=False,
+        deflate=False,
+        deflate_level=None,
+        deflate_threshold=None,
+        fast=False,
+    ):
         """Writes the current IOD to file
         Parameters
         ----------
-        output_file : Complete path of file to write to
+        output_file : Complete path of file, or file-like object, to write to
+        write_like_original : Passed on to dcmwrite, ignored when deflating
+        deflate : Write with the Deflated Explicit VR Little Endian transfer syntax,
+                  True, False or "auto" to deflate data sets larger than deflate_threshold
+        deflate_level : zlib compression level, 1 (fastest) to 9 (smallest),
+                        None for io.deflate.DEFAULT_DEFLATE_LEVEL
+        deflate_threshold : Size in bytes of the encoded data set above which
+                            it is deflated, if deflate is "auto",
+                            None for io.deflate.DEFAULT_DEFLATE_THRESHOLD
+        fast : Encode the data set directly from the structures of the IOD, without
+               dcmwrite, giving the same bytes, see io.fast_writer. Only used for
+               the Explicit VR Little Endian transfer syntax, or when deflating
         """
-        dcmwrite(output_file, self.dataset, write_like_original=write_like_original)
+        if deflate not in (True, False, "auto"):
+            raise ValueError(f"deflate must be True, False or 'auto', got {deflate!r}")
+        from ..io.deflate import (
+            DEFAULT_DEFLATE_LEVEL,
+            DEFAULT_DEFLATE_THRESHOLD,
+            write_deflated,
+        )
+        from ..io.fast_writer import write_fast
+
+        if deflate_level is None:
+            deflate_level = DEFAULT_DEFLATE_LEVEL
+        if deflate_threshold is None:
+            deflate_threshold = DEFAULT_DEFLATE_THRESHOLD
+        fast = fast and (
+            deflate
+            or self.dataset.file_meta.TransferSyntaxUID == uid.ExplicitVRLittleEndian
+        )
+        if not fast:
+            self.materialize()
+        profiling = is_profiling()
+        if profiling and hasattr(output_file, "tell"):
+            start_position = output_file.tell()
+        if fast:
+            write_fast(output_file, self, deflate, deflate_level, deflate_threshold)
+        elif deflate:
+            threshold = deflate_threshold if deflate == "auto" else None
+            if hasattr(output_file, "write"):
+                write_deflated(output_file, self.dataset, deflate_level, threshold)
+            else:
+                with open(output_file, "wb") as fp:
+                    write_deflated(fp, self.dataset, deflate_level, threshold)
+        else:
+            dcmwrite(output_file, self.dataset, write_like_original=write_like_original)
+        if profiling:
+            if hasattr(output_file, "tell"):
+                number_of_bytes = output_file.tell() - start_position
+            else:
+                number_of_bytes = os.path.getsize(output_file)
+            record_bytes("IOD.write_to_file", number_of_bytes)
+
+    def to_bytes(self, **kwargs):
+        """Encodes the current IOD as it would be written to file
+        Parameters
+        ----------
+        kwargs : Passed on to write_to_file, e.g. deflate="auto"
+        """
+        buffer = BytesIO()
+        self.write_to_file(buffer, **kwargs)
+        return buffer.getvalue()
+
+    def to_dicom_json_dict(
+        self, bulk_data_threshold=None, bulk_data_element_handler=None
+    ):
+        """Converts the current IOD to the DICOM JSON Model (PS3.18 Annex F)
+        directly from the structures of the IOD, see io.dicom_json
+        Parameters
+        ----------
+        bulk_data_threshold : Size in bytes above which the values of binary elements,
+                              e.g. PixelData, are given as BulkDataURI, None for all inline
+        bulk_data_element_handler : Returns the BulkDataURI of a DataElement,
+                                    required with bulk_data_threshold
+        """
+        from ..io.dicom_json import to_json_dict
+
+        return to_json_dict(self, bulk_data_threshold, bulk_data_element_handler)
+
+    @instrument
+    def to_dicom_json(
+        self, bulk_data_threshold=None, bulk_data_element_handler=None, encoder=None
+    ):
+        """Serializes the current IOD as DICOM JSON, see to_dicom_json_dict
+        Parameters
+        ----------
+        bulk_data_threshold : See to_dicom_json_dict
+        bulk_data_element_handler : See to_dicom_json_dict
+        encoder : "orjson" or "json", None for orjson if it is installed
+        """
+        from ..io.dicom_json import to_json
+
+        return to_json(self, bulk_data_threshold, bulk_data_element_handler, encoder)
+
+    async def awrite(self, output_file, write_like_original=False, **kwargs):
+        """Writes the current IOD to file without blocking the event loop
+        Parameters
+        ----------
+        output_file : Complete path of file, or file-like object, to write to
+        kwargs : Passed on to write_to_file, e.g. deflate="auto"
+        """
+        # imported here to keep asyncio out of the import time of all IODs
+        from ..io.async_io import run_blocking
+
+        await run_blocking(
+            self.write_to_file,
+            output_file,
+            write_like_original=write_like_original,
+            **kwargs,
+        )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydicom import Dataset, dcmread, uid
+from pydicom import Dataset
 
 from .IOD import IOD, IODTypes, SOP_CLASS_UID_MODALITY_DICT
 from .modules.specific_sr_modules import (
@@ -9,6 +9,10 @@ from .modules.specific_sr_modules import (
 )
 from .modules.specific_sr_modules import SRDocumentContentModule
 from .sequences.Sequences import generate_sequence, generate_CRPES_sequence
+from .sequences.Sequences import get_dataset_from_dcm
+from ..uid_generator import generate_uid
+from ..io.references import harvest_references
+from ..profiling import instrument
 
 
 class KOS(IOD):
@@ -17,7 +21,10 @@ class KOS(IOD):
 
     def __init__(self):
         super().__init__(IODTypes.KOS)
+        # records of referenced files, by file path
+        self._reference_records = dict()
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
 
@@ -28,6 +35,7 @@ class KOS(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(
         self, dataset_to_copy_from, include_iod_specific=True, include_optional=False
     ):
@@ -56,16 +64,21 @@ class KOS(IOD):
                         dataset_to_copy_from, self.dataset
                     )
 
+    @instrument
     def initiate(self, referenced_dcm_files=None):
         """Initiate the IOD by setting some dummy values for required attributes
         
         Keyword Arguments:
-            referenced_dcm_files {[dcm_file1, dcm_file2, ...]} -- List of file paths (default: {None})
+            referenced_dcm_files {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords (default: {None})
         """
         super().initiate()
         if referenced_dcm_files:
+            # each referenced file is read once, header only
+            referenced_dcm_files = harvest_references(
+                referenced_dcm_files, records=self._reference_records
+            )
             # some attributes to inherit from referenced dcm files
-            ds = dcmread(referenced_dcm_files[0])
+            ds = get_dataset_from_dcm(referenced_dcm_files[0])
             self.dataset.PatientID = ds.PatientID
             self.dataset.PatientName = ds.PatientName
             self.dataset.PatientSex = ds.PatientSex
@@ -79,7 +92,7 @@ class KOS(IOD):
             self.dataset.StudyTime = ds.StudyTime
         # key object document series module
         self.dataset.Modality = SOP_CLASS_UID_MODALITY_DICT[self.iod_type]
-        self.dataset.SeriesInstanceUID = uid.generate_uid()
+        self.dataset.SeriesInstanceUID = generate_uid()
         self.dataset.SeriesNumber = str(600)
         # key object document module
         self.dataset.InstanceNumber = str(1)
@@ -107,6 +120,7 @@ class KOS(IOD):
             [{"MappingResource": "DCMR", "TemplateIdentifier": "2010"}],
         )
 
+    @instrument
     def add_key_documents(self, referenced_dcm_files, referenced_frames=None):
         """Add key document
         
@@ -114,10 +128,12 @@ class KOS(IOD):
             referenced_dcm_files {[type]} -- [description]
             referenced_frames {[type]} -- [description]
         """
+        referenced_dcm_files = harvest_references(
+            referenced_dcm_files, records=self._reference_records
+        )
         if referenced_frames is None:
-            for referenced_dcm_file in referenced_dcm_files:
+            for ds_ref in referenced_dcm_files:
                 ds = Dataset()
-                ds_ref = dcmread(referenced_dcm_file)
                 ds.ReferencedSOPSequence = generate_sequence(
                     "ReferencedSOPSequence",
                     [
@@ -137,11 +153,10 @@ class KOS(IOD):
                 )
                 exit
             else:
-                for referenced_dcm_file, referenced_frame_numbers in zip(
+                for ds_ref, referenced_frame_numbers in zip(
                     referenced_dcm_files, referenced_frames
                 ):
                     ds = Dataset()
-                    ds_ref = dcmread(referenced_dcm_file)
                     ds.ReferencedSOPSequence = generate_sequence(
                         "ReferencedSOPSequence",
                         [
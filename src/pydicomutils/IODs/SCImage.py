@@ -2,6 +2,7 @@ from pydicom import Dataset
 
 from .IOD import IOD, IODTypes
 from .modules.specific_image_modules import SCEquipmentModule, SCImageModule
+from ..profiling import instrument
 
 class SCImage(IOD):
     """Implementation of the SC Image IOD
@@ -10,6 +11,7 @@ class SCImage(IOD):
     def __init__(self):
         super().__init__(IODTypes.SCImage)
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
 
@@ -20,6 +22,7 @@ class SCImage(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(self, dataset_to_copy_from,
                                        include_iod_specific=True,
                                        include_optional=False):
@@ -44,6 +47,7 @@ class SCImage(IOD):
                     module.copy_optional_dicom_attributes(dataset_to_copy_from, 
                                                         self.dataset)
     
+    @instrument
     def initiate(self):
         """Initiate the IOD by setting some dummy values for required attributes
         """
@@ -54,6 +58,7 @@ class SCImage(IOD):
         # SC image module
         self.dataset.PixelSpacing = [str(1.0), str(1.0)]
 
+    @instrument
     def add_pixel_data(self, pixel_array,
                        photometric_interpretation="MONOCHROME2",
                        pixel_spacing=None):
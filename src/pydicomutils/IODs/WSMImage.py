@@ -1,10 +1,8 @@
 import os
-import numpy as np
 import random
 from datetime import datetime
 
 from pydicom import Dataset, Sequence
-from pydicom.uid import generate_uid
 
 from .IOD import IOD, IODTypes
 from .modules.general_modules import (
@@ -23,7 +21,9 @@ from .modules.specific_image_modules import (
 )
 from .modules.specific_image_modules import OpticalPathModule
 from .sequences.Sequences import generate_sequence
-from ..external.icc_profiles.icc_profiles import get_sRGB_icc_profile
+from ..external.icc_profiles.icc_profiles import get_icc_profile
+from ..uid_generator import generate_uid
+from ..profiling import instrument
 
 
 class WSMImage(IOD):
@@ -34,6 +34,7 @@ class WSMImage(IOD):
     def __init__(self):
         super().__init__(IODTypes.WSMImage)
 
+    @instrument
     def create_empty_iod(self):
         """Creates and empty IOD with the required DICOM tags but no values
 
@@ -44,6 +45,7 @@ class WSMImage(IOD):
 
         self.copy_required_dicom_attributes(Dataset(), include_optional=True)
 
+    @instrument
     def copy_required_dicom_attributes(
         self, dataset_to_copy_from, include_iod_specific=True, include_optional=False
     ):
@@ -77,8 +79,11 @@ class WSMImage(IOD):
                         dataset_to_copy_from, self.dataset
                     )
 
+    @instrument
     def initiate(self):
         """Initiate the IOD by setting some dummy values for required attributes"""
+        import numpy as np
+
         super().initiate()
         del self.dataset.Laterality
         # Whole Slide Microscopy Series
@@ -231,6 +236,7 @@ class WSMImage(IOD):
             ],
         )
 
+    @instrument
     def add_pixel_data(
         self,
         pixel_array,
@@ -238,6 +244,7 @@ class WSMImage(IOD):
         pixel_spacing=None,
         slice_thickness=None,
         tile_size=None,
+        icc_profile="sRGB",
     ):
         """Add pixel data
 
@@ -249,7 +256,10 @@ class WSMImage(IOD):
             pixel_spacing {[str str]} -- Pixel spacing of the provided pixel_array (default: {None})
             slice_thickness {str} -- Slice thickness of the provided pixel_array (default: {None})
             tile_size {(int, int)} -- Tile size to apply when tiling the proived pixel_array (default: {None})
+            icc_profile {str} -- Name of bundled or registered ICC profile of RGB pixel data (default: {"sRGB"})
         """
+        import numpy as np
+
         if (
             photometric_interpretation != "MONOCHROME2"
             and photometric_interpretation != "RGB"
@@ -282,7 +292,9 @@ class WSMImage(IOD):
             del self.dataset.PresentationLUTShape
             del self.dataset.RescaleIntercept
             del self.dataset.RescaleSlope
-            self.dataset.OpticalPathSequence[0].ICCProfile = get_sRGB_icc_profile()
+            self.dataset.OpticalPathSequence[0].ICCProfile = get_icc_profile(
+                icc_profile
+            )
         if pixel_spacing is None:
             pixel_spacing = [1.0, 1.0]
         if slice_thickness is None:
@@ -0,0 +1,37 @@
+import importlib
+
+# Submodules are imported on first access, e.g. pydicomutils.IODs.CTImage,
+# so that importing the package does not import every IOD and its modules
+_SUBMODULES = (
+    "BasicSRText",
+    "Comprehensive3DSRTID1500",
+    "CRImage",
+    "CSPS",
+    "CTImage",
+    "EnhancedCTImage",
+    "EnhancedSRTID1500",
+    "GSPS",
+    "IOD",
+    "KOS",
+    "SCImage",
+    "WSMImage",
+    "modules",
+    "sequences",
+)
+
+# Attributes of the IOD submodule available directly from the package
+_IOD_ATTRIBUTES = ("IODTypes", "SOP_CLASS_UID_MODALITY_DICT")
+
+__all__ = list(_SUBMODULES) + list(_IOD_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _IOD_ATTRIBUTES:
+        return getattr(importlib.import_module(".IOD", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
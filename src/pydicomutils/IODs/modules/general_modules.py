@@ -1,6 +1,8 @@
 from pydicom import Dataset, DataElement
 from pydicom.datadict import tag_for_keyword, dictionary_VR
 
+from ...profiling import instrument
+
 class Module:
     """Basic Module class
     """
@@ -11,6 +13,7 @@ class Module:
         self.required_dicom_attributes = list()
         self.optional_dicom_attributes = list()
 
+    @instrument
     def copy_required_dicom_attributes(self, dataset_to_copy_from, dataset_to_copy_to):
         """Copies required DICOM attributes for this module from one dataset to another
         Parameters
@@ -28,6 +31,7 @@ class Module:
                 de = DataElement(tag, dictionary_VR(tag), "")
                 dataset_to_copy_to[tag] = de
 
+    @instrument
     def copy_optional_dicom_attributes(self, dataset_to_copy_from, dataset_to_copy_to):
         """Copies optional DICOM attributes for this module from one dataset to another
         Parameters
@@ -45,6 +49,7 @@ class Module:
                 de = DataElement(tag, dictionary_VR(tag), "")
                 dataset_to_copy_to[tag] = de
 
+    @instrument
     def copy_additional_dicom_attributes(self, dataset_to_copy_from, dataset_to_copy_to,
                                          additional_dicom_attributes):
         """Copies additional DICOM attributes for this module from one dataset to another
@@ -40,6 +40,29 @@ class CTImageModule(Module):
                                           "KVP",
                                           "AcquisitionNumber"]
 
+class EnhancedCTImageModule(Module):
+    """Enhanced CT Image Module class
+    """
+    def __init__(self):
+        super().__init__()
+        self.required_dicom_attributes = ["ImageType",
+                                          "AcquisitionDateTime",
+                                          "AcquisitionDuration",
+                                          "ContentQualification",
+                                          "SamplesPerPixel",
+                                          "PhotometricInterpretation",
+                                          "BitsAllocated",
+                                          "BitsStored",
+                                          "HighBit",
+                                          "PixelPresentation",
+                                          "VolumetricProperties",
+                                          "VolumeBasedCalculationTechnique",
+                                          "PresentationLUTShape",
+                                          "LossyImageCompression",
+                                          "BurnedInAnnotation"]
+        self.optional_dicom_attributes = ["AcquisitionNumber",
+                                          "ImageComments"]
+
 class SCImageModule(Module):
     """SC Image Module class
     """
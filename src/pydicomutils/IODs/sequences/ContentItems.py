@@ -0,0 +1,994 @@
+import functools
+import os
+import warnings
+
+from pydicom import DataElement, Dataset, Sequence, dcmread
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.tag import Tag
+
+from .Sequences import MODALITY_CODE_MODALITY_DESCRIPION_DICT
+from ...io.references import as_reference
+from ...profiling import is_profiling, record_bytes
+
+"""Tags read from a referenced DICOM file to reference it from a content item
+"""
+REFERENCE_TAGS = ["SOPClassUID", "SOPInstanceUID"]
+
+"""Tags read from a referenced DICOM file to add it to an image library
+"""
+IMAGE_LIBRARY_TAGS = REFERENCE_TAGS + ["Modality", "StudyDate", "StudyTime"]
+
+"""Codes of the content items of TID 1500 Measurement Reports
+"""
+LANGUAGE_OF_CONTENT = ("121049", "DCM", "Language of Content Item and Descendants")
+ENGLISH = ("eng", "RFC5646", "English")
+COUNTRY_OF_LANGUAGE = ("121046", "DCM", "Country of Language")
+UNITED_STATES = ("US", "ISO3166_1", "United States")
+PROCEDURE_REPORTED = ("121058", "DCM", "Procedure Reported")
+IMAGING_PROCEDURE = ("363679005", "SCT", "Imaging Procedure")
+IMAGE_LIBRARY = ("111028", "DCM", "Image Library")
+IMAGE_LIBRARY_GROUP = ("126200", "DCM", "Image Library Group")
+IMAGING_MEASUREMENTS = ("126010", "DCM", "Imaging Measurements")
+MEASUREMENT_GROUP = ("125007", "DCM", "Measurement Group")
+TRACKING_IDENTIFIER = ("112039", "DCM", "Tracking Identifier")
+TRACKING_UNIQUE_IDENTIFIER = ("112040", "DCM", "Tracking Unique Identifier")
+FINDING = ("121071", "DCM", "Finding")
+FINDING_SITE = ("363698007", "SCT", "Finding Site")
+FINDING_CATEGORY = ("276214006", "SCT", "Finding category")
+IMAGE_REGION = ("111030", "DCM", "Image Region")
+QUALITATIVE_EVALUATIONS = ("C00034375", "UMLS", "Qualitative Evaluations")
+ANATOMICAL_LOCATIONS = ("758637006", "SCT", "Anatomical locations")
+CENTER = ("26216008", "SCT", "Center")
+CENTER_POINT = ("111010", "DCM", "Center")
+REFERENCED_SEGMENT = ("121191", "DCM", "Referenced Segment")
+SOURCE_SERIES_FOR_SEGMENTATION = ("121232", "DCM", "Source series for segmentation")
+VOLUME = ("118565006", "SCT", "Volume")
+MILLIMETER = ("mm", "UCUM", "millimeter")
+CUBIC_MILLIMETER = ("mm3", "UCUM", "cubic millimeter")
+
+"""Codes of the content items of TID 1600 image library entries
+"""
+MODALITY = ("121139", "DCM", "Modality")
+STUDY_DATE = ("111060", "DCM", "Study Date")
+STUDY_TIME = ("111061", "DCM", "Study Time")
+
+# Tag and VR of the attributes of content items, looked up once. Values of
+# the VRs in _CONVERTED_VRS are used as is, as str, list or Sequence, and
+# the others are converted by pydicom, e.g. numbers to DS.
+_ELEMENTS = {
+    keyword: (Tag(tag_for_keyword(keyword)), dictionary_VR(keyword))
+    for keyword in (
+        "RelationshipType",
+        "ValueType",
+        "ConceptNameCodeSequence",
+        "ConceptCodeSequence",
+        "CodeValue",
+        "CodingSchemeDesignator",
+        "CodeMeaning",
+        "ContinuityOfContent",
+        "ContentTemplateSequence",
+        "MappingResource",
+        "MappingResourceUID",
+        "TemplateIdentifier",
+        "TextValue",
+        "UID",
+        "Date",
+        "Time",
+        "DateTime",
+        "PersonName",
+        "MeasuredValueSequence",
+        "MeasurementUnitsCodeSequence",
+        "NumericValue",
+        "GraphicData",
+        "GraphicType",
+        "ReferencedFrameOfReferenceUID",
+        "ReferencedSOPSequence",
+        "ReferencedSOPClassUID",
+        "ReferencedSOPInstanceUID",
+        "ReferencedFrameNumber",
+        "ReferencedSegmentNumber",
+        "ContentSequence",
+    )
+}
+_CONVERTED_VRS = {"CS", "SH", "LO", "UT", "UI", "DA", "TM", "DT", "FL", "US", "SQ"}
+
+
+def _element(keyword, value):
+    tag, VR = _ELEMENTS[keyword]
+    if VR == "SQ" and not isinstance(value, Sequence):
+        # items given as tuples of (keyword, value) pairs, see compact_elements
+        value = Sequence([_dataset(item) for item in value])
+    return DataElement(tag, VR, value, already_converted=VR in _CONVERTED_VRS)
+
+
+def _dataset(keywords_and_values):
+    return Dataset(
+        {
+            _ELEMENTS[keyword][0]: _element(keyword, value)
+            for keyword, value in keywords_and_values
+        }
+    )
+
+
+def _code_sequence(code):
+    return (
+        (
+            ("CodeValue", code[0]),
+            ("CodingSchemeDesignator", code[1]),
+            ("CodeMeaning", code[2]),
+        ),
+    )
+
+
+class ContentItem:
+    """Content item of an SR content tree, while the report is being built
+
+    A compact stand-in for the Dataset of a content item. Codes are tuples,
+    which are shared by all items using them, and the value is kept as
+    given, see the constructors below for the value of each value type.
+    Datasets are created for the item and its children by to_dataset,
+    once, when the report is written.
+    """
+
+    __slots__ = ("relationship_type", "value_type", "concept_name", "value", "children")
+
+    def __init__(
+        self,
+        relationship_type,
+        value_type,
+        concept_name=None,
+        value=None,
+        children=None,
+    ):
+        self.relationship_type = relationship_type
+        self.value_type = value_type
+        self.concept_name = concept_name
+        self.value = value
+        self.children = children
+
+    def append(self, item):
+        """Add a child content item"""
+        if self.children is None:
+            self.children = list()
+        self.children.append(item)
+
+    def extend(self, items):
+        """Add child content items"""
+        if self.children is None:
+            self.children = list()
+        self.children.extend(items)
+
+    def find(self, value_type, concept_name):
+        """Get the first child with the given value type and concept name
+
+        Arguments:
+            value_type {str} -- e.g. "UIDREF"
+            concept_name {tuple} -- Code of the concept name, of which only the code value
+                                    and coding scheme designator are compared
+
+        Returns:
+            ContentItem -- The child, or None if there is none
+        """
+        return _find(self.children or (), value_type, concept_name)
+
+    def compact_elements(self):
+        """Get the attributes of the content item without creating a Dataset
+
+        Returns:
+            list -- (keyword, value) pairs, with the items of sequences as tuples of
+                    such pairs, and the children as the value of the ContentSequence
+        """
+        elements = list()
+        if self.relationship_type is not None:
+            elements.append(("RelationshipType", self.relationship_type))
+        elements.append(("ValueType", self.value_type))
+        if self.concept_name is not None:
+            elements.append(
+                ("ConceptNameCodeSequence", _code_sequence(self.concept_name))
+            )
+        _VALUE_ELEMENTS[self.value_type](self.value, elements)
+        if self.children is not None:
+            elements.append(("ContentSequence", self.children))
+        return elements
+
+    def to_dataset(self):
+        """Convert the content item and its children to a Dataset
+
+        Returns:
+            Dataset -- The content item
+        """
+        elements = self.compact_elements()
+        if self.children is not None:
+            elements[-1] = (
+                "ContentSequence",
+                Sequence([item.to_dataset() for item in self.children]),
+            )
+        return _dataset(elements)
+
+    def __repr__(self):
+        return (
+            f"ContentItem({self.relationship_type!r}, {self.value_type!r}, "
+            f"{self.concept_name!r}, {self.value!r}, "
+            f"{len(self.children or ())} children)"
+        )
+
+
+class MeasurementGroups:
+    """Measurement groups of the Imaging Measurements container
+
+    Used as the children of the container. The groups are kept in order and
+    indexed by their Tracking Unique Identifier and Tracking Identifier, so
+    that a group is found, replaced or removed in constant time, also in
+    reports with thousands of groups. The identifiers of a group are read
+    when it is added, so change the identifiers of a group by replacing it.
+    A group added without a Tracking Unique Identifier, e.g. appended before
+    it is filled in, is read again by the next lookup.
+    """
+
+    __slots__ = (
+        "_groups",
+        "_slots",
+        "_slots_by_uid",
+        "_slots_by_id",
+        "_next_slot",
+        "_unindexed_slots",
+    )
+
+    def __init__(self, groups=None):
+        # groups by slot, in the order they were added; removing a group
+        # needs no shifting, and replacing one keeps its slot
+        self._groups = dict()
+        self._slots = dict()
+        self._slots_by_uid = dict()
+        self._slots_by_id = dict()
+        self._next_slot = 0
+        # slots of groups read from a report, or added without a tracking
+        # UID, indexed on the next lookup
+        self._unindexed_slots = list()
+        if groups is not None:
+            self.extend(groups)
+
+    def append(self, group):
+        """Add a measurement group last"""
+        self.extend([group])
+
+    def extend(self, groups):
+        """Add measurement groups last"""
+        groups = list(groups)
+        identifiers = [_tracking_identifiers(group) for group in groups]
+        self._check_unique([tracking_uid for tracking_uid, _ in identifiers])
+        for group, (tracking_uid, tracking_id) in zip(groups, identifiers):
+            self._insert(self._next_slot, group, tracking_uid, tracking_id)
+            self._next_slot += 1
+
+    def _extend_unindexed(self, groups):
+        """Add groups read from a report, without reading them until needed
+
+        Reading the tracking identifiers of a group read by pydicom parses
+        its content items, so the groups are indexed by the first lookup,
+        replacement or removal instead. Reports only appended to are then
+        written without parsing the existing groups. A tracking UID used
+        by both a read and an added group is then reported by the first
+        lookup.
+        """
+        for group in groups:
+            self._groups[self._next_slot] = group
+            self._unindexed_slots.append(self._next_slot)
+            self._next_slot += 1
+
+    def _index_unindexed(self):
+        unindexed_slots, self._unindexed_slots = self._unindexed_slots, list()
+        for slot in unindexed_slots:
+            if slot not in self._groups:
+                # removed since
+                continue
+            if slot in self._slots:
+                self._unindex(slot)
+            tracking_uid, tracking_id = _tracking_identifiers(self._groups[slot])
+            self._check_unique([tracking_uid])
+            self._index(slot, tracking_uid, tracking_id)
+
+    def get(self, tracking_uid=None, tracking_id=None):
+        """Get a measurement group by Tracking Unique Identifier or Tracking Identifier
+
+        Keyword Arguments:
+            tracking_uid {str} -- Tracking Unique Identifier of the group (default: {None})
+            tracking_id {str} -- Tracking Identifier of the group (default: {None})
+
+        Returns:
+            ContentItem -- The group, or None if there is none
+        """
+        slot = self._find_slot(tracking_uid, tracking_id)
+        return self._groups[slot] if slot is not None else None
+
+    def replace(self, tracking_uid, group):
+        """Replace a measurement group, keeping its position
+
+        Arguments:
+            tracking_uid {str} -- Tracking Unique Identifier of the group to replace
+            group {ContentItem} -- The new group
+
+        Returns:
+            ContentItem -- The replaced group
+        """
+        slot = self._get_slot(tracking_uid)
+        new_tracking_uid, new_tracking_id = _tracking_identifiers(group)
+        if new_tracking_uid != tracking_uid:
+            self._check_unique([new_tracking_uid])
+        self._unindex(slot)
+        old_group = self._groups[slot]
+        # assigning to an existing key keeps its position in the dict
+        self._groups[slot] = group
+        self._index(slot, new_tracking_uid, new_tracking_id)
+        return old_group
+
+    def remove(self, tracking_uid):
+        """Remove a measurement group
+
+        Arguments:
+            tracking_uid {str} -- Tracking Unique Identifier of the group to remove
+
+        Returns:
+            ContentItem -- The removed group
+        """
+        return self._remove(self._get_slot(tracking_uid))
+
+    def _find_slot(self, tracking_uid, tracking_id):
+        if self._unindexed_slots:
+            self._index_unindexed()
+        if tracking_uid is not None:
+            return self._slots_by_uid.get(tracking_uid)
+        if tracking_id is None:
+            raise ValueError("Either a tracking UID or a tracking ID must be given")
+        slots = self._slots_by_id.get(tracking_id)
+        if not slots:
+            return None
+        if len(slots) > 1:
+            raise ValueError(
+                f"{len(slots)} measurement groups have tracking ID {tracking_id}, "
+                "get the group by its tracking UID"
+            )
+        return next(iter(slots))
+
+    def _get_slot(self, tracking_uid):
+        if self._unindexed_slots:
+            self._index_unindexed()
+        slot = self._slots_by_uid.get(tracking_uid)
+        if slot is None:
+            raise ValueError(f"No measurement group with tracking UID {tracking_uid}")
+        return slot
+
+    def _check_unique(self, tracking_uids):
+        seen = set()
+        for tracking_uid in tracking_uids:
+            if tracking_uid is None:
+                continue
+            if tracking_uid in self._slots_by_uid or tracking_uid in seen:
+                raise ValueError(
+                    f"A measurement group with tracking UID {tracking_uid} "
+                    "already exists"
+                )
+            seen.add(tracking_uid)
+
+    def _insert(self, slot, group, tracking_uid, tracking_id):
+        self._groups[slot] = group
+        self._index(slot, tracking_uid, tracking_id)
+
+    def _remove(self, slot):
+        self._unindex(slot)
+        return self._groups.pop(slot)
+
+    def _index(self, slot, tracking_uid, tracking_id):
+        self._slots[slot] = (tracking_uid, tracking_id)
+        if tracking_uid is not None:
+            self._slots_by_uid[tracking_uid] = slot
+        else:
+            # the group may be filled in after it was added
+            self._unindexed_slots.append(slot)
+        if tracking_id is not None:
+            self._slots_by_id.setdefault(tracking_id, dict())[slot] = None
+
+    def _unindex(self, slot):
+        tracking_uid, tracking_id = self._slots.pop(slot)
+        if tracking_uid is not None:
+            del self._slots_by_uid[tracking_uid]
+        if tracking_id is not None:
+            slots = self._slots_by_id[tracking_id]
+            del slots[slot]
+            if not slots:
+                del self._slots_by_id[tracking_id]
+
+    def __len__(self):
+        return len(self._groups)
+
+    def __iter__(self):
+        return iter(self._groups.values())
+
+    def __repr__(self):
+        return f"MeasurementGroups({len(self._groups)} groups)"
+
+
+def _tracking_identifiers(group):
+    """Get the (Tracking Unique Identifier, Tracking Identifier) of a group"""
+    tracking_uid = group.find("UIDREF", TRACKING_UNIQUE_IDENTIFIER)
+    tracking_id = group.find("TEXT", TRACKING_IDENTIFIER)
+    return (
+        tracking_uid.value if tracking_uid is not None else None,
+        tracking_id.value if tracking_id is not None else None,
+    )
+
+
+class DatasetItem:
+    """Content item of an SR content tree that was read from an existing report
+
+    The Dataset of the item is kept as is, without a copy, and is written
+    as is unless children are added. The children are wrapped in
+    DatasetItems on first access, e.g. by append, and the ContentSequence
+    is then created from them when the report is written.
+    """
+
+    __slots__ = ("dataset", "_children")
+
+    def __init__(self, dataset, children=None):
+        self.dataset = dataset
+        self._children = children
+
+    @property
+    def relationship_type(self):
+        return self.dataset.get("RelationshipType")
+
+    @property
+    def value_type(self):
+        return self.dataset.get("ValueType")
+
+    @property
+    def concept_name(self):
+        concept_name_code_sequence = self.dataset.get("ConceptNameCodeSequence")
+        if not concept_name_code_sequence:
+            return None
+        return as_code(concept_name_code_sequence[0])
+
+    @property
+    def value(self):
+        """Value of TEXT, UIDREF, DATE, TIME, DATETIME, PNAME and CODE items"""
+        if self.value_type == "CODE":
+            return as_code(self.dataset.ConceptCodeSequence[0])
+        keyword = _VALUE_KEYWORDS.get(self.value_type)
+        return self.dataset.get(keyword) if keyword is not None else None
+
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = [
+                DatasetItem(item) for item in self.dataset.get("ContentSequence", [])
+            ]
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    def append(self, item):
+        """Add a child content item"""
+        self.children.append(item)
+
+    def extend(self, items):
+        """Add child content items"""
+        self.children.extend(items)
+
+    def find(self, value_type, concept_name):
+        """Get the first child with the given value type and concept name"""
+        if self._children is not None:
+            return _find(self._children, value_type, concept_name)
+        for item in self.dataset.get("ContentSequence", []):
+            item = DatasetItem(item)
+            if _is_concept(item, value_type, concept_name):
+                return item
+        return None
+
+    def compact_elements(self):
+        """Get the elements of the content item, see ContentItem.compact_elements
+
+        Returns:
+            list -- The DataElements of the item, with the added children if any as
+                    the value of a (keyword, value) pair of the ContentSequence
+        """
+        if self._children is None:
+            return [self.dataset.get_item(tag) for tag in self.dataset.keys()]
+        content_sequence_tag = _ELEMENTS["ContentSequence"][0]
+        elements = [
+            self.dataset.get_item(tag)
+            for tag in self.dataset.keys()
+            if tag != content_sequence_tag
+        ]
+        elements.append(("ContentSequence", self._children))
+        return elements
+
+    def to_dataset(self):
+        """Get the Dataset of the content item, with the added children if any
+
+        Returns:
+            Dataset -- The content item
+        """
+        if self._children is None:
+            return self.dataset
+        # a new Dataset sharing the elements, so that the one read is unchanged
+        elements = {elem.tag: elem for elem in self.dataset.elements()}
+        content_sequence_tag = _ELEMENTS["ContentSequence"][0]
+        elements[content_sequence_tag] = _element(
+            "ContentSequence",
+            Sequence([item.to_dataset() for item in self._children]),
+        )
+        return Dataset(elements)
+
+    def __repr__(self):
+        return (
+            f"DatasetItem({self.relationship_type!r}, {self.value_type!r}, "
+            f"{self.concept_name!r})"
+        )
+
+
+def as_content_item(item):
+    """Get a content item, also if given as a Dataset, as the SR IODs took
+    content items before they were built as ContentItems, which is deprecated
+
+    Arguments:
+        item {ContentItem, DatasetItem or Dataset} -- The content item
+
+    Returns:
+        ContentItem or DatasetItem -- The content item, a Dataset wrapped in a DatasetItem
+    """
+    if isinstance(item, Dataset):
+        warnings.warn(
+            "Content items as Datasets are deprecated, use the ContentItems "
+            "created by the report, or wrap the Dataset in a DatasetItem",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        return DatasetItem(item)
+    return item
+
+
+def accepts_dataset(method):
+    """Let a method adding content items to a content item also take the item
+    as a Dataset, see as_content_item. The content items are then added to
+    the ContentSequence of the Dataset, which is returned, as before. It is
+    the outermost decorator, for the warning to point at the caller.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, item, *args, **kwargs):
+        if not isinstance(item, Dataset):
+            return method(self, item, *args, **kwargs)
+        dataset = method(self, as_content_item(item), *args, **kwargs).to_dataset()
+        if dataset is not item:
+            item.ContentSequence = dataset.ContentSequence
+        return item
+
+    return wrapper
+
+
+def _is_concept(item, value_type, concept_name):
+    if item.value_type != value_type:
+        return False
+    item_concept_name = item.concept_name
+    return (
+        item_concept_name is not None
+        and item_concept_name[0] == concept_name[0]
+        and item_concept_name[1] == concept_name[1]
+    )
+
+
+def _find(items, value_type, concept_name):
+    for item in items:
+        if _is_concept(item, value_type, concept_name):
+            return item
+    return None
+
+
+def _container_elements(value, elements):
+    continuity_of_content, template_id = value
+    elements.append(("ContinuityOfContent", continuity_of_content))
+    if template_id is not None:
+        elements.append(
+            (
+                "ContentTemplateSequence",
+                (
+                    (
+                        ("MappingResource", "DCMR"),
+                        ("MappingResourceUID", "1.2.840.10008.8.1.1"),
+                        ("TemplateIdentifier", template_id),
+                    ),
+                ),
+            )
+        )
+
+
+def _code_elements(value, elements):
+    elements.append(("ConceptCodeSequence", _code_sequence(value)))
+
+
+def _num_elements(value, elements):
+    numeric_value, unit = value
+    elements.append(
+        (
+            "MeasuredValueSequence",
+            (
+                (
+                    ("MeasurementUnitsCodeSequence", _code_sequence(unit)),
+                    ("NumericValue", numeric_value),
+                ),
+            ),
+        )
+    )
+
+
+def _scoord_elements(value, elements):
+    elements.append(("GraphicType", value[0]))
+    elements.append(("GraphicData", value[1]))
+    if len(value) > 2:
+        elements.append(("ReferencedFrameOfReferenceUID", value[2]))
+
+
+def _image_elements(value, elements):
+    sop_class_uid, sop_instance_uid, frame_number, segment_number = value
+    referenced_sop = [
+        ("ReferencedSOPClassUID", sop_class_uid),
+        ("ReferencedSOPInstanceUID", sop_instance_uid),
+    ]
+    if frame_number is not None:
+        referenced_sop.append(("ReferencedFrameNumber", frame_number))
+    if segment_number is not None:
+        referenced_sop.append(("ReferencedSegmentNumber", segment_number))
+    elements.append(("ReferencedSOPSequence", (tuple(referenced_sop),)))
+
+
+def _keyword_elements(keyword):
+    def add_elements(value, elements):
+        elements.append((keyword, value))
+
+    return add_elements
+
+
+"""Attribute holding the value of a content item, by value type
+"""
+_VALUE_KEYWORDS = {
+    "TEXT": "TextValue",
+    "UIDREF": "UID",
+    "DATE": "Date",
+    "TIME": "Time",
+    "DATETIME": "DateTime",
+    "PNAME": "PersonName",
+}
+
+
+"""Functions adding the value of a content item, by value type, to its elements
+"""
+_VALUE_ELEMENTS = {
+    "CONTAINER": _container_elements,
+    "CODE": _code_elements,
+    **{
+        value_type: _keyword_elements(keyword)
+        for value_type, keyword in _VALUE_KEYWORDS.items()
+    },
+    "NUM": _num_elements,
+    "SCOORD": _scoord_elements,
+    "SCOORD3D": _scoord_elements,
+    "IMAGE": _image_elements,
+    "COMPOSITE": _image_elements,
+}
+
+
+def as_code(code):
+    """Get a code as a (CodeValue, CodingSchemeDesignator, CodeMeaning) tuple
+
+    Arguments:
+        code {list, tuple or ConceptCodeSequenceItem} -- The code
+
+    Returns:
+        tuple -- The code as a hashable tuple
+    """
+    if hasattr(code, "CodeValue"):
+        return (code.CodeValue, code.CodingSchemeDesignator, code.CodeMeaning)
+    return tuple(code)
+
+
+class CodeTable:
+    """Interned codes, so that equal codes given many times are converted once"""
+
+    def __init__(self):
+        self._codes = dict()
+
+    def get(self, code):
+        """Get the interned tuple of a code given as list, tuple or code item"""
+        if isinstance(code, tuple):
+            interned_code = self._codes.get(code)
+            if interned_code is not None:
+                return interned_code
+        code = as_code(code)
+        return self._codes.setdefault(code, code)
+
+    def __len__(self):
+        return len(self._codes)
+
+
+def container_item(
+    relationship_type,
+    concept_name,
+    continuity_of_content="SEPARATE",
+    template_id=None,
+    children=None,
+):
+    """Create a CONTAINER content item
+
+    Arguments:
+        relationship_type {str} -- e.g. "CONTAINS"
+        concept_name {tuple} -- Code of the concept name
+
+    Keyword Arguments:
+        continuity_of_content {str} -- "SEPARATE" or "CONTINUOUS" (default: {"SEPARATE"})
+        template_id {str} -- DCMR template of the content, e.g. "1501" (default: {None})
+        children {list} -- Content items of the container (default: {None})
+
+    Returns:
+        ContentItem -- The content item
+    """
+    return ContentItem(
+        relationship_type,
+        "CONTAINER",
+        concept_name,
+        (continuity_of_content, template_id),
+        children if children is not None else list(),
+    )
+
+
+def code_item(relationship_type, concept_name, code, children=None):
+    """Create a CODE content item"""
+    return ContentItem(relationship_type, "CODE", concept_name, code, children)
+
+
+def text_item(relationship_type, concept_name, text_value, children=None):
+    """Create a TEXT content item"""
+    return ContentItem(relationship_type, "TEXT", concept_name, text_value, children)
+
+
+def uidref_item(relationship_type, concept_name, uid):
+    """Create a UIDREF content item"""
+    return ContentItem(relationship_type, "UIDREF", concept_name, uid)
+
+
+def num_item(relationship_type, concept_name, numeric_value, unit, children=None):
+    """Create a NUM content item
+
+    Arguments:
+        relationship_type {str} -- e.g. "CONTAINS"
+        concept_name {tuple} -- Code of what is measured, e.g. ("410668003", "SCT", "Length")
+        numeric_value {float} -- The measured value
+        unit {tuple} -- UCUM code of the unit, e.g. ("mm", "UCUM", "millimeter")
+
+    Keyword Arguments:
+        children {list} -- Content items of the measurement, e.g. a SCOORD (default: {None})
+
+    Returns:
+        ContentItem -- The content item
+    """
+    return ContentItem(
+        relationship_type, "NUM", concept_name, (numeric_value, unit), children
+    )
+
+
+def scoord_item(
+    relationship_type, graphic_type, graphic_data, reference, concept_name=None
+):
+    """Create a SCOORD content item, with the IMAGE item of the referenced image
+
+    Arguments:
+        relationship_type {str} -- e.g. "INFERRED FROM"
+        graphic_type {str} -- e.g. "POINT" or "POLYLINE"
+        graphic_data {list} -- Pixel coordinates (column, row) of the graphic
+        reference {tuple} -- Referenced image as returned by resolve_references
+
+    Keyword Arguments:
+        concept_name {tuple} -- Code of the concept name (default: {None})
+
+    Returns:
+        ContentItem -- The content item
+    """
+    if hasattr(graphic_data, "tolist"):
+        graphic_data = graphic_data.tolist()
+    return ContentItem(
+        relationship_type,
+        "SCOORD",
+        concept_name,
+        (graphic_type, graphic_data),
+        [image_item("SELECTED FROM", reference)],
+    )
+
+
+def image_item(relationship_type, reference, concept_name=None, segment_number=None):
+    """Create an IMAGE content item
+
+    Arguments:
+        relationship_type {str} -- e.g. "SELECTED FROM"
+        reference {tuple} -- (SOPClassUID, SOPInstanceUID, frame number or None)
+                             as returned by resolve_references
+
+    Keyword Arguments:
+        concept_name {tuple} -- Code of the concept name (default: {None})
+        segment_number {int} -- Referenced segment of a segmentation (default: {None})
+
+    Returns:
+        ContentItem -- The content item
+    """
+    return ContentItem(
+        relationship_type,
+        "IMAGE",
+        concept_name,
+        (reference[0], reference[1], reference[2], segment_number),
+    )
+
+
+def image_library_entry(dcm):
+    """Create an image library entry, i.e. an IMAGE item with the modality,
+    study date and study time of the referenced image
+
+    Arguments:
+        dcm {str, Path or Dataset} -- Path of DICOM file or Dataset
+
+    Returns:
+        ContentItem -- The content item
+    """
+    if isinstance(dcm, (str, os.PathLike)):
+        if is_profiling():
+            record_bytes("read_reference", os.path.getsize(dcm))
+        dcm = dcmread(dcm, stop_before_pixels=True, specific_tags=IMAGE_LIBRARY_TAGS)
+    modality = (
+        dcm.Modality,
+        "DCM",
+        MODALITY_CODE_MODALITY_DESCRIPION_DICT[dcm.Modality],
+    )
+    return ContentItem(
+        "CONTAINS",
+        "IMAGE",
+        None,
+        (dcm.SOPClassUID, dcm.SOPInstanceUID, None, None),
+        [
+            code_item("HAS ACQ CONTEXT", MODALITY, modality),
+            ContentItem("HAS ACQ CONTEXT", "DATE", STUDY_DATE, dcm.StudyDate),
+            ContentItem("HAS ACQ CONTEXT", "TIME", STUDY_TIME, dcm.StudyTime),
+        ],
+    )
+
+
+def _read_reference(dcm):
+    if isinstance(dcm, (str, os.PathLike)):
+        if is_profiling():
+            record_bytes("read_reference", os.path.getsize(dcm))
+        ds = dcmread(dcm, stop_before_pixels=True, specific_tags=REFERENCE_TAGS)
+        return (ds.SOPClassUID, ds.SOPInstanceUID, None)
+    if "ReferencedSOPInstanceUID" in dcm:
+        return (
+            dcm.ReferencedSOPClassUID,
+            dcm.ReferencedSOPInstanceUID,
+            dcm.get("ReferencedFrameNumber"),
+        )
+    return (dcm.SOPClassUID, dcm.SOPInstanceUID, None)
+
+
+def resolve_references(dcms, resolved_files=None):
+    """Resolve the SOP Class and SOP Instance UIDs of referenced DICOM objects
+
+    Each distinct file is read once, and only the header tags needed to
+    reference it.
+
+    Arguments:
+        dcms {list} -- File paths, Datasets, SliceHandles, or items with ReferencedSOPClassUID
+                       and ReferencedSOPInstanceUID (and optionally ReferencedFrameNumber)
+
+    Keyword Arguments:
+        resolved_files {dict} -- References by file path, kept between calls to read
+                                 each file once for many calls (default: {None})
+
+    Returns:
+        list -- (SOPClassUID, SOPInstanceUID, frame number or None) for each item of dcms
+    """
+    if resolved_files is None:
+        resolved_files = dict()
+    # objects are only identified by id during this call, as ids can be reused
+    resolved_objects = dict()
+    references = list()
+    for dcm in dcms:
+        dcm = as_reference(dcm)
+        if isinstance(dcm, (str, os.PathLike)):
+            key, resolved = os.fspath(dcm), resolved_files
+        else:
+            key, resolved = id(dcm), resolved_objects
+        reference = resolved.get(key)
+        if reference is None:
+            reference = resolved[key] = _read_reference(dcm)
+        references.append(reference)
+    return references
+
+
+def measurement_report_content(image_library_entries=None):
+    """Create the content of a TID 1500 Measurement Report
+
+    Arguments:
+        image_library_entries {list} -- Content items of the image library (default: {None})
+
+    Returns:
+        list -- Content items of the report, i.e. language, procedure reported, image
+                library and imaging measurements
+    """
+    return [
+        code_item(
+            "HAS CONCEPT MOD",
+            LANGUAGE_OF_CONTENT,
+            ENGLISH,
+            [code_item("HAS CONCEPT MOD", COUNTRY_OF_LANGUAGE, UNITED_STATES)],
+        ),
+        code_item("HAS CONCEPT MOD", PROCEDURE_REPORTED, IMAGING_PROCEDURE),
+        container_item(
+            "CONTAINS",
+            IMAGE_LIBRARY,
+            children=[
+                container_item(
+                    "CONTAINS", IMAGE_LIBRARY_GROUP, children=image_library_entries
+                )
+            ],
+        ),
+        container_item("CONTAINS", IMAGING_MEASUREMENTS, children=MeasurementGroups()),
+    ]
+
+
+def content_sequence(items):
+    """Convert content items to a Content Sequence"""
+    return Sequence([item.to_dataset() for item in items])
+
+
+def parse_measurement_report(dataset):
+    """Get the content of an existing TID 1500 Measurement Report
+
+    The content items are wrapped in DatasetItems, without a copy. Only
+    the image library and the measurement groups are unpacked, so that
+    content items can be added to them. The groups are indexed by their
+    tracking identifiers on first lookup.
+
+    Arguments:
+        dataset {Dataset} -- The report
+
+    Returns:
+        (list, DatasetItem, DatasetItem) -- Content items of the report, the image
+                                            library group, or None if there is no image
+                                            library, and the imaging measurements
+    """
+    content_template_sequence = dataset.get("ContentTemplateSequence")
+    if (
+        content_template_sequence
+        and content_template_sequence[0].get("TemplateIdentifier") != "1500"
+    ):
+        raise ValueError(
+            "Not a TID 1500 Measurement Report, the template is "
+            f"{content_template_sequence[0].get('TemplateIdentifier')}"
+        )
+    content = [DatasetItem(item) for item in dataset.get("ContentSequence", [])]
+    image_library = _find(content, "CONTAINER", IMAGE_LIBRARY)
+    if image_library is not None:
+        # entries are either in image library groups or directly in the library
+        image_library = (
+            _find(image_library.children, "CONTAINER", IMAGE_LIBRARY_GROUP)
+            or image_library
+        )
+    imaging_measurements = _find(content, "CONTAINER", IMAGING_MEASUREMENTS)
+    if imaging_measurements is not None:
+        imaging_measurements.children = MeasurementGroups()
+        imaging_measurements.children._extend_unindexed(
+            DatasetItem(group)
+            for group in imaging_measurements.dataset.get("ContentSequence", [])
+        )
+    else:
+        imaging_measurements = container_item(
+            "CONTAINS", IMAGING_MEASUREMENTS, children=MeasurementGroups()
+        )
+        content.append(imaging_measurements)
+    return content, image_library, imaging_measurements
@@ -1,8 +1,12 @@
 import json
+import os
 
 from pydicom import Sequence, Dataset, dcmread, DataElement
 from pydicom.datadict import tag_for_keyword, dictionary_VM, dictionary_VR
-from pydicom.uid import generate_uid
+
+from ...io.references import ReferenceRecord
+from ...uid_generator import generate_uid
+from ...profiling import instrument, is_profiling, record_bytes
 
 
 """Various definitions that can be of good use
@@ -185,17 +189,36 @@ def update_and_insert_additional_DICOM_attributes_in_ds(ds, keyword_and_value_di
     return ds
 
 
+@instrument(phase="read_reference")
+def get_dataset_from_dcm(dcm):
+    """Helper function to get a dataset from a DICOM object given either
+    as a file path, as an already read Dataset or ReferenceRecord, or as a
+    SliceHandle of a series loaded by io.series_loader
+
+    Arguments:
+        dcm {str, Path, Dataset, ReferenceRecord or SliceHandle} -- Path of DICOM file,
+                                                                   Dataset, record or slice
+
+    Returns:
+        Dataset -- The read dataset, or dcm as is if already a Dataset or record
+    """
+    if isinstance(dcm, (Dataset, ReferenceRecord)):
+        return dcm
+    if hasattr(dcm, "dcm_file") and hasattr(dcm, "dataset"):
+        # a SliceHandle, reading the complete file on first access
+        return dcm.dataset
+    if is_profiling() and isinstance(dcm, (str, os.PathLike)):
+        record_bytes("read_reference", os.path.getsize(dcm))
+    return dcmread(dcm)
+
+
 def generate_reference_sop_sequence_json(dcm):
     """
 
     Arguments:
         dcm_file {[type]} -- [description]
     """
-    ds = None
-    if isinstance(dcm, Dataset):
-        ds = dcm
-    else:
-        ds = dcmread(dcm)
+    ds = get_dataset_from_dcm(dcm)
     return {
         "ReferencedSOPSequence": [
             {
@@ -259,7 +282,7 @@ def generate_DAS_sequence(dcms):
     with required DICOM attributes from a list of DICOM objects
 
     Arguments:
-        dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths
+        dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords
 
     Returns:
         Sequence -- A diplayed area selection sequence
@@ -276,7 +299,7 @@ def generate_DAS_sequence(dcms):
             "DisplayedAreaBottomRightHandCorner": [int(ds.Columns), int(ds.Rows)],
             "PresentationSizeMode": "SCALE TO FIT",
         }
-        for ds in [dcmread(dcm_file) for dcm_file in dcms]
+        for ds in [get_dataset_from_dcm(dcm_file) for dcm_file in dcms]
     ]
     return generate_sequence("DisplayedAreaSelectionSequence", sequence_data)
 
@@ -286,14 +309,14 @@ def generate_RS_sequence(dcms):
     with required DICOM attributes from a list of DICOM objects
 
     Arguments:
-        dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths
+        dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths, Datasets or ReferenceRecords
 
     Returns:
         Sequence -- A referenced series sequence
     """
     sequence_content = dict()
     for dcm_file in dcms:
-        ds = dcmread(dcm_file)
+        ds = get_dataset_from_dcm(dcm_file)
         if ds.SeriesInstanceUID not in sequence_content:
             sequence_content[ds.SeriesInstanceUID] = list()
         sequence_content[ds.SeriesInstanceUID].append(
@@ -323,11 +346,7 @@ def generate_CRPES_sequence(dcms):
     """
     sequence_content = dict()
     for dcm in dcms:
-        ds = None
-        if isinstance(dcm, Dataset):
-            ds = dcm
-        else:
-            ds = dcmread(dcm)
+        ds = get_dataset_from_dcm(dcm)
         if ds.StudyInstanceUID not in sequence_content:
             sequence_content[ds.StudyInstanceUID] = dict()
         if ds.SeriesInstanceUID not in sequence_content[ds.StudyInstanceUID]:
@@ -951,6 +970,7 @@ class GeneralSequence(SequenceInternal):
             self.sequence.append(ds)
 
 
+@instrument
 def generate_sequence(sequence_name, sequence_data):
     """Helper function to generate appropriate sequences
     Parameters
@@ -1,10 +1,72 @@
-import os
+import threading
+
+"""ICC profiles shipped with pydicomutils, by name and resource file name
+"""
+BUNDLED_ICC_PROFILES = {"sRGB": "sRGB2014.icc"}
+
+_icc_profiles = dict()
+_lock = threading.Lock()
+
+
+def _read_resource(resource_name):
+    """Read a file of this package, also when installed as a zipped wheel"""
+    try:
+        from importlib.resources import files
+    except ImportError:
+        from importlib.resources import read_binary
+
+        return read_binary(__package__, resource_name)
+    return files(__package__).joinpath(resource_name).read_bytes()
+
+
+def register_icc_profile(name, icc_profile):
+    """Register an ICC profile, e.g. Display P3 or Adobe RGB, by name
+
+    Arguments:
+        name {str} -- Name to refer to the profile by, e.g. "DisplayP3"
+        icc_profile {bytes or str} -- Content of the profile, or path of an ICC file
+    """
+    if isinstance(icc_profile, str):
+        with open(icc_profile, "rb") as f:
+            icc_profile = f.read()
+    icc_profile = bytes(icc_profile)
+    if len(icc_profile) < 128:
+        raise ValueError(f"Invalid ICC profile {name!r}, shorter than an ICC header")
+    with _lock:
+        _icc_profiles[name] = icc_profile
+
+
+def get_icc_profile(name="sRGB"):
+    """Get an ICC profile by name
+
+    Bundled profiles are read once on first use, after which the same
+    immutable bytes instance is returned to all callers.
+
+    Keyword Arguments:
+        name {str} -- Name of a bundled or registered profile (default: {"sRGB"})
+
+    Returns:
+        bytes -- Content of the ICC profile
+    """
+    icc_profile = _icc_profiles.get(name)
+    if icc_profile is not None:
+        return icc_profile
+    if name not in BUNDLED_ICC_PROFILES:
+        raise ValueError(
+            f"Unknown ICC profile {name!r}, available are {available_icc_profiles()}"
+        )
+    with _lock:
+        if name not in _icc_profiles:
+            _icc_profiles[name] = _read_resource(BUNDLED_ICC_PROFILES[name])
+        return _icc_profiles[name]
+
+
+def available_icc_profiles():
+    """Get the names of all bundled and registered ICC profiles"""
+    return sorted(set(BUNDLED_ICC_PROFILES) | set(_icc_profiles))
+
 
 def get_sRGB_icc_profile():
     """Utility functions that reads the sRGB profile
     """
-    file_folder = os.path.dirname(os.path.realpath(__file__))
-    rgb_icc_profile = None
-    with open(os.path.join(file_folder, "sRGB2014.icc"), "rb") as f:
-        rgb_icc_profile = f.read()
-    return rgb_icc_profile
\ No newline at end of file
+    return get_icc_profile("sRGB")
@@ -0,0 +1,174 @@
+import numpy as np
+
+"""Default maximum deviation, in mm, of a slice from the position given by
+the first slice and a uniform slice step
+"""
+SPACING_TOLERANCE = 0.01
+
+
+def _as_points(points):
+    points = np.asarray(points, dtype=np.float64)
+    if points.shape[-1] != 3:
+        raise ValueError(f"Points must have 3 coordinates, got shape {points.shape}")
+    return points
+
+
+class VolumeGeometry:
+    """Affine mapping between voxel indices and the patient coordinate system
+
+    Voxel indices are (column, row, slice), with the center of the first
+    pixel of the first slice at (0, 0, 0). Note that pixel coordinates of a
+    GSPS, in PIXEL units, have the center of the first pixel at (0.5, 0.5).
+    Patient coordinates are in mm, as used by ImagePositionPatient and by
+    SCOORD3D content items.
+    """
+
+    def __init__(self, affine, shape=None):
+        """
+        Arguments:
+            affine {4x4 np.array} -- Transform from voxel indices to patient coordinates
+
+        Keyword Arguments:
+            shape {(int, int, int)} -- Number of (columns, rows, slices) (default: {None})
+        """
+        self.affine = np.asarray(affine, dtype=np.float64)
+        if self.affine.shape != (4, 4):
+            raise ValueError("The affine must be a 4x4 matrix")
+        self.inverse_affine = np.linalg.inv(self.affine)
+        self.shape = shape
+
+    @classmethod
+    def from_series(cls, dcm_slices, spacing_tolerance=SPACING_TOLERANCE):
+        """Derive the geometry of a series sorted by slice position
+
+        The slice step is taken from the first to the last slice, which also
+        covers gantry tilted series, and every slice is checked to lie on
+        that line at a uniform spacing.
+
+        Arguments:
+            dcm_slices {list} -- Sorted slices, e.g. a DicomSeries or a list of Datasets
+
+        Keyword Arguments:
+            spacing_tolerance {float} -- Maximum deviation of a slice in mm (default: {SPACING_TOLERANCE})
+
+        Returns:
+            VolumeGeometry -- Geometry of the series
+        """
+        dcm_slices = list(dcm_slices)
+        if not dcm_slices:
+            raise ValueError("Cannot derive the geometry of an empty series")
+        first = dcm_slices[0]
+        orientation = np.array(first.ImageOrientationPatient, dtype=np.float64)
+        row_direction = orientation[0:3] / np.linalg.norm(orientation[0:3])
+        column_direction = orientation[3:6] / np.linalg.norm(orientation[3:6])
+        # PixelSpacing is the spacing between rows, then between columns
+        row_spacing, column_spacing = (float(value) for value in first.PixelSpacing)
+        positions = np.array(
+            [dcm_slice.ImagePositionPatient for dcm_slice in dcm_slices],
+            dtype=np.float64,
+        )
+        if len(dcm_slices) > 1:
+            slice_step = (positions[-1] - positions[0]) / (len(dcm_slices) - 1)
+            if not np.linalg.norm(slice_step) > 0:
+                raise ValueError("The first and last slice are at the same position")
+            expected_positions = (
+                positions[0] + np.arange(len(dcm_slices))[:, np.newaxis] * slice_step
+            )
+            deviations = np.linalg.norm(positions - expected_positions, axis=1)
+            if deviations.max() > spacing_tolerance:
+                spacings = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+                raise ValueError(
+                    "Non-uniform slice spacing, slice "
+                    f"{int(deviations.argmax())} deviates {deviations.max():.4f} mm, "
+                    f"spacings between {spacings.min():.4f} and {spacings.max():.4f} mm"
+                )
+        else:
+            slice_thickness = float(getattr(first, "SliceThickness", None) or 1.0)
+            slice_step = np.cross(row_direction, column_direction) * slice_thickness
+        normal = np.cross(row_direction, column_direction)
+        if abs(np.dot(normal, slice_step)) < 1e-6 * np.linalg.norm(slice_step):
+            raise ValueError("The slices are not stacked along the slice normal")
+        affine = np.eye(4)
+        affine[0:3, 0] = row_direction * column_spacing
+        affine[0:3, 1] = column_direction * row_spacing
+        affine[0:3, 2] = slice_step
+        affine[0:3, 3] = positions[0]
+        shape = (int(first.Columns), int(first.Rows), len(dcm_slices))
+        return cls(affine, shape=shape)
+
+    @property
+    def spacing(self):
+        """Spacing between (columns, rows, slices) in mm"""
+        return np.linalg.norm(self.affine[0:3, 0:3], axis=0)
+
+    def voxel_to_patient(self, points):
+        """Transform voxel indices to patient coordinates
+
+        Arguments:
+            points {Nx3 np.array} -- Voxel indices (column, row, slice), may be fractional
+
+        Returns:
+            Nx3 np.array -- Patient coordinates in mm
+        """
+        points = _as_points(points)
+        return points @ self.affine[0:3, 0:3].T + self.affine[0:3, 3]
+
+    def patient_to_voxel(self, points):
+        """Transform patient coordinates to (fractional) voxel indices
+
+        Arguments:
+            points {Nx3 np.array} -- Patient coordinates in mm
+
+        Returns:
+            Nx3 np.array -- Voxel indices (column, row, slice)
+        """
+        points = _as_points(points)
+        return points @ self.inverse_affine[0:3, 0:3].T + self.inverse_affine[0:3, 3]
+
+    def patient_to_pixel(self, points):
+        """Project patient coordinates onto the nearest slices
+
+        Points outside the volume, i.e. more than half a voxel outside its
+        first or last column, row or slice, are not moved onto the volume.
+        Their slice index may then be that of no slice, and they are marked
+        as invalid, to be skipped or reported by the caller. All points are
+        valid if the shape of the volume is unknown.
+
+        Arguments:
+            points {Nx3 np.array} -- Patient coordinates in mm
+
+        Returns:
+            (Nx2 np.array, N np.array, N np.array) -- Pixel coordinates (column, row), index of
+                                                      nearest slice and whether the point is
+                                                      inside the volume
+        """
+        voxels = self.patient_to_voxel(points)
+        slice_indices = np.rint(voxels[..., 2]).astype(np.int64)
+        if self.shape is None:
+            valid = np.ones(voxels.shape[:-1], dtype=bool)
+        else:
+            valid = np.all(
+                (voxels >= -0.5) & (voxels < np.asarray(self.shape) - 0.5), axis=-1
+            )
+        return voxels[..., 0:2], slice_indices, valid
+
+    def pixel_to_patient(self, pixels, slice_indices):
+        """Transform pixel coordinates of given slices to patient coordinates
+
+        Arguments:
+            pixels {Nx2 np.array} -- Pixel coordinates (column, row)
+            slice_indices {N np.array or int} -- Index of slice of each pixel
+
+        Returns:
+            Nx3 np.array -- Patient coordinates in mm
+        """
+        pixels = np.asarray(pixels, dtype=np.float64)
+        slice_indices = np.broadcast_to(
+            np.asarray(slice_indices, dtype=np.float64), pixels.shape[:-1]
+        )
+        return self.voxel_to_patient(
+            np.concatenate((pixels, slice_indices[..., np.newaxis]), axis=-1)
+        )
+
+    def __repr__(self):
+        return f"VolumeGeometry(shape={self.shape}, spacing={self.spacing.tolist()})"
@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pydicom import Dataset, dcmread
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+_executor = None
+_owns_executor = False
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+_lock = threading.Lock()
+
+
+def configure(max_concurrency=None, executor=None):
+    """Configure how blocking pydicom I/O is offloaded from the event loop
+
+    The concurrency of a given executor is that of the executor itself, so
+    max_concurrency and executor cannot both be given.
+
+    Keyword Arguments:
+        max_concurrency {int} -- Maximum number of blocking calls running at the same time,
+                                 i.e. the size of the internal thread pool (default: {None})
+        executor {concurrent.futures.Executor} -- Executor to use instead of the internal thread pool (default: {None})
+    """
+    global _executor, _owns_executor, _max_concurrency
+    if max_concurrency is not None and executor is not None:
+        raise ValueError(
+            "max_concurrency does not apply to a given executor, "
+            "limit the number of workers of the executor instead"
+        )
+    with _lock:
+        if max_concurrency is not None:
+            if max_concurrency < 1:
+                raise ValueError("max_concurrency must be at least 1")
+            _max_concurrency = max_concurrency
+        if _executor is not None and _owns_executor:
+            _executor.shutdown(wait=False)
+        _executor = executor
+        _owns_executor = False
+
+
+def get_executor():
+    """Get the executor used for blocking calls, creating it on first use"""
+    global _executor, _owns_executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_concurrency, thread_name_prefix="pydicomutils-io"
+            )
+            _owns_executor = True
+        return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable in the configured executor and await its result
+
+    Arguments:
+        func {callable} -- Blocking function to call
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+async def aread_dataset(dcm, stop_before_pixels=True):
+    """Read a referenced DICOM object without blocking the event loop
+
+    Arguments:
+        dcm {str, Path or Dataset} -- Path of DICOM file, returned as is if already a Dataset
+
+    Keyword Arguments:
+        stop_before_pixels {bool} -- Skip reading of pixel data (default: {True})
+
+    Returns:
+        Dataset -- The read dataset
+    """
+    if isinstance(dcm, Dataset):
+        return dcm
+    return await run_blocking(dcmread, dcm, stop_before_pixels=stop_before_pixels)
+
+
+async def aresolve_references(dcms, stop_before_pixels=True):
+    """Read a list of referenced DICOM objects concurrently
+
+    The returned datasets can be passed to the initiate() and add_* methods of
+    the IOD classes in place of the file paths, so that building the IOD does
+    not touch the file system.
+
+    Arguments:
+        dcms {[dcm_file1, dcm_file2, ...]} -- List of file paths and/or Datasets
+
+    Keyword Arguments:
+        stop_before_pixels {bool} -- Skip reading of pixel data (default: {True})
+
+    Returns:
+        list -- List of Datasets in the same order as dcms
+    """
+    return list(
+        await asyncio.gather(
+            *[aread_dataset(dcm, stop_before_pixels=stop_before_pixels) for dcm in dcms]
+        )
+    )
+
+
+async def agenerate_instances(build_instance, number_of_instances, prefetch=2):
+    """Asynchronously iterate over generated IOD instances
+
+    Each instance is built in the executor by calling build_instance(index),
+    while up to prefetch instances are built ahead of the consumer.
+
+    Usage:
+        async for ct_image in agenerate_instances(build_slice, 300):
+            await ct_image.awrite(output_file)
+
+    Arguments:
+        build_instance {callable} -- Function taking the instance index and returning an IOD
+        number_of_instances {int} -- Number of instances to generate
+
+    Keyword Arguments:
+        prefetch {int} -- Number of instances built ahead of the consumer (default: {2})
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    pending = list()
+    next_index = 0
+    try:
+        while next_index < number_of_instances or pending:
+            while next_index < number_of_instances and len(pending) <= prefetch:
+                pending.append(
+                    loop.run_in_executor(executor, build_instance, next_index)
+                )
+                next_index += 1
+            yield await pending.pop(0)
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,268 @@
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class BatchWriterStats:
+    """Snapshot of throughput and back-pressure metrics of a BatchWriter"""
+
+    def __init__(
+        self,
+        submitted,
+        written,
+        failed,
+        bytes_written,
+        elapsed_time,
+        queue_size,
+        max_queue_size_seen,
+        blocked_submits,
+        blocked_time,
+        fsync_batches,
+    ):
+        self.submitted = submitted
+        self.written = written
+        self.failed = failed
+        self.bytes_written = bytes_written
+        self.elapsed_time = elapsed_time
+        self.queue_size = queue_size
+        self.max_queue_size_seen = max_queue_size_seen
+        self.blocked_submits = blocked_submits
+        self.blocked_time = blocked_time
+        self.fsync_batches = fsync_batches
+
+    @property
+    def instances_per_second(self):
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.written / self.elapsed_time
+
+    @property
+    def bytes_per_second(self):
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.bytes_written / self.elapsed_time
+
+    def as_dict(self):
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "failed": self.failed,
+            "bytes_written": self.bytes_written,
+            "elapsed_time": self.elapsed_time,
+            "instances_per_second": self.instances_per_second,
+            "bytes_per_second": self.bytes_per_second,
+            "queue_size": self.queue_size,
+            "max_queue_size_seen": self.max_queue_size_seen,
+            "blocked_submits": self.blocked_submits,
+            "blocked_time": self.blocked_time,
+            "fsync_batches": self.fsync_batches,
+        }
+
+    def __repr__(self):
+        return f"BatchWriterStats({self.as_dict()})"
+
+
+class BatchWriter:
+    """Writes IOD instances to disk from a pool of writer threads
+
+    IOD instances are handed over through a bounded queue, so that building the
+    next instance can overlap with writing the previous ones. When the queue is
+    full, submit() blocks until a writer thread has caught up, which is reported
+    as back-pressure in the writer statistics.
+
+    Usage:
+        with BatchWriter(num_workers=4) as writer:
+            for ...:
+                ct_image = CTImage()
+                ...
+                writer.submit(ct_image, output_file)
+    """
+
+    def __init__(
+        self,
+        num_workers=4,
+        max_queue_size=64,
+        fsync=False,
+        fsync_batch_size=32,
+        write_like_original=False,
+    ):
+        """
+        Keyword Arguments:
+            num_workers {int} -- Number of writer threads (default: {4})
+            max_queue_size {int} -- Maximum number of IOD instances waiting to be written (default: {64})
+            fsync {bool} -- Flush written files to stable storage with os.fsync (default: {False})
+            fsync_batch_size {int} -- Number of files each writer thread collects before syncing them (default: {32})
+            write_like_original {bool} -- Passed on to IOD.write_to_file (default: {False})
+        """
+        if num_workers < 1:
+            raise ValueError("At least one writer thread is required")
+        if max_queue_size < 1:
+            raise ValueError("The queue must be able to hold at least one instance")
+        self.num_workers = num_workers
+        self.max_queue_size = max_queue_size
+        self.fsync = fsync
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.write_like_original = write_like_original
+        self.errors = list()
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._threads = list()
+        self._closed = False
+        self._start_time = None
+        self._end_time = None
+        self._submitted = 0
+        self._written = 0
+        self._bytes_written = 0
+        self._max_queue_size_seen = 0
+        self._blocked_submits = 0
+        self._blocked_time = 0.0
+        self._fsync_batches = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(raise_errors=exc_type is None)
+
+    def start(self):
+        """Start the writer threads, called implicitly by submit()"""
+        if self._threads:
+            return
+        if self._closed:
+            raise RuntimeError("BatchWriter has already been closed")
+        self._start_time = time.perf_counter()
+        for ind in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"BatchWriter-{ind}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, iod, output_file):
+        """Queue an IOD instance for writing
+
+        Blocks while the queue is full.
+
+        Arguments:
+            iod {IOD} -- IOD instance to write
+            output_file {str} -- Complete path of file to write to
+        """
+        if self._closed:
+            raise RuntimeError("BatchWriter has already been closed")
+        self.start()
+        item = (iod, output_file)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            blocked_start = time.perf_counter()
+            self._queue.put(item)
+            with self._lock:
+                self._blocked_submits += 1
+                self._blocked_time += time.perf_counter() - blocked_start
+        with self._lock:
+            self._submitted += 1
+            self._max_queue_size_seen = max(
+                self._max_queue_size_seen, self._queue.qsize()
+            )
+
+    def close(self, raise_errors=True):
+        """Wait for all queued instances to be written and stop the writer threads
+
+        Keyword Arguments:
+            raise_errors {bool} -- Re-raise the first write error, if any (default: {True})
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._end_time = time.perf_counter()
+        if raise_errors and self.errors:
+            output_file, exception = self.errors[0]
+            raise RuntimeError(
+                f"Failed to write {len(self.errors)} instance(s), first failure: {output_file}"
+            ) from exception
+
+    def stats(self):
+        """Get current throughput and back-pressure metrics
+
+        Returns:
+            BatchWriterStats -- Snapshot of the writer statistics
+        """
+        with self._lock:
+            if self._start_time is None:
+                elapsed_time = 0.0
+            elif self._end_time is None:
+                elapsed_time = time.perf_counter() - self._start_time
+            else:
+                elapsed_time = self._end_time - self._start_time
+            return BatchWriterStats(
+                submitted=self._submitted,
+                written=self._written,
+                failed=len(self.errors),
+                bytes_written=self._bytes_written,
+                elapsed_time=elapsed_time,
+                queue_size=self._queue.qsize(),
+                max_queue_size_seen=self._max_queue_size_seen,
+                blocked_submits=self._blocked_submits,
+                blocked_time=self._blocked_time,
+                fsync_batches=self._fsync_batches,
+            )
+
+    def _worker(self):
+        pending = list()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            iod, output_file = item
+            try:
+                with open(output_file, "wb") as fp:
+                    iod.write_to_file(fp, write_like_original=self.write_like_original)
+                    number_of_bytes = fp.tell()
+                    if self.fsync:
+                        fp.flush()
+                with self._lock:
+                    self._written += 1
+                    self._bytes_written += number_of_bytes
+                if self.fsync:
+                    pending.append(output_file)
+                    if len(pending) >= self.fsync_batch_size:
+                        self._fsync_files(pending)
+                        pending = list()
+            except Exception as exception:
+                with self._lock:
+                    self.errors.append((output_file, exception))
+        if pending:
+            try:
+                self._fsync_files(pending)
+            except OSError as exception:
+                with self._lock:
+                    self.errors.append((pending[-1], exception))
+
+    def _fsync_files(self, output_files):
+        folders = set()
+        for output_file in output_files:
+            fd = os.open(output_file, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            folders.add(os.path.dirname(os.path.abspath(output_file)))
+        # make the directory entries durable as well, where supported
+        if hasattr(os, "O_DIRECTORY"):
+            for folder in folders:
+                fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        with self._lock:
+            self._fsync_batches += 1
@@ -0,0 +1,150 @@
+import copy
+import zlib
+
+from pydicom.dataset import FileMetaDataset
+from pydicom.filebase import DicomFileLike
+from pydicom.filewriter import write_dataset, write_file_meta_info
+from pydicom.uid import DeflatedExplicitVRLittleEndian, ExplicitVRLittleEndian
+
+"""Default zlib compression level of deflated output, 1 (fastest) to 9 (smallest)
+"""
+DEFAULT_DEFLATE_LEVEL = 6
+
+"""Size in bytes of the encoded data set above which it is deflated in automatic mode
+"""
+DEFAULT_DEFLATE_THRESHOLD = 64 * 1024
+
+
+def write_file_header(output, dataset, transfer_syntax_uid):
+    """Write the preamble and file meta information of a dataset, as dcmwrite does
+
+    The file meta information of dataset is left as is, the transfer syntax
+    and media storage SOP class and instance UIDs are set in a copy.
+
+    Arguments:
+        output {file-like} -- File-like object opened for binary writing
+        dataset {FileDataset} -- Dataset, with file meta information
+        transfer_syntax_uid {str} -- Transfer syntax of the data set following the header
+    """
+    # copies of the elements, to leave the file meta of the dataset as is
+    file_meta = FileMetaDataset(
+        {tag: copy.copy(elem) for tag, elem in dataset.file_meta.items()}
+    )
+    file_meta.TransferSyntaxUID = transfer_syntax_uid
+    # as done by dcmwrite
+    if "SOPClassUID" in dataset:
+        file_meta.MediaStorageSOPClassUID = dataset.SOPClassUID
+    if "SOPInstanceUID" in dataset:
+        file_meta.MediaStorageSOPInstanceUID = dataset.SOPInstanceUID
+    preamble = getattr(dataset, "preamble", None) or b"\x00" * 128
+    output.write(preamble)
+    output.write(b"DICM")
+    write_file_meta_info(DicomFileLike(output), file_meta, enforce_standard=True)
+
+
+class _DeflateStream:
+    """File-like object deflating the encoded data set on its way to the output
+
+    The preamble and file meta information are written before the first
+    bytes of the data set. With a threshold, the data set is buffered until
+    it grows beyond the threshold, and only then is the transfer syntax
+    decided, so that small data sets are written as Explicit VR Little
+    Endian without being encoded twice.
+    """
+
+    def __init__(self, output, dataset, level, threshold):
+        self._output = output
+        self._dataset = dataset
+        self._level = level
+        self._threshold = threshold
+        self._buffer = list()
+        self._buffered = 0
+        self._compressor = None
+        self._written = 0
+        self._deflated_length = 0
+        if threshold is None:
+            self._start(deflate=True)
+
+    def _start(self, deflate):
+        write_file_header(
+            self._output,
+            self._dataset,
+            DeflatedExplicitVRLittleEndian if deflate else ExplicitVRLittleEndian,
+        )
+        if deflate:
+            self._compressor = zlib.compressobj(
+                self._level, zlib.DEFLATED, -zlib.MAX_WBITS
+            )
+        buffered = b"".join(self._buffer)
+        self._buffer = None
+        self._write_encoded(buffered)
+
+    def _write_encoded(self, data):
+        if not data:
+            return
+        if self._compressor is None:
+            self._output.write(data)
+            return
+        deflated = self._compressor.compress(data)
+        if deflated:
+            self._output.write(deflated)
+            self._deflated_length += len(deflated)
+
+    def write(self, data):
+        self._written += len(data)
+        if self._buffer is None:
+            self._write_encoded(data)
+            return
+        # copy, as the written object may be a reused buffer
+        self._buffer.append(bytes(data))
+        self._buffered += len(data)
+        if self._buffered > self._threshold:
+            self._start(deflate=True)
+
+    def tell(self):
+        return self._written
+
+    def close(self):
+        """Write what is left of the data set
+
+        Returns:
+            bool -- Whether the data set was deflated
+        """
+        if self._buffer is not None:
+            self._start(deflate=False)
+        if self._compressor is None:
+            return False
+        deflated = self._compressor.flush()
+        # the deflated data set is padded to an even length, as by dcmwrite
+        if (self._deflated_length + len(deflated)) % 2:
+            deflated += b"\x00"
+        self._output.write(deflated)
+        return True
+
+
+def write_deflated(output, dataset, level=DEFAULT_DEFLATE_LEVEL, threshold=None):
+    """Write a dataset with the Deflated Explicit VR Little Endian transfer syntax
+
+    The data set is encoded as Explicit VR Little Endian and deflated while
+    it is encoded, one top-level element at a time, so that the encoded data
+    set is never held in memory as a whole. The transfer syntax of the file
+    meta information of dataset is left as is.
+
+    Arguments:
+        output {file-like} -- File-like object opened for binary writing
+        dataset {FileDataset} -- Dataset, with file meta information, to write
+
+    Keyword Arguments:
+        level {int} -- zlib compression level (default: {DEFAULT_DEFLATE_LEVEL})
+        threshold {int} -- Only deflate data sets larger than this number of bytes,
+                           smaller ones are written as Explicit VR Little Endian (default: {None})
+
+    Returns:
+        bool -- Whether the data set was deflated
+    """
+    stream = _DeflateStream(output, dataset, level, threshold)
+    fp = DicomFileLike(stream)
+    fp.is_little_endian = True
+    fp.is_implicit_VR = False
+    write_dataset(fp, dataset)
+    return stream.close()
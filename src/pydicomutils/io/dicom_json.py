@@ -0,0 +1,427 @@
+import base64
+import copy
+import json
+from functools import lru_cache
+
+from pydicom import Dataset
+from pydicom.charset import default_encoding
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.dataelem import (
+    DataElement,
+    DataElement_from_raw,
+    RawDataElement,
+    empty_value_for_VR,
+)
+from pydicom.filewriter import correct_ambiguous_vr_element
+from pydicom.multival import MultiValue
+from pydicom.tag import Tag
+from pydicom.valuerep import PersonName
+
+from ..profiling import is_profiling, record_bytes
+
+"""Encoders of DICOM JSON, the first available is used by default
+"""
+ENCODERS = ("orjson", "json")
+
+
+def _import_orjson():
+    """orjson if it is installed, else None, imported on first use to keep it
+    out of the import time
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+# VRs given as InlineBinary or BulkDataURI
+_BINARY_VRS = frozenset(("OB", "OD", "OF", "OL", "OV", "OW", "UN"))
+_INT_VRS = frozenset(("IS", "SL", "SS", "SV", "UL", "US", "UV", "US or SS"))
+_FLOAT_VRS = frozenset(("DS", "FD", "FL"))
+_STRING_VRS = frozenset(
+    ("AE", "AS", "CS", "DA", "DT", "LO", "LT", "SH", "ST", "TM", "UC", "UI", "UR", "UT")
+)
+# string VRs whose values may contain backslashes, i.e. are not multi-valued
+_UNSPLIT_VRS = frozenset(("LT", "ST", "UT"))
+_CONTENT_SEQUENCE = Tag(0x0040, 0xA730)
+
+
+class _Fallback(Exception):
+    """Raised for values converted by pydicom instead"""
+
+
+@lru_cache(maxsize=None)
+def _keyword_tag_and_VR(keyword):
+    return Tag(tag_for_keyword(keyword)), dictionary_VR(keyword)
+
+
+@lru_cache(maxsize=None)
+def _json_key(tag):
+    return f"{tag:08X}"
+
+
+@lru_cache(maxsize=None)
+def _tag_for_json_key(key):
+    return Tag(int(key, 16))
+
+
+def _values(VR, value):
+    """The values of an element as a list, split as pydicom splits strings"""
+    if isinstance(value, str):
+        if "\\" in value and VR not in _UNSPLIT_VRS:
+            return value.split("\\")
+        return [value]
+    if isinstance(value, (list, tuple, MultiValue)):
+        return value
+    if hasattr(value, "tolist"):
+        # a numpy array or scalar
+        value = value.tolist()
+        return value if isinstance(value, list) else [value]
+    return [value]
+
+
+def _is_empty(value):
+    return value is None or (
+        isinstance(value, (str, bytes, PersonName, list, tuple, MultiValue))
+        and not value
+    )
+
+
+def _person_name(value):
+    if isinstance(value, PersonName):
+        components = value.components
+    elif isinstance(value, str):
+        components = value.split("=")
+    else:
+        raise _Fallback()
+    person_name = {"Alphabetic": components[0]}
+    if len(components) > 1:
+        person_name["Ideographic"] = components[1]
+    if len(components) > 2:
+        person_name["Phonetic"] = components[2]
+    return person_name
+
+
+def _json_values(VR, value):
+    """The Value of an element that is neither a sequence nor binary"""
+    values = _values(VR, value)
+    if VR in _INT_VRS or VR in _FLOAT_VRS:
+        number_type = int if VR in _INT_VRS else float
+        try:
+            return [None if v is None or v == "" else number_type(v) for v in values]
+        except (TypeError, ValueError):
+            raise _Fallback()
+    if VR == "PN":
+        return [_person_name(v) for v in values]
+    if VR == "AT":
+        return [f"{Tag(v):08X}" for v in values]
+    if not all(isinstance(v, str) for v in values):
+        # e.g. dates and times as datetime objects
+        raise _Fallback()
+    return list(values)
+
+
+class _Encoder:
+    """Converts data sets to the DICOM JSON Model, as Dataset.to_json_dict does
+
+    Bulk data elements larger than bulk_data_threshold bytes are given as the
+    BulkDataURI returned by bulk_data_element_handler, all others inline.
+
+    Items that consist of strings only, e.g. the codes of the content items
+    of structured reports, are converted once, i.e. equal items share the
+    same dict in the result.
+    """
+
+    def __init__(
+        self,
+        bulk_data_threshold=None,
+        bulk_data_element_handler=None,
+        encodings=default_encoding,
+    ):
+        if bulk_data_threshold is not None and bulk_data_element_handler is None:
+            raise ValueError(
+                "A bulk_data_threshold requires a bulk_data_element_handler"
+            )
+        self.bulk_data_threshold = bulk_data_threshold
+        self.bulk_data_element_handler = bulk_data_element_handler
+        self.encodings = encodings
+        self._items = dict()
+
+    def _bulk_data(self, tag, VR, value, elem):
+        if not isinstance(value, (bytes, bytearray)):
+            raise _Fallback()
+        if (
+            self.bulk_data_threshold is not None
+            and len(value) > self.bulk_data_threshold
+        ):
+            if elem is None:
+                elem = DataElement(tag, VR, value)
+            return {"vr": VR, "BulkDataURI": self.bulk_data_element_handler(elem)}
+        return {"vr": VR, "InlineBinary": base64.b64encode(value).decode("ascii")}
+
+    def _with_pydicom(self, tag, VR, value, elem):
+        if elem is None:
+            elem = DataElement(tag, VR, value)
+        handler = self.bulk_data_element_handler
+        if self.bulk_data_threshold is None:
+            handler = None
+        # pydicom compares the threshold to the length of the base64 encoded value
+        threshold = 4 * -(-(self.bulk_data_threshold or 0) // 3)
+        return elem.to_json_dict(handler, threshold)
+
+    def encode_element(self, tag, VR, value, elem=None, dataset=None):
+        """Convert an element, given as tag, VR and value, or as DataElement elem"""
+        if " or " in VR and VR != "US or SS":
+            if elem is None or dataset is None:
+                return self._with_pydicom(tag, VR, value, elem)
+            elem = correct_ambiguous_vr_element(copy.copy(elem), dataset, True)
+            VR, value = elem.VR, elem.value
+        if VR == "SQ":
+            return {"vr": VR, "Value": [self.encode_item(item) for item in value or ()]}
+        if isinstance(value, str) and VR in _STRING_VRS:
+            if not value:
+                return {"vr": VR}
+            if "\\" not in value or VR in _UNSPLIT_VRS:
+                return {"vr": VR, "Value": [value]}
+        if _is_empty(value):
+            return {"vr": VR}
+        try:
+            if VR in _BINARY_VRS:
+                return self._bulk_data(tag, VR, value, elem)
+            return {"vr": VR, "Value": _json_values(VR, value)}
+        except _Fallback:
+            return self._with_pydicom(tag, VR, value, elem)
+
+    def encode_item(self, item):
+        """Convert an item, a Dataset, a content item or a tuple of (keyword, value) pairs"""
+        if isinstance(item, Dataset):
+            return self.encode_dataset(item)
+        if isinstance(item, tuple):
+            try:
+                json_item = self._items.get(item)
+            except TypeError:
+                # not hashable
+                return self.encode_elements(item)
+            if json_item is None:
+                json_item = self.encode_elements(item)
+                if all(isinstance(value, str) for _, value in item):
+                    self._items[item] = json_item
+            return json_item
+        if getattr(item, "_children", True) is None:
+            # an item read from file, converted with the character set of its data set
+            return self.encode_dataset(item.dataset)
+        return self.encode_elements(item.compact_elements())
+
+    def encode_elements(self, elements):
+        """Convert DataElements and (keyword, value) pairs, in tag order
+
+        Returns:
+            dict -- The elements, by tag as 8 hexadecimal digits
+        """
+        keyed = list()
+        for element in elements:
+            if isinstance(element, RawDataElement):
+                element = DataElement_from_raw(element, self.encodings)
+            if isinstance(element, DataElement):
+                keyed.append((element.tag, element.VR, element.value, element))
+            else:
+                keyword, value = element
+                tag, VR = _keyword_tag_and_VR(keyword)
+                keyed.append((tag, VR, value, None))
+        # as plain ints, compared faster than Tags
+        keyed.sort(key=lambda element: element[0].real)
+        return {
+            _json_key(tag): self.encode_element(tag, VR, value, elem)
+            for tag, VR, value, elem in keyed
+            if not (tag.element == 0 and tag.group > 6)
+        }
+
+    def encode_dataset(self, dataset, replacements=None):
+        """Convert a Dataset, as Dataset.to_json_dict does, but in tag order
+
+        Arguments:
+            dataset {Dataset} -- The data set
+
+        Keyword Arguments:
+            replacements {dict} -- (VR, value) of elements to convert in place of those
+                                   of the dataset, by tag (default: {None})
+
+        Returns:
+            dict -- The elements, by tag as 8 hexadecimal digits
+        """
+        tags = dataset.keys()
+        if replacements:
+            tags = set(tags).union(replacements)
+        json_dataset = dict()
+        for tag in sorted(tags):
+            if tag.element == 0 and tag.group > 6:
+                continue
+            if replacements and tag in replacements:
+                VR, value = replacements[tag]
+                json_dataset[_json_key(tag)] = self.encode_element(tag, VR, value)
+                continue
+            # converts raw elements with the character set of the data set
+            elem = dataset[tag]
+            json_dataset[_json_key(tag)] = self.encode_element(
+                tag, elem.VR, elem.value, elem, dataset
+            )
+        return json_dataset
+
+
+class _Decoder:
+    """Creates data sets from the DICOM JSON Model, as Dataset.from_json does
+
+    The elements are created directly from the values of the JSON. Person
+    names, attribute tags and bulk data URIs are converted by pydicom.
+    """
+
+    def __init__(self, bulk_data_uri_handler=None):
+        self.bulk_data_uri_handler = bulk_data_uri_handler
+
+    def decode_element(self, key, mapping):
+        VR = mapping["vr"]
+        if "Value" in mapping:
+            values = mapping["Value"]
+            if VR == "SQ":
+                value = [self.decode_dataset(item or {}) for item in values]
+            elif VR == "PN" or VR == "AT" or not isinstance(values, list):
+                return self._with_pydicom(key, VR, mapping, "Value")
+            elif not values:
+                value = empty_value_for_VR(VR)
+            else:
+                if VR in _INT_VRS or VR in _FLOAT_VRS:
+                    number_type = int if VR in _INT_VRS else float
+                    values = [None if v is None else number_type(v) for v in values]
+                elif None in values:
+                    values = [
+                        empty_value_for_VR(VR) if v is None else v for v in values
+                    ]
+                value = values[0] if len(values) == 1 else values
+        elif "InlineBinary" in mapping:
+            value = mapping["InlineBinary"]
+            if isinstance(value, list):
+                value = value[0]
+            value = base64.b64decode(value)
+        elif "BulkDataURI" in mapping:
+            return self._with_pydicom(key, VR, mapping, "BulkDataURI")
+        else:
+            value = empty_value_for_VR(VR)
+        return DataElement(_tag_for_json_key(key), VR, value)
+
+    def _with_pydicom(self, key, VR, mapping, value_key):
+        return DataElement.from_json(
+            Dataset, key, VR, mapping[value_key], value_key, self.bulk_data_uri_handler
+        )
+
+    def decode_dataset(self, json_dataset):
+        dataset = Dataset()
+        for key, mapping in json_dataset.items():
+            dataset.add(self.decode_element(key, mapping))
+        return dataset
+
+
+def to_json_dict(iod, bulk_data_threshold=None, bulk_data_element_handler=None):
+    """Convert the data set of an IOD to the DICOM JSON Model, PS3.18 Annex F
+
+    The elements are converted directly from the structures of the IOD,
+    without building a Dataset for content kept in compact form, i.e. the
+    content tree of structured reports, and without writing and reading the
+    IOD first. The elements are in tag order and ambiguous VRs are resolved,
+    e.g. the "OB or OW" of PixelData, otherwise the result is that of
+    Dataset.to_json_dict.
+
+    Arguments:
+        iod {IOD or Dataset} -- The IOD, or the Dataset, to convert
+
+    Keyword Arguments:
+        bulk_data_threshold {int} -- Size in bytes above which the values of binary elements,
+                                     e.g. PixelData, are given as BulkDataURI instead of
+                                     InlineBinary (default: {None, all inline})
+        bulk_data_element_handler {callable} -- Returns the BulkDataURI of a DataElement,
+                                                required with bulk_data_threshold (default: {None})
+
+    Returns:
+        dict -- The data set in the DICOM JSON Model
+    """
+    dataset = iod if isinstance(iod, Dataset) else iod.dataset
+    encoder = _Encoder(
+        bulk_data_threshold,
+        bulk_data_element_handler,
+        dataset.get("SpecificCharacterSet", default_encoding),
+    )
+    content = getattr(iod, "content", None)
+    if content is None:
+        if not isinstance(iod, Dataset):
+            iod.materialize()
+        return encoder.encode_dataset(dataset)
+    # the content tree is converted in place of the Content Sequence
+    return encoder.encode_dataset(
+        dataset, replacements={_CONTENT_SEQUENCE: ("SQ", content)}
+    )
+
+
+def dumps(json_dataset, encoder=None):
+    """Serialize a data set in the DICOM JSON Model to a string
+
+    Both encoders give compact, UTF-8 (not ASCII escaped) JSON, orjson being
+    several times faster. Floats may be formatted differently, e.g. 1e-05 by
+    json and 1e-5 by orjson.
+
+    Arguments:
+        json_dataset {dict} -- The data set, e.g. as returned by to_json_dict
+
+    Keyword Arguments:
+        encoder {str} -- "orjson" or "json" (default: {None, the first available of ENCODERS})
+
+    Returns:
+        str -- The JSON
+    """
+    orjson = _import_orjson() if encoder in (None, "orjson") else None
+    if encoder is None:
+        encoder = "orjson" if orjson is not None else "json"
+    if encoder == "orjson":
+        if orjson is None:
+            raise ImportError("The orjson encoder requires the orjson package")
+        return orjson.dumps(json_dataset).decode("utf-8")
+    if encoder == "json":
+        return json.dumps(json_dataset, ensure_ascii=False, separators=(",", ":"))
+    raise ValueError(f"encoder must be one of {ENCODERS}, got {encoder!r}")
+
+
+def to_json(
+    iod, bulk_data_threshold=None, bulk_data_element_handler=None, encoder=None
+):
+    """Serialize the data set of an IOD as DICOM JSON, see to_json_dict and dumps
+
+    Returns:
+        str -- The JSON
+    """
+    json_string = dumps(
+        to_json_dict(iod, bulk_data_threshold, bulk_data_element_handler), encoder
+    )
+    if is_profiling():
+        record_bytes("dicom_json.to_json", len(json_string))
+    return json_string
+
+
+def from_json(json_dataset, bulk_data_uri_handler=None):
+    """Create a Dataset from DICOM JSON, parsed by orjson if available, see _Decoder
+
+    Arguments:
+        json_dataset {str, bytes or dict} -- The data set in the DICOM JSON Model
+
+    Keyword Arguments:
+        bulk_data_uri_handler {callable} -- Returns the value of a BulkDataURI, as for
+                                            Dataset.from_json (default: {None})
+
+    Returns:
+        Dataset -- The data set
+    """
+    if isinstance(json_dataset, (str, bytes, bytearray)):
+        orjson = _import_orjson()
+        if orjson is not None:
+            json_dataset = orjson.loads(json_dataset)
+        else:
+            json_dataset = json.loads(json_dataset)
+    return _Decoder(bulk_data_uri_handler).decode_dataset(json_dataset)
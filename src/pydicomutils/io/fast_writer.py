@@ -0,0 +1,409 @@
+import copy
+import struct
+from functools import lru_cache
+
+from pydicom import Dataset
+from pydicom.charset import convert_encodings, default_encoding, encode_string
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.dataelem import DataElement, RawDataElement
+from pydicom.filebase import DicomBytesIO
+from pydicom.filewriter import correct_ambiguous_vr_element, write_data_element
+from pydicom.multival import MultiValue
+from pydicom.tag import Tag
+from pydicom.uid import ExplicitVRLittleEndian
+from pydicom.valuerep import PersonName
+
+from ..profiling import is_profiling, record_bytes
+from .deflate import (
+    DEFAULT_DEFLATE_LEVEL,
+    DEFAULT_DEFLATE_THRESHOLD,
+    _DeflateStream,
+    write_file_header,
+)
+
+# VRs with a 2 byte reserved field and a 4 byte length in Explicit VR
+_LONG_VRS = frozenset(
+    ("OB", "OD", "OF", "OL", "OV", "OW", "SQ", "UC", "UN", "UR", "UT", "SV", "UV")
+)
+# VRs encoded with the character set of the data set
+_TEXT_VRS = frozenset(("LO", "LT", "SH", "ST", "UC", "UT"))
+# VRs encoded as ASCII strings, padded with a space, or a null byte for UI
+_STRING_VRS = frozenset(("AE", "AS", "CS", "UI", "UR", "DA", "DT", "TM"))
+_NUMBER_FORMATS = {
+    "US": "H",
+    "SS": "h",
+    "UL": "L",
+    "SL": "l",
+    "FL": "f",
+    "FD": "d",
+    "SV": "q",
+    "UV": "Q",
+}
+_BYTES_VRS = frozenset(("OB", "OD", "OF", "OL", "OV", "OW"))
+
+_ITEM = struct.pack("<HH", 0xFFFE, 0xE000)
+_ITEM_DELIMITER = struct.pack("<HHL", 0xFFFE, 0xE00D, 0)
+_SEQUENCE_DELIMITER = struct.pack("<HHL", 0xFFFE, 0xE0DD, 0)
+_UNDEFINED_LENGTH = 0xFFFFFFFF
+_CONTENT_SEQUENCE = Tag(0x0040, 0xA730)
+_SPECIFIC_CHARACTER_SET = Tag(0x0008, 0x0005)
+
+
+class _Fallback(Exception):
+    """Raised for values encoded by pydicom instead"""
+
+
+@lru_cache(maxsize=None)
+def _keyword_tag_and_VR(keyword):
+    return Tag(tag_for_keyword(keyword)), dictionary_VR(keyword)
+
+
+@lru_cache(maxsize=64)
+def _codec(encodings):
+    """The Python codec of the character set, or None if it takes more than one"""
+    codecs = convert_encodings(list(encodings))
+    return codecs[0] if len(codecs) == 1 else None
+
+
+def _character_set(specific_character_set, parent_encodings):
+    """Character set of a data set as a hashable tuple, that of the parent if not set"""
+    if not specific_character_set:
+        return parent_encodings
+    if _is_multi_value(specific_character_set):
+        return tuple(specific_character_set)
+    return (specific_character_set,)
+
+
+def _is_multi_value(value):
+    return isinstance(value, (list, tuple, MultiValue))
+
+
+def _is_empty(value):
+    return value is None or (
+        isinstance(value, (str, bytes, list, tuple, MultiValue)) and len(value) == 0
+    )
+
+
+def _number_string(value):
+    """DS or IS value as written by pydicom, i.e. as converted to DSfloat or IS"""
+    original_string = getattr(value, "original_string", None)
+    if original_string is not None:
+        return original_string
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        raise _Fallback()
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        # as str(DSfloat(value))
+        return repr(float(value))
+    raise _Fallback()
+
+
+def _encode_text(value, encodings):
+    codec = _codec(encodings)
+    if codec is None:
+        return encode_string(value, convert_encodings(list(encodings)))
+    try:
+        return value.encode(codec)
+    except UnicodeEncodeError:
+        return encode_string(value, convert_encodings(list(encodings)))
+
+
+def _encode_value(VR, value, encodings):
+    """Encode a value that is not a sequence, padded to an even length"""
+    if VR in _STRING_VRS:
+        if _is_multi_value(value):
+            if not all(isinstance(v, str) for v in value):
+                raise _Fallback()
+            value = "\\".join(value)
+        elif not isinstance(value, str):
+            raise _Fallback()
+        if len(value) % 2:
+            value += "\0" if VR == "UI" else " "
+        return value.encode(default_encoding)
+    if VR in _TEXT_VRS:
+        if _is_multi_value(value):
+            if not isinstance(value[0], str):
+                raise _Fallback()
+            encoded = b"\\".join(_encode_text(v, encodings) for v in value)
+        elif isinstance(value, str):
+            encoded = _encode_text(value, encodings)
+        else:
+            raise _Fallback()
+        return encoded + b" " if len(encoded) % 2 else encoded
+    if VR == "DS" or VR == "IS":
+        if _is_multi_value(value):
+            value = "\\".join(_number_string(v) for v in value)
+        else:
+            value = _number_string(value)
+        if len(value) % 2:
+            value += " "
+        return value.encode(default_encoding)
+    number_format = _NUMBER_FORMATS.get(VR)
+    if number_format is not None:
+        if isinstance(value, (list, MultiValue)):
+            return struct.pack(f"<{len(value)}{number_format}", *value)
+        if isinstance(value, (bytes, tuple)) or hasattr(value, "__len__"):
+            raise _Fallback()
+        return struct.pack(f"<{number_format}", value)
+    if VR in _BYTES_VRS:
+        if not isinstance(value, bytes):
+            raise _Fallback()
+        if len(value) % 2 and VR == "OB":
+            return value + b"\x00"
+        return value
+    if VR == "PN":
+        values = value if _is_multi_value(value) else [value]
+        # PersonNames, e.g. as converted by DataElement, keep their own encoding
+        if _codec(encodings) is None or not all(
+            isinstance(v, str) and not isinstance(v, PersonName) for v in values
+        ):
+            raise _Fallback()
+        encoded = b"\\".join(_encode_text(v, encodings) for v in values)
+        return encoded + b" " if len(encoded) % 2 else encoded
+    if VR == "AT":
+        tags = value if _is_multi_value(value) else [value]
+        return b"".join(
+            struct.pack("<HH", tag.group, tag.element) for tag in map(Tag, tags)
+        )
+    raise _Fallback()
+
+
+def _encode_with_pydicom(elem, encodings):
+    fp = DicomBytesIO()
+    fp.is_little_endian = True
+    fp.is_implicit_VR = False
+    write_data_element(fp, elem, list(encodings))
+    return fp.getvalue()
+
+
+class _Encoder:
+    """Encodes data sets as Explicit VR Little Endian, as write_dataset does
+
+    Items that consist of strings only, e.g. the codes of the content items
+    of structured reports, are encoded once per character set and reused.
+    """
+
+    def __init__(self):
+        self._items = dict()
+
+    def encode_element(self, tag, VR, value, encodings, elem=None, dataset=None):
+        """Encode an element, given as tag, VR and value, or as DataElement elem"""
+        if elem is not None and elem.VR not in _LONG_VRS and " or " in elem.VR:
+            if dataset is None:
+                return _encode_with_pydicom(elem, encodings)
+            elem = correct_ambiguous_vr_element(copy.copy(elem), dataset, True)
+            VR, value = elem.VR, elem.value
+        if VR == "SQ":
+            if elem is not None and elem.is_undefined_length:
+                return (
+                    struct.pack(
+                        "<HH2sHL", tag.group, tag.element, b"SQ", 0, _UNDEFINED_LENGTH
+                    )
+                    + self.encode_items(value or (), encodings)
+                    + _SEQUENCE_DELIMITER
+                )
+            encoded = self.encode_items(value or (), encodings)
+        elif _is_empty(value):
+            encoded = b""
+        else:
+            if elem is not None and elem.is_undefined_length:
+                return _encode_with_pydicom(elem, encodings)
+            try:
+                encoded = _encode_value(VR, value, encodings)
+            except _Fallback:
+                if elem is None:
+                    elem = DataElement(tag, VR, value)
+                return _encode_with_pydicom(elem, encodings)
+        if VR in _LONG_VRS:
+            header = struct.pack(
+                "<HH2sHL", tag.group, tag.element, VR.encode(), 0, len(encoded)
+            )
+        elif len(encoded) > 0xFFFF:
+            # too long for the 2 byte length field, pydicom changes the VR to UN
+            if elem is None:
+                elem = DataElement(tag, VR, value)
+            return _encode_with_pydicom(elem, encodings)
+        else:
+            header = struct.pack(
+                "<HH2sH", tag.group, tag.element, VR.encode(), len(encoded)
+            )
+        return header + encoded
+
+    def encode_items(self, items, encodings):
+        """Encode the items of a sequence, each with its item tag and length"""
+        chunks = list()
+        for item in items:
+            undefined_length = getattr(item, "is_undefined_length_sequence_item", False)
+            encoded = self.encode_item(item, encodings)
+            if undefined_length:
+                chunks.append(_ITEM + struct.pack("<L", _UNDEFINED_LENGTH))
+                chunks.append(encoded)
+                chunks.append(_ITEM_DELIMITER)
+            else:
+                chunks.append(_ITEM + struct.pack("<L", len(encoded)))
+                chunks.append(encoded)
+        return b"".join(chunks)
+
+    def encode_item(self, item, encodings):
+        """Encode an item, a Dataset, a content item or a tuple of (keyword, value) pairs"""
+        if isinstance(item, Dataset):
+            return b"".join(self.encode_dataset(item, encodings))
+        if isinstance(item, tuple):
+            # the encoding of text values depends on the character set
+            key = (item, encodings)
+            try:
+                encoded = self._items.get(key)
+            except TypeError:
+                # not hashable
+                return b"".join(self.encode_elements(item, encodings))
+            if encoded is None:
+                encoded = b"".join(self.encode_elements(item, encodings))
+                if all(isinstance(value, str) for _, value in item):
+                    self._items[key] = encoded
+            return encoded
+        return b"".join(self.encode_elements(item.compact_elements(), encodings))
+
+    def encode_elements(self, elements, encodings):
+        """Encode DataElements and (keyword, value) pairs, in tag order
+
+        Returns:
+            list -- The encoded elements
+        """
+        keyed = list()
+        for element in elements:
+            if isinstance(element, (DataElement, RawDataElement)):
+                keyed.append((element.tag, element.VR, element.value, element))
+            else:
+                keyword, value = element
+                tag, VR = _keyword_tag_and_VR(keyword)
+                keyed.append((tag, VR, value, None))
+        keyed.sort(key=lambda element: element[0])
+        if keyed and keyed[0][0] <= _SPECIFIC_CHARACTER_SET:
+            for tag, _, value, _ in keyed:
+                if tag == _SPECIFIC_CHARACTER_SET:
+                    encodings = _character_set(value, encodings)
+        encoded = list()
+        for tag, VR, value, elem in keyed:
+            if tag.element == 0 and tag.group > 6:
+                continue
+            if elem is not None and elem.is_raw:
+                encoded.append(_encode_with_pydicom(elem, encodings))
+            else:
+                encoded.append(self.encode_element(tag, VR, value, encodings, elem))
+        return encoded
+
+    def encode_dataset(self, dataset, encodings=(default_encoding,), replacements=None):
+        """Encode a Dataset, as write_dataset does
+
+        Arguments:
+            dataset {Dataset} -- The data set
+
+        Keyword Arguments:
+            encodings {tuple} -- Character set of the parent data set (default: {(default_encoding,)})
+            replacements {dict} -- (VR, value) of elements to encode in place of those
+                                   of the dataset, by tag (default: {None})
+
+        Returns:
+            list -- The encoded elements
+        """
+        encodings = _character_set(dataset.get("SpecificCharacterSet"), encodings)
+        # like write_dataset, elements read in another encoding are converted
+        convert = not dataset.is_original_encoding
+        tags = dataset.keys()
+        if replacements:
+            tags = set(tags).union(replacements)
+        encoded = list()
+        for tag in sorted(tags):
+            if tag.element == 0 and tag.group > 6:
+                continue
+            if replacements and tag in replacements:
+                VR, value = replacements[tag]
+                encoded.append(self.encode_element(tag, VR, value, encodings))
+                continue
+            elem = dataset[tag] if convert else dataset.get_item(tag)
+            if elem.is_raw:
+                encoded.append(_encode_with_pydicom(elem, encodings))
+            else:
+                encoded.append(
+                    self.encode_element(
+                        tag, elem.VR, elem.value, encodings, elem, dataset
+                    )
+                )
+        return encoded
+
+
+def encode_iod(iod):
+    """Encode the data set of an IOD as Explicit VR Little Endian
+
+    The elements are encoded directly from the structures of the IOD, with
+    the padding, lengths and tag order of dcmwrite, without building a
+    Dataset for content kept in compact form, i.e. the content tree of
+    structured reports. Values pydicom would convert first, e.g. person
+    names or dates given as date objects, are encoded by pydicom.
+
+    Arguments:
+        iod {IOD or Dataset} -- The IOD, or the Dataset, to encode
+
+    Returns:
+        list -- Encoded elements, which concatenated form the data set
+    """
+    encoder = _Encoder()
+    if isinstance(iod, Dataset):
+        return encoder.encode_dataset(iod)
+    content = getattr(iod, "content", None)
+    if content is None:
+        iod.materialize()
+        return encoder.encode_dataset(iod.dataset)
+    # the content tree is encoded in place of the Content Sequence
+    return encoder.encode_dataset(
+        iod.dataset, replacements={_CONTENT_SEQUENCE: ("SQ", content)}
+    )
+
+
+def write_fast(
+    output_file,
+    iod,
+    deflate=False,
+    deflate_level=DEFAULT_DEFLATE_LEVEL,
+    deflate_threshold=DEFAULT_DEFLATE_THRESHOLD,
+):
+    """Write an IOD as Explicit VR Little Endian without dcmwrite, see encode_iod
+
+    Gives the same file as dcmwrite, or, when deflating, as write_to_file.
+
+    Arguments:
+        output_file {str or file-like} -- Complete path of file, or file-like object, to write to
+        iod {IOD} -- The IOD to write
+
+    Keyword Arguments:
+        deflate {bool or str} -- Write with the Deflated Explicit VR Little Endian transfer syntax,
+                                 True, False or "auto" (default: {False})
+        deflate_level {int} -- zlib compression level (default: {DEFAULT_DEFLATE_LEVEL})
+        deflate_threshold {int} -- Size in bytes above which the data set is deflated,
+                                   if deflate is "auto" (default: {DEFAULT_DEFLATE_THRESHOLD})
+
+    Returns:
+        int -- Number of bytes of the encoded data set, before deflating
+    """
+    if not hasattr(output_file, "write"):
+        with open(output_file, "wb") as fp:
+            return write_fast(fp, iod, deflate, deflate_level, deflate_threshold)
+    encoded = encode_iod(iod)
+    dataset = iod if isinstance(iod, Dataset) else iod.dataset
+    if deflate:
+        threshold = deflate_threshold if deflate == "auto" else None
+        stream = _DeflateStream(output_file, dataset, deflate_level, threshold)
+        for chunk in encoded:
+            stream.write(chunk)
+        stream.close()
+    else:
+        write_file_header(output_file, dataset, ExplicitVRLittleEndian)
+        for chunk in encoded:
+            output_file.write(chunk)
+    number_of_bytes = sum(len(chunk) for chunk in encoded)
+    if is_profiling():
+        record_bytes("write_fast", number_of_bytes)
+    return number_of_bytes
@@ -0,0 +1,176 @@
+import io
+import os
+import shutil
+
+from pydicom import dcmread, dcmwrite
+from pydicom.uid import DeflatedExplicitVRLittleEndian
+
+"""Outcomes of patch_header
+"""
+UNCHANGED = "unchanged"
+IN_PLACE = "in_place"
+SPLICED = "spliced"
+
+"""Size of chunks when copying the pixel data without kernel support
+"""
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def read_header(fp):
+    """Read the header of a DICOM file, i.e. everything before the pixel data
+
+    Arguments:
+        fp {file-like} -- DICOM file opened in binary mode, positioned at its start
+
+    Returns:
+        (FileDataset, int) -- The header, and the offset of the pixel data element,
+                              or of the end of the file if there is no pixel data
+    """
+    ds = dcmread(fp, stop_before_pixels=True, force=True)
+    # dcmread leaves the file positioned at the tag of the pixel data element
+    return ds, fp.tell()
+
+
+def encode_header(ds):
+    """Encode a header as read by read_header, with the original encoding
+
+    Arguments:
+        ds {FileDataset} -- The header
+
+    Returns:
+        bytes -- Preamble, file meta information and data set up to the pixel data
+    """
+    buffer = io.BytesIO()
+    dcmwrite(buffer, ds, write_like_original=True)
+    return buffer.getvalue()
+
+
+def _copy_range(src, dst, offset, count):
+    """Copy count bytes at offset of src to the current position of dst
+
+    The copy is done in the kernel with copy_file_range or sendfile where
+    available, so that the bytes never pass through user space.
+    """
+    dst.flush()
+    src_fd = src.fileno()
+    dst_fd = dst.fileno()
+    end = offset + count
+    for copy_function in ("copy_file_range", "sendfile"):
+        if not hasattr(os, copy_function):
+            continue
+        try:
+            while offset < end:
+                if copy_function == "copy_file_range":
+                    copied = os.copy_file_range(
+                        src_fd, dst_fd, end - offset, offset_src=offset
+                    )
+                else:
+                    copied = os.sendfile(dst_fd, src_fd, offset, end - offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError:
+            # e.g. not supported between these file systems, try the next way
+            continue
+        if offset >= end:
+            return
+    # the kernel copies advanced the file offset of dst, so write to it directly
+    while offset < end:
+        chunk = os.pread(src_fd, min(COPY_CHUNK_SIZE, end - offset), offset)
+        if not chunk:
+            raise EOFError(f"Unexpected end of file at offset {offset}")
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst_fd, view) :]
+        offset += len(chunk)
+
+
+def patch_header(dcm_file, patch, fsync=False):
+    """Modify the header of a DICOM file without rewriting its pixel data
+
+    Only the header, up to the pixel data element, is parsed, passed to patch
+    and encoded again. If the encoded header has the same length as before,
+    the changed bytes are written in place. Otherwise a new file is written
+    with the new header, followed by the pixel data (and anything after it)
+    copied from the original file in the kernel, and then renamed over the
+    original file.
+
+    Usage:
+        def anonymize(ds):
+            ds.PatientName = "ANONYMOUS"
+
+        patch_header("image.dcm", anonymize)
+
+    Arguments:
+        dcm_file {str} -- Path of DICOM file to patch
+        patch {callable} -- Called with the header, a FileDataset without pixel data, to modify in place
+
+    Keyword Arguments:
+        fsync {bool} -- Flush the patched file to disk before returning (default: {False})
+
+    Returns:
+        str -- UNCHANGED, IN_PLACE or SPLICED
+    """
+    with open(dcm_file, "rb") as src:
+        ds, pixel_data_offset = read_header(src)
+        transfer_syntax = _transfer_syntax(ds)
+        if transfer_syntax == DeflatedExplicitVRLittleEndian:
+            raise ValueError(
+                f"Cannot patch {dcm_file}, the data set is deflated as a whole"
+            )
+        patch(ds)
+        if _transfer_syntax(ds) != transfer_syntax:
+            raise ValueError(
+                f"Cannot patch {dcm_file}, the transfer syntax must not be changed"
+            )
+        header = encode_header(ds)
+        src.seek(0)
+        original_header = src.read(pixel_data_offset)
+        if header == original_header:
+            return UNCHANGED
+        file_size = os.fstat(src.fileno()).st_size
+        if len(header) == len(original_header):
+            _write_in_place(dcm_file, header, original_header, fsync)
+            return IN_PLACE
+        tmp_file = f"{dcm_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "wb") as dst:
+                dst.write(header)
+                _copy_range(src, dst, pixel_data_offset, file_size - pixel_data_offset)
+                if fsync:
+                    os.fsync(dst.fileno())
+            shutil.copymode(dcm_file, tmp_file)
+            os.replace(tmp_file, dcm_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    return SPLICED
+
+
+def _transfer_syntax(ds):
+    file_meta = getattr(ds, "file_meta", None)
+    if file_meta is None:
+        return None
+    return file_meta.get("TransferSyntaxUID")
+
+
+def _first_difference(a, b, block_size=4096):
+    """Index of the first byte differing between a and b, of the same length"""
+    start = 0
+    while a[start : start + block_size] == b[start : start + block_size]:
+        start += block_size
+    while a[start] == b[start]:
+        start += 1
+    return start
+
+
+def _write_in_place(dcm_file, header, original_header, fsync):
+    """Write the range of header that differs from original_header"""
+    start = _first_difference(header, original_header)
+    end = len(header) - _first_difference(header[::-1], original_header[::-1])
+    with open(dcm_file, "r+b") as f:
+        f.seek(start)
+        f.write(header[start:end])
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
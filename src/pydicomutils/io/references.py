@@ -0,0 +1,182 @@
+import os
+
+from pydicom import Dataset, dcmread
+
+from ..profiling import is_profiling, record_bytes
+
+"""Tags read from a referenced DICOM file, i.e. everything the presentation
+state and SR IODs take from their referenced objects
+"""
+REFERENCE_RECORD_TAGS = [
+    "SOPClassUID",
+    "SOPInstanceUID",
+    "StudyDate",
+    "StudyTime",
+    "AccessionNumber",
+    "Modality",
+    "StudyDescription",
+    "PatientName",
+    "PatientID",
+    "PatientBirthDate",
+    "PatientSex",
+    "StudyInstanceUID",
+    "SeriesInstanceUID",
+    "StudyID",
+    "FrameOfReferenceUID",
+    "Rows",
+    "Columns",
+    "PixelSpacing",
+]
+
+
+class ReferenceRecord:
+    """Compact record of a referenced DICOM object
+
+    Holds the values of REFERENCE_RECORD_TAGS present in the object, which
+    are accessed as attributes, as for a Dataset. Records can be passed to
+    the initiate() and add_* methods of the IOD classes in place of file
+    paths or Datasets.
+    """
+
+    __slots__ = ("dcm_file", "_values")
+
+    def __init__(self, values, dcm_file=None):
+        """
+        Arguments:
+            values {dict} -- Values by keyword
+
+        Keyword Arguments:
+            dcm_file {str} -- Path of the DICOM file the values were read from (default: {None})
+        """
+        self._values = values
+        self.dcm_file = dcm_file
+
+    @classmethod
+    def from_dataset(cls, ds, dcm_file=None):
+        """Create a record from the header of a DICOM object
+
+        Arguments:
+            ds {Dataset} -- The DICOM object
+
+        Keyword Arguments:
+            dcm_file {str} -- Path of the DICOM file ds was read from (default: {None})
+
+        Returns:
+            ReferenceRecord -- The record
+        """
+        return cls(
+            {
+                keyword: ds[keyword].value
+                for keyword in REFERENCE_RECORD_TAGS
+                if keyword in ds
+            },
+            dcm_file=dcm_file,
+        )
+
+    def get(self, keyword, default=None):
+        return self._values.get(keyword, default)
+
+    def __contains__(self, keyword):
+        return keyword in self._values
+
+    def __getattr__(self, name):
+        if name in ReferenceRecord.__slots__:
+            raise AttributeError(name)
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+
+    def __getstate__(self):
+        return self._values, self.dcm_file
+
+    def __setstate__(self, state):
+        self._values, self.dcm_file = state
+
+    def __repr__(self):
+        return f"ReferenceRecord({self.get('SOPInstanceUID')!r}, dcm_file={self.dcm_file!r})"
+
+
+def _read_record(dcm_file):
+    ds = dcmread(dcm_file, stop_before_pixels=True, specific_tags=REFERENCE_RECORD_TAGS)
+    return ReferenceRecord.from_dataset(ds, dcm_file=dcm_file)
+
+
+def read_reference_record(dcm, records=None):
+    """Get a referenced DICOM object as a record or Dataset
+
+    Arguments:
+        dcm {str, Path, Dataset, ReferenceRecord or SliceHandle} -- The referenced object
+
+    Keyword Arguments:
+        records {dict} -- Records by file path, kept between calls to read each file once (default: {None})
+
+    Returns:
+        ReferenceRecord or Dataset -- A record for a file path, dcm as is otherwise
+    """
+    return harvest_references([dcm], records=records)[0]
+
+
+def as_reference(dcm):
+    """Slices of a series loaded by io.series_loader are referenced by their file"""
+    if isinstance(dcm, (str, os.PathLike, Dataset, ReferenceRecord)):
+        return dcm
+    return getattr(dcm, "dcm_file", dcm)
+
+
+def harvest_references(dcms, num_workers=1, records=None):
+    """Read the referenced DICOM objects of an IOD in a single pass
+
+    Each distinct file is read at most once, header only, and only the tags
+    of REFERENCE_RECORD_TAGS. Datasets and records are returned as is.
+
+    Usage:
+        references = harvest_references(dcm_files, num_workers=8)
+        gsps.initiate(references)
+        gsps.add_graphic_object(references[0], ...)
+
+    Arguments:
+        dcms {list} -- File paths, Datasets, ReferenceRecords and/or SliceHandles
+
+    Keyword Arguments:
+        num_workers {int} -- Number of worker processes reading files, None for the number of CPUs (default: {1})
+        records {dict} -- Records by file path, kept between calls to read each file once (default: {None})
+
+    Returns:
+        list -- ReferenceRecords or Datasets in the same order as dcms
+    """
+    if records is None:
+        records = dict()
+    dcms = [as_reference(dcm) for dcm in dcms]
+    # distinct files not read before, in order of first reference
+    pending_files = dict()
+    for dcm in dcms:
+        if isinstance(dcm, (str, os.PathLike)):
+            dcm_file = os.fspath(dcm)
+            if dcm_file not in records:
+                pending_files[dcm_file] = None
+        elif not isinstance(dcm, (Dataset, ReferenceRecord)):
+            raise TypeError(f"Unsupported reference {dcm!r}")
+    dcm_files = list(pending_files)
+    if is_profiling():
+        for dcm_file in dcm_files:
+            record_bytes("read_reference", os.path.getsize(dcm_file))
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(dcm_files) <= 1:
+        read_records = [_read_record(dcm_file) for dcm_file in dcm_files]
+    else:
+        # imported here to keep multiprocessing out of the import time of all IODs
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, min(256, len(dcm_files) // (num_workers * 4)))
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            read_records = list(
+                executor.map(_read_record, dcm_files, chunksize=chunksize)
+            )
+    records.update(zip(dcm_files, read_records))
+    return [
+        records[os.fspath(dcm)] if isinstance(dcm, (str, os.PathLike)) else dcm
+        for dcm in dcms
+    ]
@@ -0,0 +1,219 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from pydicom import dcmread
+
+from ..uid_generator import generate_uid
+from .series_writer import SeriesWriter
+
+"""Default name of the file of each instance, formatted with the instance number
+"""
+DEFAULT_FILE_NAME = "{:06d}.dcm"
+
+# State of a worker process, set by _init_worker
+_writer = None
+_volume = None
+_shared_memory = None
+
+
+def _as_ds(values):
+    """Format numbers as DS strings of at most 16 characters"""
+    return np.char.mod("%.10g", np.asarray(values, dtype=np.float64)).tolist()
+
+
+def _attach_volume(volume_source):
+    """Get the volume described by volume_source, as created by _share_volume"""
+    kind, location, offset, dtype, shape = volume_source
+    if kind == "memmap":
+        return None, np.memmap(
+            location, dtype=dtype, mode="r", offset=offset, shape=shape
+        )
+    shm = shared_memory.SharedMemory(name=location)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _share_volume(volume):
+    """Make the volume available to worker processes without pickling it
+
+    A memory-mapped volume is opened again by the workers, any other volume
+    is copied once to shared memory.
+
+    Returns:
+        (SharedMemory, tuple) -- Shared memory to release afterwards, if created, and
+                                 the description of the volume passed to the workers
+    """
+    # a slice of a memmap keeps the offset of the whole file, so only
+    # memmaps opened as such are passed on by file name
+    if (
+        isinstance(volume, np.memmap)
+        and volume.filename is not None
+        and not isinstance(volume.base, np.memmap)
+        and volume.flags.c_contiguous
+    ):
+        return None, (
+            "memmap",
+            volume.filename,
+            volume.offset,
+            volume.dtype.str,
+            volume.shape,
+        )
+    volume = np.ascontiguousarray(volume)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, volume.nbytes))
+    np.ndarray(volume.shape, dtype=volume.dtype, buffer=shm.buf)[...] = volume
+    return shm, ("shared_memory", shm.name, 0, volume.dtype.str, volume.shape)
+
+
+def _set_state(writer, volume, shm=None):
+    global _writer, _volume, _shared_memory
+    previous_state = (_writer, _volume, _shared_memory)
+    _writer, _volume, _shared_memory = writer, volume, shm
+    return previous_state
+
+
+def _init_worker(template_bytes, varying_keywords, volume_source):
+    shm, volume = _attach_volume(volume_source)
+    _set_state(
+        SeriesWriter(
+            dcmread(io.BytesIO(template_bytes)), varying_keywords=varying_keywords
+        ),
+        volume,
+        shm,
+    )
+
+
+def _write_slices(task):
+    """Write the slices of one range of slice indices
+
+    task is (start, output_files, instance values), with the values of the
+    varying elements, except the pixel data, per slice.
+    """
+    start, output_files, instance_values = task
+    number_of_bytes = 0
+    for ind, (output_file, values) in enumerate(zip(output_files, instance_values)):
+        number_of_bytes += _writer.write(
+            output_file, PixelData=_volume[start + ind], **values
+        )
+    return number_of_bytes
+
+
+def export_series(
+    template,
+    volume,
+    output_folder,
+    geometry=None,
+    num_workers=None,
+    slices_per_task=16,
+    first_instance_number=1,
+    file_name=DEFAULT_FILE_NAME,
+):
+    """Export a volume as a series of single-frame instances from a pool of processes
+
+    All instances share the header of the template, e.g. a CTImage or
+    SCImage with the attributes of the series set and the pixel data of one
+    slice added. The volume is placed in shared memory once, or opened again
+    by the workers if it is a memmap, and the workers are given ranges of
+    slice indices only. Each worker writes its slices with a SeriesWriter.
+
+    The SOPInstanceUIDs are generated in this process, in slice order, and
+    the InstanceNumber is given by the slice index, so that the output does
+    not depend on the number of workers.
+
+    Usage:
+        ct_image = CTImage()
+        ct_image.create_empty_iod()
+        ct_image.initiate()
+        ...
+        ct_image.add_pixel_data(volume[0])
+        output_files = export_series(ct_image, volume, output_folder, geometry=geometry)
+
+    Arguments:
+        template {IOD} -- Instance holding the attributes shared by all slices
+        volume {3D np.array} -- The pixel data as (slices, rows, columns[, samples])
+        output_folder {str} -- Folder to write the instances to
+
+    Keyword Arguments:
+        geometry {VolumeGeometry} -- Geometry of the volume, used to set ImagePositionPatient of each slice
+                                     (default: {None, only valid for IODs without ImagePositionPatient})
+        num_workers {int} -- Number of worker processes (default: {number of CPUs})
+        slices_per_task {int} -- Number of slices written by a worker per task (default: {16})
+        first_instance_number {int} -- InstanceNumber of the first slice (default: {1})
+        file_name {str} -- Name of each file, formatted with the instance number (default: {DEFAULT_FILE_NAME})
+
+    Returns:
+        list -- Paths of the written files, in slice order
+    """
+    number_of_slices = len(volume)
+    writer = SeriesWriter(template)
+    keywords = writer.varying_keywords
+    if "PixelData" not in keywords:
+        raise ValueError("The template has no pixel data")
+    template_pixel_data = template.dataset.PixelData
+    if number_of_slices and len(template_pixel_data) != volume[0].nbytes:
+        raise ValueError(
+            f"A slice of the volume has {volume[0].nbytes} bytes, "
+            f"the pixel data of the template {len(template_pixel_data)} bytes"
+        )
+    positions = None
+    if "ImagePositionPatient" in keywords:
+        if geometry is None:
+            raise ValueError(
+                "The geometry of the volume is needed to set ImagePositionPatient"
+            )
+        frame_indices = np.zeros((number_of_slices, 3))
+        frame_indices[:, 2] = np.arange(number_of_slices)
+        positions = _as_ds(geometry.voxel_to_patient(frame_indices))
+
+    output_files = list()
+    instance_values = list()
+    for ind in range(number_of_slices):
+        instance_number = first_instance_number + ind
+        output_files.append(
+            os.path.join(output_folder, file_name.format(instance_number))
+        )
+        values = dict()
+        if "SOPInstanceUID" in keywords:
+            values["SOPInstanceUID"] = generate_uid()
+        if "InstanceNumber" in keywords:
+            values["InstanceNumber"] = str(instance_number)
+        if positions is not None:
+            values["ImagePositionPatient"] = positions[ind]
+        instance_values.append(values)
+    os.makedirs(output_folder, exist_ok=True)
+
+    slices_per_task = max(1, slices_per_task)
+    tasks = [
+        (
+            start,
+            output_files[start : start + slices_per_task],
+            instance_values[start : start + slices_per_task],
+        )
+        for start in range(0, number_of_slices, slices_per_task)
+    ]
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(tasks) <= 1:
+        previous_state = _set_state(writer, volume)
+        try:
+            for task in tasks:
+                _write_slices(task)
+        finally:
+            _set_state(*previous_state)
+        return output_files
+
+    # the workers get the header only, with empty pixel data
+    template_bytes = writer.to_bytes(PixelData=b"")
+    shm, volume_source = _share_volume(volume)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(num_workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(template_bytes, keywords, volume_source),
+        ) as executor:
+            list(executor.map(_write_slices, tasks))
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    return output_files
@@ -0,0 +1,175 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pydicom import dcmread
+
+"""Tags read from each file to sort and identify the slices of a series
+"""
+GEOMETRY_TAGS = [
+    "SOPClassUID",
+    "SOPInstanceUID",
+    "SeriesInstanceUID",
+    "InstanceNumber",
+    "ImagePositionPatient",
+    "ImageOrientationPatient",
+    "SliceThickness",
+    "PixelSpacing",
+    "Rows",
+    "Columns",
+]
+
+"""Number of files below which headers are read in this process by default,
+since starting worker processes takes longer than reading a short series
+"""
+SERIAL_READ_THRESHOLD = 256
+
+
+class SliceHandle:
+    """Lightweight handle of one slice of a series
+
+    Only the geometry tags are read up front. Any other attribute, and the
+    pixel data, is read from the file on first access.
+    """
+
+    __slots__ = ("dcm_file", "header", "slice_position", "_dataset")
+
+    def __init__(self, dcm_file, header, slice_position):
+        self.dcm_file = dcm_file
+        self.header = header
+        self.slice_position = slice_position
+        self._dataset = None
+
+    @property
+    def dataset(self):
+        """The complete data set, read on first access"""
+        if self._dataset is None:
+            self._dataset = dcmread(self.dcm_file, force=True)
+        return self._dataset
+
+    @property
+    def pixel_array(self):
+        return self.dataset.pixel_array
+
+    def __getattr__(self, name):
+        if name in SliceHandle.__slots__:
+            raise AttributeError(name)
+        if name in self.header:
+            return getattr(self.header, name)
+        return getattr(self.dataset, name)
+
+    def __repr__(self):
+        return f"SliceHandle({self.dcm_file!r}, slice_position={self.slice_position})"
+
+
+class DicomSeries:
+    """Slices of a series sorted by their position along the slice normal"""
+
+    def __init__(self, slices):
+        self.slices = slices
+
+    @property
+    def dcm_files(self):
+        return [dcm_slice.dcm_file for dcm_slice in self.slices]
+
+    @property
+    def slice_positions(self):
+        return np.array([dcm_slice.slice_position for dcm_slice in self.slices])
+
+    def get_pixel_volume(self):
+        """Read the pixel data of all slices into one array, slices first"""
+        volume = None
+        for ind, dcm_slice in enumerate(self.slices):
+            pixel_array = dcm_slice.pixel_array
+            if volume is None:
+                volume = np.empty(
+                    (len(self.slices),) + pixel_array.shape, dtype=pixel_array.dtype
+                )
+            volume[ind] = pixel_array
+        return volume
+
+    def __len__(self):
+        return len(self.slices)
+
+    def __getitem__(self, index):
+        return self.slices[index]
+
+    def __iter__(self):
+        return iter(self.slices)
+
+    def __repr__(self):
+        return f"DicomSeries({len(self.slices)} slices)"
+
+
+def _read_geometry(dcm_file):
+    return dcmread(
+        dcm_file, stop_before_pixels=True, specific_tags=GEOMETRY_TAGS, force=True
+    )
+
+
+def read_geometry(dcm_files, num_workers=None):
+    """Read the geometry tags of DICOM files in parallel, without pixel data
+
+    Arguments:
+        dcm_files {list} -- List of file paths
+
+    Keyword Arguments:
+        num_workers {int} -- Number of worker processes (default: {None, one for fewer files
+                             than SERIAL_READ_THRESHOLD, otherwise the number of CPUs})
+
+    Returns:
+        list -- Headers in the same order as dcm_files
+    """
+    if num_workers is None and len(dcm_files) < SERIAL_READ_THRESHOLD:
+        num_workers = 1
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(dcm_files) <= 1:
+        return [_read_geometry(dcm_file) for dcm_file in dcm_files]
+    chunksize = max(1, min(256, len(dcm_files) // (num_workers * 4)))
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(_read_geometry, dcm_files, chunksize=chunksize))
+
+
+def load_series(dcm_files, num_workers=None):
+    """Read and sort the slices of a series by their position in the patient
+
+    Slices are sorted by the projection of ImagePositionPatient onto the slice
+    normal, i.e. the cross product of the row and column directions, in
+    ascending order. Slices at the same position are ordered by InstanceNumber.
+
+    Arguments:
+        dcm_files {list} -- List of file paths
+
+    Keyword Arguments:
+        num_workers {int} -- Number of worker processes reading headers, see read_geometry
+                             (default: {None})
+
+    Returns:
+        DicomSeries -- Sorted slices, with pixel data loaded on first access
+    """
+    dcm_files = list(dcm_files)
+    if not dcm_files:
+        return DicomSeries(list())
+    headers = read_geometry(dcm_files, num_workers=num_workers)
+    for dcm_file, header in zip(dcm_files, headers):
+        for keyword in ("ImagePositionPatient", "ImageOrientationPatient"):
+            if keyword not in header:
+                raise ValueError(f"{dcm_file} has no {keyword}")
+    positions = np.array(
+        [header.ImagePositionPatient for header in headers], dtype=np.float64
+    )
+    orientations = np.array(
+        [header.ImageOrientationPatient for header in headers], dtype=np.float64
+    )
+    normals = np.cross(orientations[:, 0:3], orientations[:, 3:6])
+    slice_positions = np.einsum("ij,ij->i", normals, positions)
+    instance_numbers = np.array(
+        [int(header.get("InstanceNumber") or 0) for header in headers]
+    )
+    order = np.lexsort((instance_numbers, slice_positions))
+    return DicomSeries(
+        [
+            SliceHandle(dcm_files[ind], headers[ind], float(slice_positions[ind]))
+            for ind in order
+        ]
+    )
@@ -0,0 +1,274 @@
+import bisect
+import copy
+import struct
+
+from pydicom import DataElement, Dataset
+from pydicom.charset import default_encoding
+from pydicom.dataset import FileMetaDataset
+from pydicom.filebase import DicomBytesIO
+from pydicom.filewriter import (
+    correct_ambiguous_vr,
+    write_data_element,
+    write_file_meta_info,
+)
+from pydicom.tag import Tag
+from pydicom.uid import ExplicitVRLittleEndian, ImplicitVRLittleEndian
+
+"""Elements that differ between the slices of a series by default, those
+present in the template are used
+"""
+DEFAULT_VARYING_KEYWORDS = (
+    "SOPInstanceUID",
+    "InstanceNumber",
+    "ImagePositionPatient",
+    "PixelData",
+)
+
+"""Transfer syntaxes whose data set can be encoded element by element
+"""
+SUPPORTED_TRANSFER_SYNTAXES = (ExplicitVRLittleEndian, ImplicitVRLittleEndian)
+
+_FILE_META_GROUP_LENGTH = Tag(0x0002, 0x0000)
+_MEDIA_STORAGE_SOP_INSTANCE_UID = Tag(0x0002, 0x0003)
+_SOP_INSTANCE_UID = Tag(0x0008, 0x0018)
+_PIXEL_DATA = Tag(0x7FE0, 0x0010)
+
+
+def _new_buffer(is_implicit_VR=False):
+    fp = DicomBytesIO()
+    fp.is_little_endian = True
+    fp.is_implicit_VR = is_implicit_VR
+    return fp
+
+
+class SeriesWriter:
+    """Writes the instances of a series from a header encoded once
+
+    Most of the header of the slices of a series, e.g. the patient, study,
+    series, equipment, frame of reference and image pixel modules, is the
+    same for every slice. These elements are encoded to bytes once, from a
+    template instance, in tag order. For each instance only the varying
+    elements are encoded and spliced in between the pre-encoded bytes, which
+    gives the same file as dcmwrite of the template with the varying
+    elements replaced.
+
+    The MediaStorageSOPInstanceUID of the file meta information follows the
+    SOPInstanceUID of each instance, if SOPInstanceUID is varying.
+
+    Usage:
+        writer = SeriesWriter(first_ct_image)
+        for ind, slice_array in enumerate(volume):
+            writer.write(
+                output_files[ind],
+                SOPInstanceUID=generate_uid(),
+                InstanceNumber=str(ind + 1),
+                ImagePositionPatient=positions[ind],
+                PixelData=slice_array,
+            )
+    """
+
+    def __init__(self, template, varying_keywords=None):
+        """
+        Arguments:
+            template {IOD or FileDataset} -- Instance holding the elements shared by all instances
+
+        Keyword Arguments:
+            varying_keywords {[str]} -- Keywords of the elements given per instance
+                                        (default: {those of DEFAULT_VARYING_KEYWORDS in the template})
+        """
+        if not isinstance(template, Dataset):
+            template.materialize()
+            template = template.dataset
+        file_meta = getattr(template, "file_meta", None)
+        if file_meta is None or "TransferSyntaxUID" not in file_meta:
+            raise ValueError("The template must have a transfer syntax")
+        if file_meta.TransferSyntaxUID not in SUPPORTED_TRANSFER_SYNTAXES:
+            raise ValueError(
+                f"Unsupported transfer syntax {file_meta.TransferSyntaxUID}, "
+                "only uncompressed little endian transfer syntaxes are supported"
+            )
+        self.is_implicit_VR = file_meta.TransferSyntaxUID.is_implicit_VR
+        # shallow copies of the elements, so that resolving ambiguous VRs,
+        # as dcmwrite does, leaves the template untouched
+        dataset = Dataset()
+        dataset.is_little_endian = True
+        dataset.is_implicit_VR = self.is_implicit_VR
+        for elem in template:
+            if elem.tag.group > 0x0002:
+                dataset.add(copy.copy(elem))
+        dataset = correct_ambiguous_vr(dataset, True)
+        self.encodings = dataset.get("SpecificCharacterSet", default_encoding)
+
+        if varying_keywords is None:
+            varying_keywords = [
+                keyword for keyword in DEFAULT_VARYING_KEYWORDS if keyword in dataset
+            ]
+        self.varying_tags = list()
+        self._varying_VRs = dict()
+        self._default_values = dict()
+        for keyword in varying_keywords:
+            if keyword not in dataset:
+                raise ValueError(f"The template has no {keyword} element")
+            elem = dataset[keyword]
+            self.varying_tags.append(elem.tag)
+            self._varying_VRs[elem.tag] = elem.VR
+            self._default_values[keyword] = self._encode_element(elem)
+        self.varying_tags.sort()
+        self._keywords = {tag: dataset[tag].keyword for tag in self.varying_tags}
+        self.varying_keywords = [self._keywords[tag] for tag in self.varying_tags]
+        self._template_sop_instance_uid = dataset.get("SOPInstanceUID")
+
+        # the invariant elements between two varying elements form one segment
+        invariant_tags = sorted(
+            tag
+            for tag in dataset.keys()
+            if tag not in self._varying_VRs and not (tag.element == 0 and tag.group > 6)
+        )
+        boundaries = [bisect.bisect(invariant_tags, tag) for tag in self.varying_tags]
+        self._segments = list()
+        for start, end in zip([0] + boundaries, boundaries + [len(invariant_tags)]):
+            fp = _new_buffer(self.is_implicit_VR)
+            for tag in invariant_tags[start:end]:
+                write_data_element(fp, dataset[tag], self.encodings)
+            self._segments.append(fp.getvalue())
+
+        self._encode_file_meta(template)
+
+    def _encode_file_meta(self, template):
+        """Encode the preamble and file meta information around the media storage SOP instance UID"""
+        file_meta = FileMetaDataset(
+            {tag: copy.copy(elem) for tag, elem in template.file_meta.items()}
+        )
+        # as done by dcmwrite
+        if "SOPClassUID" in template:
+            file_meta.MediaStorageSOPClassUID = template.SOPClassUID
+        if "SOPInstanceUID" in template:
+            file_meta.MediaStorageSOPInstanceUID = template.SOPInstanceUID
+        # fills in the required file meta elements as dcmwrite does
+        write_file_meta_info(_new_buffer(), file_meta, enforce_standard=True)
+        self._vary_media_storage_uid = _SOP_INSTANCE_UID in self._varying_VRs
+        prefix = _new_buffer()
+        suffix = _new_buffer()
+        for tag in sorted(file_meta.keys()):
+            if tag == _FILE_META_GROUP_LENGTH:
+                continue
+            if tag == _MEDIA_STORAGE_SOP_INSTANCE_UID and self._vary_media_storage_uid:
+                continue
+            fp = prefix if tag < _MEDIA_STORAGE_SOP_INSTANCE_UID else suffix
+            write_data_element(fp, file_meta[tag])
+        preamble = getattr(template, "preamble", None) or b"\x00" * 128
+        self._preamble = preamble + b"DICM"
+        self._file_meta_prefix = prefix.getvalue()
+        self._file_meta_suffix = suffix.getvalue()
+
+    def _encode_element(self, elem):
+        fp = _new_buffer(self.is_implicit_VR)
+        write_data_element(fp, elem, self.encodings)
+        return fp.getvalue()
+
+    def _encode_value(self, tag, value):
+        if tag == _PIXEL_DATA:
+            return self._encode_pixel_data(value)
+        return [self._encode_element(DataElement(tag, self._varying_VRs[tag], value))]
+
+    def _encode_pixel_data(self, value):
+        """Header of the pixel data element followed by the pixel data itself, uncopied"""
+        if hasattr(value, "tobytes") and not isinstance(value, (bytes, bytearray)):
+            # a numpy array, written through a view of its buffer
+            if not value.flags.c_contiguous:
+                value = value.copy(order="C")
+            value = memoryview(value).cast("B")
+        length = len(value)
+        padding = b"\x00" if length % 2 else b""
+        if self.is_implicit_VR:
+            header = struct.pack("<HHI", 0x7FE0, 0x0010, length + len(padding))
+        else:
+            header = struct.pack(
+                "<HH2sHI",
+                0x7FE0,
+                0x0010,
+                self._varying_VRs[_PIXEL_DATA].encode(),
+                0,
+                length + len(padding),
+            )
+        return [header, value, padding] if padding else [header, value]
+
+    def _file_meta(self, sop_instance_uid):
+        if self._vary_media_storage_uid:
+            fp = _new_buffer()
+            write_data_element(
+                fp, DataElement(_MEDIA_STORAGE_SOP_INSTANCE_UID, "UI", sop_instance_uid)
+            )
+            media_storage_uid = fp.getvalue()
+        else:
+            media_storage_uid = b""
+        group_length = (
+            len(self._file_meta_prefix)
+            + len(media_storage_uid)
+            + len(self._file_meta_suffix)
+        )
+        return [
+            self._preamble,
+            struct.pack("<HH2sHI", 0x0002, 0x0000, b"UL", 4, group_length),
+            self._file_meta_prefix,
+            media_storage_uid,
+            self._file_meta_suffix,
+        ]
+
+    def encode(self, **values):
+        """Encode one instance as a sequence of byte chunks
+
+        Varying elements not given keep the value of the template.
+
+        Arguments:
+            values {dict} -- Values of the varying elements, by keyword
+
+        Returns:
+            list -- Chunks of bytes (or memoryviews) that concatenated form the file
+        """
+        unknown = set(values) - set(self._default_values)
+        if unknown:
+            raise ValueError(f"Not varying elements: {sorted(unknown)}")
+        sop_instance_uid = values.get("SOPInstanceUID")
+        if sop_instance_uid is None and self._vary_media_storage_uid:
+            sop_instance_uid = self._template_sop_instance_uid
+        chunks = self._file_meta(sop_instance_uid)
+        for segment, tag in zip(self._segments, self.varying_tags):
+            chunks.append(segment)
+            keyword = self._keywords[tag]
+            if keyword in values:
+                chunks.extend(self._encode_value(tag, values[keyword]))
+            else:
+                chunks.append(self._default_values[keyword])
+        chunks.append(self._segments[-1])
+        return chunks
+
+    def to_bytes(self, **values):
+        """Encode one instance as bytes
+
+        Arguments:
+            values {dict} -- Values of the varying elements, by keyword
+
+        Returns:
+            bytes -- The encoded file
+        """
+        return b"".join(self.encode(**values))
+
+    def write(self, output_file, **values):
+        """Write one instance to file
+
+        Arguments:
+            output_file {str or file-like} -- Complete path of file, or file-like object, to write to
+            values {dict} -- Values of the varying elements, by keyword
+
+        Returns:
+            int -- Number of bytes written
+        """
+        chunks = self.encode(**values)
+        if hasattr(output_file, "write"):
+            for chunk in chunks:
+                output_file.write(chunk)
+        else:
+            with open(output_file, "wb") as fp:
+                fp.writelines(chunks)
+        return sum(len(chunk) for chunk in chunks)
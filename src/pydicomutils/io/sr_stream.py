@@ -0,0 +1,185 @@
+from pydicom.charset import default_encoding
+from pydicom.filebase import DicomFileLike
+from pydicom.filewriter import write_data_element, write_dataset
+from pydicom.tag import ItemDelimiterTag, ItemTag, SequenceDelimiterTag, Tag
+from pydicom.uid import ExplicitVRLittleEndian
+
+from ..profiling import is_profiling, record_bytes
+from .deflate import (
+    DEFAULT_DEFLATE_LEVEL,
+    DEFAULT_DEFLATE_THRESHOLD,
+    _DeflateStream,
+    write_file_header,
+)
+
+_CONTENT_SEQUENCE = Tag(0x0040, 0xA730)
+_UNDEFINED_LENGTH = 0xFFFFFFFF
+
+
+class _CountingStream:
+    """File-like object counting the bytes written to the output, which
+    need not be seekable, e.g. a pipe or socket
+    """
+
+    def __init__(self, output):
+        self._output = output
+        self._written = 0
+
+    def write(self, data):
+        self._written += len(data)
+        self._output.write(data)
+
+    def tell(self):
+        return self._written
+
+    def close(self):
+        # the output is closed by the caller
+        pass
+
+
+def _write_elements(fp, dataset, encodings, before_content_sequence):
+    """Write the elements of dataset before, or after, the Content Sequence"""
+    for tag in sorted(dataset.keys()):
+        if tag == _CONTENT_SEQUENCE or (tag.element == 0 and tag.group > 6):
+            continue
+        if (tag < _CONTENT_SEQUENCE) == before_content_sequence:
+            write_data_element(fp, dataset[tag], encodings)
+
+
+def _start_sequence(fp, tag):
+    fp.write_tag(tag)
+    fp.write(b"SQ\x00\x00")
+    fp.write_UL(_UNDEFINED_LENGTH)
+
+
+def _end_sequence(fp):
+    fp.write_tag(SequenceDelimiterTag)
+    fp.write_UL(0)
+
+
+def _start_item(fp):
+    fp.write_tag(ItemTag)
+    fp.write_UL(_UNDEFINED_LENGTH)
+
+
+def _end_item(fp):
+    fp.write_tag(ItemDelimiterTag)
+    fp.write_UL(0)
+
+
+def _write_item(fp, item, encodings):
+    """Write a content item, with its children, as an item of undefined length"""
+    _start_item(fp)
+    write_dataset(fp, item.to_dataset(), encodings)
+    _end_item(fp)
+
+
+def _write_streamed_container(fp, container, measurement_groups, encodings):
+    """Write the container with its children followed by the measurement groups
+
+    Returns:
+        int -- Number of measurement groups written from measurement_groups
+    """
+    # the container without children, its Content Sequence is written here
+    children = container.children
+    container.children = None
+    try:
+        dataset = container.to_dataset()
+    finally:
+        container.children = children
+    _start_item(fp)
+    _write_elements(fp, dataset, encodings, True)
+    _start_sequence(fp, _CONTENT_SEQUENCE)
+    for item in children or ():
+        _write_item(fp, item, encodings)
+    number_of_groups = 0
+    for item in measurement_groups:
+        _write_item(fp, item, encodings)
+        number_of_groups += 1
+    _end_sequence(fp)
+    _write_elements(fp, dataset, encodings, False)
+    _end_item(fp)
+    return number_of_groups
+
+
+def write_streaming_report(
+    output_file,
+    sr,
+    measurement_groups=(),
+    deflate=False,
+    deflate_level=DEFAULT_DEFLATE_LEVEL,
+    deflate_threshold=DEFAULT_DEFLATE_THRESHOLD,
+):
+    """Write a TID 1500 report, streaming the measurement groups from an iterable
+
+    The header of the report is written first, followed by the content tree
+    of the report, with each Content Sequence, and each of its items, written
+    with undefined length and closed by a delimiter. The measurement groups
+    of the report are followed by those of measurement_groups, which are
+    converted and written one at a time, as they are produced, so that only
+    one measurement group is held in memory whatever the size of the report.
+
+    The report itself is left as is, the streamed groups are not added to it.
+
+    Usage:
+        def groups(cursor):
+            for rows in cursor:
+                yield from enhanced_sr.create_measurement_groups(rows, ...)
+
+        write_streaming_report(output_file, enhanced_sr, groups(cursor))
+
+    Arguments:
+        output_file {str or file-like} -- Complete path of file, or file-like object opened
+                                          for binary writing, which need not be seekable
+        sr {EnhancedSRTID1500 or Comprehensive3DSRTID1500} -- Initiated report
+
+    Keyword Arguments:
+        measurement_groups {iterable} -- Measurement groups, as ContentItems, to add (default: {()})
+        deflate {bool or str} -- Write with the Deflated Explicit VR Little Endian transfer syntax,
+                                 True, False or "auto" (default: {False})
+        deflate_level {int} -- zlib compression level (default: {DEFAULT_DEFLATE_LEVEL})
+        deflate_threshold {int} -- Size in bytes above which the report is deflated,
+                                   if deflate is "auto" (default: {DEFAULT_DEFLATE_THRESHOLD})
+
+    Returns:
+        int -- Number of measurement groups written from measurement_groups
+    """
+    if deflate not in (True, False, "auto"):
+        raise ValueError(f"deflate must be True, False or 'auto', got {deflate!r}")
+    if sr.content is None:
+        raise ValueError("The report has no content, initiate it first")
+    if not hasattr(output_file, "write"):
+        with open(output_file, "wb") as fp:
+            return write_streaming_report(
+                fp, sr, measurement_groups, deflate, deflate_level, deflate_threshold
+            )
+    output = output_file
+    dataset = sr.dataset
+    if deflate:
+        threshold = deflate_threshold if deflate == "auto" else None
+        stream = _DeflateStream(output, dataset, deflate_level, threshold)
+    else:
+        write_file_header(output, dataset, ExplicitVRLittleEndian)
+        stream = _CountingStream(output)
+    fp = DicomFileLike(stream)
+    fp.is_little_endian = True
+    fp.is_implicit_VR = False
+    encodings = dataset.get("SpecificCharacterSet", default_encoding)
+
+    _write_elements(fp, dataset, encodings, True)
+    _start_sequence(fp, _CONTENT_SEQUENCE)
+    number_of_groups = 0
+    for item in sr.content:
+        if item is sr.imaging_measurements:
+            number_of_groups = _write_streamed_container(
+                fp, item, measurement_groups, encodings
+            )
+        else:
+            _write_item(fp, item, encodings)
+    _end_sequence(fp)
+    _write_elements(fp, dataset, encodings, False)
+    if deflate:
+        stream.close()
+    if is_profiling():
+        record_bytes("write_streaming_report", stream.tell())
+    return number_of_groups
@@ -0,0 +1,266 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pydicom import DataElement, dcmread
+from pydicom.multival import MultiValue
+from pydicom.tag import Tag
+
+from ..uid_generator import generate_uid
+from .header_patcher import patch_header
+
+# Old to new UID map shared by all tasks of a worker process, set by _init_worker
+_uid_map = None
+
+
+class TagRewriteReport:
+    """Outcome of a bulk tag rewrite, or of a dry run of one"""
+
+    def __init__(self, dry_run, uid_map=None):
+        self.dry_run = dry_run
+        self.uid_map = uid_map if uid_map is not None else dict()
+        self.changes = dict()
+        self.errors = dict()
+        self.number_of_files = 0
+        self.elapsed_time = 0.0
+
+    @property
+    def files_per_second(self):
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.number_of_files / self.elapsed_time
+
+    def as_dict(self):
+        return {
+            "dry_run": self.dry_run,
+            "number_of_files": self.number_of_files,
+            "number_of_changed_files": len(self.changes),
+            "number_of_errors": len(self.errors),
+            "number_of_replaced_uids": len(self.uid_map),
+            "elapsed_time": self.elapsed_time,
+            "files_per_second": self.files_per_second,
+        }
+
+    def __repr__(self):
+        return f"TagRewriteReport({self.as_dict()})"
+
+
+def find_dicom_files(folder, pattern="*.dcm"):
+    """Search folder (and subfolders) for DICOM files
+
+    Arguments:
+        folder {str} -- Folder to (recursively) search
+
+    Keyword Arguments:
+        pattern {str} -- File name pattern of DICOM files (default: {"*.dcm"})
+
+    Returns:
+        list -- Sorted list of file paths
+    """
+    return sorted(glob.glob(os.path.join(folder, "**", pattern), recursive=True))
+
+
+def _as_files(folder_or_files):
+    if isinstance(folder_or_files, str):
+        return find_dicom_files(folder_or_files)
+    return list(folder_or_files)
+
+
+def _init_worker(uid_map):
+    global _uid_map
+    _uid_map = uid_map
+
+
+def _run(func, tasks, num_workers, uid_map=None):
+    """Run func on each task in a process pool, yielding results in task order"""
+    if num_workers == 1 or len(tasks) <= 1:
+        previous_uid_map = _uid_map
+        _init_worker(uid_map)
+        try:
+            for task in tasks:
+                yield func(task)
+        finally:
+            _init_worker(previous_uid_map)
+        return
+    num_workers = num_workers or os.cpu_count() or 1
+    # large chunks amortise the cost of pickling tasks and results
+    chunksize = max(1, min(256, len(tasks) // (num_workers * 4)))
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_worker, initargs=(uid_map,)
+    ) as executor:
+        yield from executor.map(func, tasks, chunksize=chunksize)
+
+
+def _read_tag_values(task):
+    dcm_file, tags = task
+    try:
+        ds = dcmread(
+            dcm_file, stop_before_pixels=True, specific_tags=list(tags), force=True
+        )
+        values = {tag: ds[tag].value if tag in ds else None for tag in tags}
+        return dcm_file, values, None
+    except Exception as e:
+        return dcm_file, None, f"{type(e).__name__}: {e}"
+
+
+def _replace_uids(ds, uid_map, changes):
+    """Replace the UI values found in uid_map, also in nested sequences"""
+    for elem in ds.iterall():
+        if elem.VR != "UI" or not elem.value:
+            continue
+        if isinstance(elem.value, MultiValue):
+            if any(value in uid_map for value in elem.value):
+                old_value = list(elem.value)
+                elem.value = [uid_map.get(value, value) for value in old_value]
+                changes.append((elem.keyword or str(elem.tag), old_value, elem.value))
+        elif elem.value in uid_map:
+            old_value = elem.value
+            elem.value = uid_map[old_value]
+            changes.append((elem.keyword or str(elem.tag), old_value, elem.value))
+
+
+def _rewrite_file(task):
+    """Apply the shared UID map and the per file element values to one file
+
+    task is (dcm_file, elements, dry_run), where elements is a list of
+    (tag, VR, value) to set regardless of the current value. Only the header
+    of the file is read and, unless dry_run, patched.
+    """
+    dcm_file, elements, dry_run = task
+    changes = list()
+
+    def apply_changes(ds):
+        if _uid_map:
+            _replace_uids(ds, _uid_map, changes)
+            if getattr(ds, "file_meta", None) is not None:
+                _replace_uids(ds.file_meta, _uid_map, changes)
+        for tag, VR, value in elements:
+            old_value = ds[tag].value if tag in ds else None
+            if old_value == value:
+                continue
+            ds[tag] = DataElement(tag, VR, value)
+            changes.append((ds[tag].keyword or str(Tag(tag)), old_value, value))
+
+    try:
+        if dry_run:
+            apply_changes(dcmread(dcm_file, stop_before_pixels=True, force=True))
+        else:
+            patch_header(dcm_file, apply_changes)
+        return dcm_file, changes, None
+    except Exception as e:
+        return dcm_file, changes, f"{type(e).__name__}: {e}"
+
+
+def _rewrite(dcm_files, per_file_elements, dry_run, num_workers, uid_map, report):
+    tasks = [
+        (dcm_file, per_file_elements.get(dcm_file, []), dry_run)
+        for dcm_file in dcm_files
+        if dcm_file not in report.errors
+    ]
+    for dcm_file, changes, error in _run(_rewrite_file, tasks, num_workers, uid_map):
+        if changes:
+            report.changes[dcm_file] = changes
+        if error is not None:
+            report.errors[dcm_file] = error
+
+
+def create_new_uids(
+    folder_or_files, dicom_tags, dry_run=True, num_workers=None, update_references=False
+):
+    """Create new UIDs for the specified DICOM tags in a set of DICOM files
+
+    All files are first scanned in parallel, reading their headers only, to
+    collect the UIDs to replace. Each distinct old UID is then mapped to one
+    new UID, and the map is shared with all worker processes, so that files
+    of the same study or series still share their new UIDs. Files missing a
+    tag are given a new unique UID for it.
+
+    Arguments:
+        folder_or_files {str or list} -- Folder to (recursively) search for DICOM files, or list of files
+        dicom_tags {list} -- DICOM tags to create new UIDs for, e.g. ["0x0020000D"] or ["StudyInstanceUID"]
+
+    Keyword Arguments:
+        dry_run {bool} -- Only report what would be changed, without reading pixel data (default: {True})
+        num_workers {int} -- Number of worker processes (default: {number of CPUs})
+        update_references {bool} -- Also replace the old UIDs in every other UI element they occur
+                                    in, e.g. in referenced SOP sequences and the file meta information,
+                                    to keep references between files intact (default: {False}, only
+                                    the elements of dicom_tags are changed)
+
+    Returns:
+        TagRewriteReport -- Report of changed values and errors per file
+    """
+    start_time = time.perf_counter()
+    dcm_files = _as_files(folder_or_files)
+    if isinstance(dicom_tags, (str, int)):
+        dicom_tags = [dicom_tags]
+    tags = tuple(Tag(dicom_tag) for dicom_tag in dicom_tags)
+    uid_map = dict()
+    report = TagRewriteReport(dry_run, uid_map)
+    per_file_elements = dict()
+    for dcm_file, values, error in _run(
+        _read_tag_values, [(dcm_file, tags) for dcm_file in dcm_files], num_workers
+    ):
+        if error is not None:
+            report.errors[dcm_file] = error
+            continue
+        for tag, value in values.items():
+            # UIDs are generated in this process only, so that they stay
+            # unique, and reproducible with a deterministic UID generator
+            if not value:
+                per_file_elements.setdefault(dcm_file, []).append(
+                    (tag, "UI", generate_uid())
+                )
+            elif value not in uid_map:
+                uid_map[value] = generate_uid()
+            if value and not update_references:
+                per_file_elements.setdefault(dcm_file, []).append(
+                    (tag, "UI", uid_map[value])
+                )
+    _rewrite(
+        dcm_files,
+        per_file_elements,
+        dry_run,
+        num_workers,
+        uid_map if update_references else None,
+        report,
+    )
+    report.number_of_files = len(dcm_files)
+    report.elapsed_time = time.perf_counter() - start_time
+    return report
+
+
+def set_dicom_tag(
+    folder_or_files, dicom_tag, VR, value, dry_run=True, num_workers=None
+):
+    """Set the value of a DICOM tag in a set of DICOM files
+
+    Arguments:
+        folder_or_files {str or list} -- Folder to (recursively) search for DICOM files, or list of files
+        dicom_tag {str or int} -- DICOM tag to set value for, e.g. "0x00100010" or "PatientName"
+        VR {str} -- Value representation of the DICOM tag, needed in case the DICOM tag is missing
+        value {} -- Value to set
+
+    Keyword Arguments:
+        dry_run {bool} -- Only report what would be changed, without reading pixel data (default: {True})
+        num_workers {int} -- Number of worker processes (default: {number of CPUs})
+
+    Returns:
+        TagRewriteReport -- Report of changed values and errors per file
+    """
+    start_time = time.perf_counter()
+    dcm_files = _as_files(folder_or_files)
+    report = TagRewriteReport(dry_run)
+    elements = [(Tag(dicom_tag), VR, value)]
+    _rewrite(
+        dcm_files,
+        {dcm_file: elements for dcm_file in dcm_files},
+        dry_run,
+        num_workers,
+        None,
+        report,
+    )
+    report.number_of_files = len(dcm_files)
+    report.elapsed_time = time.perf_counter() - start_time
+    return report
@@ -0,0 +1,226 @@
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+_profiler = None
+
+
+class PhaseStats:
+    """Accumulated wall time, number of calls and bytes for one phase"""
+
+    __slots__ = ("calls", "total_time", "max_time", "bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.bytes = 0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+            "bytes": self.bytes,
+        }
+
+    def __repr__(self):
+        return f"PhaseStats({self.as_dict()})"
+
+
+class Profiler:
+    """Collects per-phase timings while active
+
+    Phases are named after the instrumented function, e.g. "IOD.write_to_file"
+    or "GSPS.add_graphic_object". Times are inclusive, i.e. the time of
+    "GSPS.initiate" includes the time spent in "IOD.initiate" and in reading
+    referenced files. Recursive calls of the same phase are only counted once.
+    """
+
+    def __init__(self):
+        self.phases = dict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _enter(self, phase):
+        depths = getattr(self._local, "depths", None)
+        if depths is None:
+            depths = self._local.depths = dict()
+        depth = depths.get(phase, 0)
+        depths[phase] = depth + 1
+        return depth == 0
+
+    def _exit(self, phase):
+        self._local.depths[phase] -= 1
+
+    def record(self, phase, elapsed_time=0.0, number_of_bytes=0, calls=1):
+        """Record a call of a phase
+
+        Arguments:
+            phase {str} -- Name of phase
+
+        Keyword Arguments:
+            elapsed_time {float} -- Wall time in seconds (default: {0.0})
+            number_of_bytes {int} -- Number of bytes read or written (default: {0})
+            calls {int} -- Number of calls to add (default: {1})
+        """
+        with self._lock:
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats()
+            stats.calls += calls
+            stats.total_time += elapsed_time
+            stats.max_time = max(stats.max_time, elapsed_time)
+            stats.bytes += number_of_bytes
+
+    def as_dict(self):
+        with self._lock:
+            return {phase: stats.as_dict() for phase, stats in self.phases.items()}
+
+    def report(self):
+        """Get a human readable table of the collected phases, slowest first"""
+        lines = [f"{'phase':<60} {'calls':>8} {'total [s]':>12} {'bytes':>14}"]
+        for phase, stats in sorted(
+            self.as_dict().items(), key=lambda item: -item[1]["total_time"]
+        ):
+            lines.append(
+                f"{phase:<60} {stats['calls']:>8} {stats['total_time']:>12.6f} {stats['bytes']:>14}"
+            )
+        return "\n".join(lines)
+
+
+def is_profiling():
+    """Check if a profiler is currently active"""
+    return _profiler is not None
+
+
+def record_bytes(phase, number_of_bytes):
+    """Add a number of bytes to a phase of the active profiler, if any
+
+    Arguments:
+        phase {str} -- Name of phase
+        number_of_bytes {int} -- Number of bytes read or written
+    """
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record(phase, number_of_bytes=number_of_bytes, calls=0)
+
+
+def instrument(func=None, phase=None):
+    """Decorator recording the wall time and number of calls of a function
+
+    When no profiler is active, the only overhead is a check of a global.
+
+    Keyword Arguments:
+        phase {str} -- Name of phase (default: {qualified name of the function})
+    """
+    if func is None:
+        return functools.partial(instrument, phase=phase)
+    phase = phase or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _profiler
+        if profiler is None:
+            return func(*args, **kwargs)
+        if not profiler._enter(phase):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._exit(phase)
+        start_time = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler._exit(phase)
+            profiler.record(phase, time.perf_counter() - start_time)
+
+    return wrapper
+
+
+@contextmanager
+def profile(sink=None):
+    """Context manager activating instrumentation of all IOD builders
+
+    Usage:
+        with profile(sink=logging_sink()) as profiler:
+            gsps = GSPS()
+            ...
+        print(profiler.report())
+
+    Keyword Arguments:
+        sink {callable} -- Called with the profiler when the context is left (default: {None})
+    """
+    global _profiler
+    previous_profiler = _profiler
+    profiler = Profiler()
+    _profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _profiler = previous_profiler
+        if sink is not None:
+            sink(profiler)
+
+
+def logging_sink(logger=None, level=logging.INFO):
+    """Sink logging the report of the profiler
+
+    Keyword Arguments:
+        logger {logging.Logger} -- Logger to use (default: {logger of this module})
+        level {int} -- Log level (default: {logging.INFO})
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def sink(profiler):
+        logger.log(level, "pydicomutils profile\n%s", profiler.report())
+
+    return sink
+
+
+def to_prometheus_text(profiler, prefix="pydicomutils"):
+    """Format the collected phases in the Prometheus text exposition format
+
+    Arguments:
+        profiler {Profiler} -- Profiler to format
+
+    Keyword Arguments:
+        prefix {str} -- Prefix of metric names (default: {"pydicomutils"})
+    """
+    phases = profiler.as_dict()
+    metrics = [
+        ("phase_calls_total", "counter", "Number of calls per phase", "calls"),
+        ("phase_seconds_total", "counter", "Wall time per phase", "total_time"),
+        ("phase_seconds_max", "gauge", "Slowest call per phase", "max_time"),
+        ("phase_bytes_total", "counter", "Bytes read or written per phase", "bytes"),
+    ]
+    lines = list()
+    for name, metric_type, description, key in metrics:
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+        for phase in sorted(phases):
+            lines.append(f'{prefix}_{name}{{phase="{phase}"}} {phases[phase][key]}')
+    return "\n".join(lines) + "\n"
+
+
+def prometheus_sink(output, prefix="pydicomutils"):
+    """Sink writing the collected phases in the Prometheus text format
+
+    Arguments:
+        output {str or file-like} -- Path of file to write, or stream to write to
+
+    Keyword Arguments:
+        prefix {str} -- Prefix of metric names (default: {"pydicomutils"})
+    """
+
+    def sink(profiler):
+        text = to_prometheus_text(profiler, prefix=prefix)
+        if hasattr(output, "write"):
+            output.write(text)
+        else:
+            with open(output, "w") as f:
+                f.write(text)
+
+    return sink
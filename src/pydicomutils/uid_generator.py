@@ -0,0 +1,129 @@
+import itertools
+import os
+import secrets
+import threading
+
+from pydicom.uid import PYDICOM_ROOT_UID
+
+"""Maximum length of a UID, see DICOM PS3.5 section 9.1
+"""
+MAX_UID_LENGTH = 64
+
+"""Number of digits reserved for the counter part of generated UIDs
+"""
+COUNTER_DIGITS = 12
+
+
+class UIDGenerator:
+    """Generator of UIDs on the form <prefix><base>.<counter>
+
+    The base is drawn once per process from a cryptographically secure random
+    source, and the counter is incremented for each generated UID, which makes
+    UID generation a matter of formatting an integer. Collisions between
+    processes are avoided by the random base, which is redrawn whenever the
+    generator is used from a forked child process.
+
+    In deterministic mode the base is given by the seed instead, so that the
+    same sequence of UIDs is generated on each run, intended for reproducible
+    tests only. Forked child processes would then all generate the same UIDs,
+    so generating UIDs from a forked child raises in deterministic mode, they
+    are to be generated in the parent and passed to the children instead, as
+    export_series does.
+    """
+
+    def __init__(self, prefix=PYDICOM_ROOT_UID, deterministic=False, seed=0):
+        """
+        Keyword Arguments:
+            prefix {str} -- Organisational root, ending with a "." (default: {PYDICOM_ROOT_UID})
+            deterministic {bool} -- Generate a reproducible sequence of UIDs (default: {False})
+            seed {int} -- Base to use in deterministic mode (default: {0})
+        """
+        if not prefix.endswith("."):
+            raise ValueError("The UID prefix must end with a '.'")
+        if any(not component.isdigit() for component in prefix[:-1].split(".")):
+            raise ValueError(f"Invalid UID prefix {prefix}")
+        self.base_digits = MAX_UID_LENGTH - len(prefix) - 1 - COUNTER_DIGITS
+        if self.base_digits < 1:
+            raise ValueError(f"UID prefix {prefix} is too long")
+        self.prefix = prefix
+        self.deterministic = deterministic
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        if self.deterministic:
+            base = int(self.seed) % 10**self.base_digits
+        else:
+            # draw a base without leading zeros, as required for UID components
+            lower = 10 ** (self.base_digits - 1)
+            base = lower + secrets.randbelow(10**self.base_digits - lower)
+        self._root = f"{self.prefix}{base}."
+        self._counter = itertools.count(1)
+        self._pid = os.getpid()
+
+    def generate_uid(self):
+        """Generate a new UID
+
+        Returns:
+            str -- The generated UID
+        """
+        if self._pid != os.getpid():
+            if self.deterministic:
+                raise RuntimeError(
+                    "Deterministic UIDs cannot be generated in a forked child "
+                    "process, as all children would generate the same UIDs. "
+                    "Generate the UIDs in the parent process instead."
+                )
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+        # next() on itertools.count is atomic, so no lock is needed here
+        return f"{self._root}{next(self._counter)}"
+
+    def __call__(self):
+        return self.generate_uid()
+
+
+_uid_generator = UIDGenerator()
+
+
+def get_uid_generator():
+    """Get the UID generator used by all IOD builders"""
+    return _uid_generator
+
+
+def set_uid_generator(uid_generator):
+    """Set the UID generator used by all IOD builders
+
+    Arguments:
+        uid_generator {UIDGenerator} -- The UID generator to use
+    """
+    global _uid_generator
+    _uid_generator = uid_generator
+
+
+def configure_uid_generator(prefix=PYDICOM_ROOT_UID, deterministic=False, seed=0):
+    """Replace the UID generator used by all IOD builders with a new one
+
+    Keyword Arguments:
+        prefix {str} -- Organisational root, ending with a "." (default: {PYDICOM_ROOT_UID})
+        deterministic {bool} -- Generate a reproducible sequence of UIDs (default: {False})
+        seed {int} -- Base to use in deterministic mode (default: {0})
+
+    Returns:
+        UIDGenerator -- The new UID generator
+    """
+    set_uid_generator(
+        UIDGenerator(prefix=prefix, deterministic=deterministic, seed=seed)
+    )
+    return _uid_generator
+
+
+def generate_uid():
+    """Generate a new UID with the current UID generator
+
+    Returns:
+        str -- The generated UID
+    """
+    return _uid_generator.generate_uid()
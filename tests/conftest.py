@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+import pytest
+
+from pydicomutils.IODs.CTImage import CTImage
+
+"""Number of synthetic CT images available as references
+"""
+NUMBER_OF_REFERENCE_IMAGES = 4
+
+
+@pytest.fixture(scope="session")
+def reference_ct_files(tmp_path_factory):
+    """Synthetic CT series written to disk, used as referenced images"""
+    folder = tmp_path_factory.mktemp("reference_ct")
+    ct_files = list()
+    for ind in range(NUMBER_OF_REFERENCE_IMAGES):
+        ct_image = CTImage()
+        ct_image.create_empty_iod()
+        ct_image.initiate()
+        if ct_files:
+            ct_image.dataset.StudyInstanceUID = first.StudyInstanceUID
+            ct_image.dataset.SeriesInstanceUID = first.SeriesInstanceUID
+            ct_image.dataset.PatientID = first.PatientID
+        else:
+            first = ct_image.dataset
+        ct_image.dataset.PatientName = "TEST^PATIENT"
+        ct_image.dataset.PatientSex = "O"
+        ct_image.dataset.InstanceNumber = str(ind + 1)
+        ct_image.dataset.ImagePositionPatient = ["0.0", "0.0", str(float(ind))]
+        ct_image.add_pixel_data(np.zeros((16, 16), dtype=np.uint16))
+        ct_file = os.path.join(folder, f"{ind + 1:06d}.dcm")
+        ct_image.write_to_file(ct_file)
+        ct_files.append(ct_file)
+    return ct_files
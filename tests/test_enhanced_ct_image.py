@@ -0,0 +1,40 @@
+import numpy as np
+
+from pydicomutils.geometry import VolumeGeometry
+from pydicomutils.IODs.EnhancedCTImage import EnhancedCTImage
+
+
+def build_enhanced_ct_image(pixel_array, **kwargs):
+    enhanced_ct_image = EnhancedCTImage()
+    enhanced_ct_image.create_empty_iod()
+    enhanced_ct_image.initiate()
+    enhanced_ct_image.add_pixel_data(pixel_array, **kwargs)
+    return enhanced_ct_image
+
+
+def pixel_measures(enhanced_ct_image):
+    return enhanced_ct_image.dataset.SharedFunctionalGroupsSequence[
+        0
+    ].PixelMeasuresSequence[0]
+
+
+def test_uint8_pixel_data_stored_in_16_bits():
+    pixel_array = np.arange(4 * 16 * 16).astype(np.uint8).reshape((4, 16, 16))
+    ds = build_enhanced_ct_image(pixel_array).dataset
+    assert (ds.BitsAllocated, ds.BitsStored, ds.HighBit) == (16, 8, 7)
+    assert ds.PixelRepresentation == 0
+    np.testing.assert_array_equal(ds.pixel_array, pixel_array)
+
+
+def test_slice_thickness_not_taken_from_the_slice_spacing():
+    geometry = VolumeGeometry(np.diag([0.5, 0.5, 2.5, 1.0]))
+    pixel_array = np.zeros((4, 16, 16), dtype=np.int16)
+    enhanced_ct_image = build_enhanced_ct_image(pixel_array, geometry=geometry)
+    assert pixel_measures(enhanced_ct_image).SpacingBetweenSlices == 2.5
+    assert pixel_measures(enhanced_ct_image).SliceThickness == 1.0
+    enhanced_ct_image.add_pixel_data(
+        pixel_array, geometry=geometry, slice_thickness=3.0
+    )
+    assert pixel_measures(enhanced_ct_image).SliceThickness == 3.0
+    enhanced_ct_image.add_pixel_data(pixel_array, geometry=geometry)
+    assert pixel_measures(enhanced_ct_image).SliceThickness == 3.0
@@ -0,0 +1,306 @@
+import copy
+import io
+
+import numpy as np
+import pytest
+from pydicom import Dataset, dcmread
+from pydicom.valuerep import PersonName
+
+from pydicomutils.IODs.BasicSRText import BasicSRText
+from pydicomutils.IODs.Comprehensive3DSRTID1500 import Comprehensive3DSRTID1500
+from pydicomutils.IODs.CRImage import CRImage
+from pydicomutils.IODs.CSPS import CSPS
+from pydicomutils.IODs.CTImage import CTImage
+from pydicomutils.IODs.EnhancedCTImage import EnhancedCTImage
+from pydicomutils.IODs.EnhancedSRTID1500 import EnhancedSRTID1500
+from pydicomutils.IODs.GSPS import GSPS
+from pydicomutils.IODs.IOD import IOD, IODTypes
+from pydicomutils.IODs.KOS import KOS
+from pydicomutils.IODs.SCImage import SCImage
+from pydicomutils.IODs.WSMImage import WSMImage
+from pydicomutils.IODs.sequences.ContentItems import code_item
+from pydicomutils.IODs.sequences.Sequences import ConceptCodeSequenceItem
+from pydicomutils.io.fast_writer import _Encoder
+
+LENGTH = ["410668003", "SCT", "Length"]
+NEOPLASM = ["108369006", "SCT", "Neoplasm"]
+LUNG = ["39607008", "SCT", "Lung"]
+LESION = ("L1", "99TEST", "Lésion pulmonaire")
+
+
+def build_image(iod_class, pixel_array, **kwargs):
+    image = iod_class()
+    image.create_empty_iod()
+    image.initiate()
+    image.add_pixel_data(pixel_array, **kwargs)
+    return image
+
+
+def build_presentation_state(iod_class, referenced_dcm_files):
+    presentation_state = iod_class()
+    presentation_state.create_empty_iod()
+    presentation_state.initiate(referenced_dcm_files)
+    presentation_state.add_graphical_layer("TEST", 1)
+    presentation_state.add_graphic_object(
+        referenced_dcm_files[0],
+        "TEST",
+        [1.0, 1.0, 10.0, 1.0, 10.0, 10.0],
+        "POLYLINE",
+        cielab_value=[65535, 32768, 32768],
+    )
+    presentation_state.add_text_object(
+        referenced_dcm_files[1], "TEST", "Finding", [5.0, 5.0]
+    )
+    return presentation_state
+
+
+def build_basic_sr_text(referenced_dcm_files):
+    basic_sr_text = BasicSRText()
+    basic_sr_text.create_empty_iod()
+    basic_sr_text.initiate(referenced_dcm_files[:1])
+    basic_sr_text.add_text_node("Finding in free text", ["121071", "DCM", "Finding"])
+    return basic_sr_text
+
+
+def build_comprehensive_sr(referenced_dcm_files):
+    # there is no IOD class for the Comprehensive SR, it is loaded as an IOD
+    basic_sr_text = build_basic_sr_text(referenced_dcm_files)
+    basic_sr_text.materialize()
+    dataset = copy.deepcopy(basic_sr_text.dataset)
+    dataset.SOPClassUID = IODTypes.ComprehensiveSR.value
+    return IOD.from_dataset(dataset)
+
+
+def build_enhanced_sr(referenced_dcm_files):
+    enhanced_sr = EnhancedSRTID1500()
+    enhanced_sr.create_empty_iod()
+    enhanced_sr.initiate(referenced_dcm_files)
+    for ind, dcm_file in enumerate(referenced_dcm_files):
+        enhanced_sr.add_linear_measurement_single_axis(
+            dcm_file,
+            12.5 + ind,
+            [1.0, 1.0, 4.0, 4.0],
+            LENGTH,
+            NEOPLASM,
+            LUNG,
+            tracking_uid=f"1.2.826.0.1.3680043.10.1.{ind + 1}",
+        )
+    return enhanced_sr
+
+
+def build_comprehensive_3d_sr(referenced_dcm_files):
+    comprehensive_3d_sr = Comprehensive3DSRTID1500(referenced_dcm_files)
+    for ind, dcm_file in enumerate(referenced_dcm_files):
+        comprehensive_3d_sr.add_qualitative_finding(
+            dcm_file,
+            ConceptCodeSequenceItem(*NEOPLASM),
+            finding_site=ConceptCodeSequenceItem(*LUNG),
+            location_data=[2.0, 2.0],
+            location_type="POINT",
+            tracking_uid=f"1.2.826.0.1.3680043.10.2.{ind + 1}",
+        )
+    return comprehensive_3d_sr
+
+
+def build_kos(referenced_dcm_files):
+    kos = KOS()
+    kos.create_empty_iod()
+    kos.initiate(referenced_dcm_files)
+    kos.add_key_documents(referenced_dcm_files)
+    return kos
+
+
+"""Builders of one instance of each IOD, by IOD type
+"""
+BUILDERS = {
+    IODTypes.CRImage: lambda refs: build_image(
+        CRImage, np.zeros((16, 16), dtype=np.uint16)
+    ),
+    IODTypes.CTImage: lambda refs: build_image(
+        CTImage, np.zeros((16, 16), dtype=np.uint16)
+    ),
+    IODTypes.EnhancedCTImage: lambda refs: build_image(
+        EnhancedCTImage, np.zeros((4, 16, 16), dtype=np.uint16)
+    ),
+    IODTypes.SCImage: lambda refs: build_image(
+        SCImage, np.zeros((16, 16, 3), dtype=np.uint8), photometric_interpretation="RGB"
+    ),
+    IODTypes.GSPS: lambda refs: build_presentation_state(GSPS, refs),
+    IODTypes.CSPS: lambda refs: build_presentation_state(CSPS, refs),
+    IODTypes.BasicTextSR: build_basic_sr_text,
+    IODTypes.EnhancedSR: build_enhanced_sr,
+    IODTypes.ComprehensiveSR: build_comprehensive_sr,
+    IODTypes.Comprehensive3DSR: build_comprehensive_3d_sr,
+    IODTypes.KOS: build_kos,
+    IODTypes.WSMImage: lambda refs: build_image(
+        WSMImage,
+        np.zeros((64, 64, 3), dtype=np.uint8),
+        photometric_interpretation="RGB",
+        pixel_spacing=[0.0005, 0.0005],
+        tile_size=(32, 32),
+    ),
+}
+
+
+def assert_written_as_by_dcmwrite(iod):
+    assert iod.to_bytes(fast=True) == iod.to_bytes()
+    assert iod.to_bytes(fast=True, deflate=True) == iod.to_bytes(deflate=True)
+
+
+def reload(iod):
+    return dcmread(io.BytesIO(iod.to_bytes()))
+
+
+def test_all_iod_types_have_a_builder():
+    assert set(BUILDERS) == set(IODTypes)
+
+
+@pytest.mark.parametrize("iod_type", list(IODTypes), ids=lambda iod_type: iod_type.name)
+def test_built_iod(reference_ct_files, iod_type):
+    assert_written_as_by_dcmwrite(BUILDERS[iod_type](reference_ct_files))
+
+
+@pytest.mark.parametrize("iod_type", list(IODTypes), ids=lambda iod_type: iod_type.name)
+def test_iod_from_dataset(reference_ct_files, iod_type):
+    iod = IOD.from_dataset(reload(BUILDERS[iod_type](reference_ct_files)))
+    assert_written_as_by_dcmwrite(iod)
+
+
+@pytest.mark.parametrize(
+    "iod_class, build",
+    [
+        (EnhancedSRTID1500, build_enhanced_sr),
+        (Comprehensive3DSRTID1500, build_comprehensive_3d_sr),
+    ],
+)
+@pytest.mark.parametrize("new_instance", [False, True])
+def test_loaded_report(reference_ct_files, iod_class, build, new_instance):
+    report = iod_class.from_dataset(
+        reload(build(reference_ct_files)), new_instance=new_instance
+    )
+    assert_written_as_by_dcmwrite(report)
+
+
+@pytest.mark.parametrize(
+    "iod_class, build",
+    [
+        (EnhancedSRTID1500, build_enhanced_sr),
+        (Comprehensive3DSRTID1500, build_comprehensive_3d_sr),
+    ],
+)
+def test_report_from_dicom_json(reference_ct_files, iod_class, build):
+    report = iod_class.from_dicom_json(
+        build(reference_ct_files).to_dicom_json(), new_instance=False
+    )
+    assert_written_as_by_dcmwrite(report)
+
+
+def test_edited_report(reference_ct_files):
+    report = EnhancedSRTID1500.from_dataset(
+        reload(build_enhanced_sr(reference_ct_files))
+    )
+    (replacement,) = report.create_measurement_groups(
+        {
+            "dcm_ref": reference_ct_files[:1],
+            "linear_measurement": [7.0],
+            "graphic_data": [[1.0, 1.0, 3.0, 3.0]],
+            "tracking_uid": ["1.2.826.0.1.3680043.10.1.9"],
+        },
+        measurement_type=LENGTH,
+        finding=NEOPLASM,
+        finding_site=LUNG,
+    )
+    report.replace_group("1.2.826.0.1.3680043.10.1.2", replacement)
+    report.remove_group("1.2.826.0.1.3680043.10.1.3")
+    report.add_linear_measurement_single_axis(
+        reference_ct_files[0], 3.0, [1.0, 1.0, 2.0, 2.0], LENGTH, NEOPLASM, LUNG
+    )
+    report.get_group("1.2.826.0.1.3680043.10.1.4").append(
+        code_item("CONTAINS", LESION, LESION)
+    )
+    assert_written_as_by_dcmwrite(report)
+
+
+@pytest.mark.parametrize(
+    "specific_character_set, patient_name",
+    [
+        (None, "Doe^John"),
+        ("ISO_IR 100", "Müller^Jürgen"),
+        ("ISO_IR 192", "Müller^Jürgen"),
+        (["", "ISO 2022 IR 87"], "Yamada^Tarou=山田^太郎=やまだ^たろう"),
+    ],
+)
+def test_values_encoded_by_pydicom(specific_character_set, patient_name):
+    ct_image = build_image(CTImage, np.zeros((16, 16), dtype=np.uint16))
+    ds = ct_image.dataset
+    if specific_character_set is not None:
+        ds.SpecificCharacterSet = specific_character_set
+    # person names, as str, as PersonName and multi-valued
+    ds.PatientName = patient_name
+    ds.ReferringPhysicianName = PersonName(patient_name)
+    ds.OtherPatientNames = [patient_name, "Roe^Jane"]
+    ds.StudyDescription = patient_name.replace("^", " ")
+    # attribute tags
+    ds.FrameIncrementPointer = [0x00181063, 0x00181065]
+    # VRs that depend on other elements, US or SS by PixelRepresentation
+    ds.SmallestImagePixelValue = 0
+    ds.LargestImagePixelValue = 4095
+    # a sequence and an item of undefined length, with a nested character set
+    item = Dataset()
+    item.SpecificCharacterSet = "ISO_IR 100"
+    item.PatientName = "Ångström^Anders"
+    item.ReferencedSOPClassUID = IODTypes.CTImage.value
+    item.ReferencedSOPInstanceUID = "1.2.826.0.1.3680043.10.3"
+    item.is_undefined_length_sequence_item = True
+    ds.ReferencedImageSequence = [item]
+    ds["ReferencedImageSequence"].is_undefined_length = True
+    assert_written_as_by_dcmwrite(ct_image)
+
+
+def test_report_with_nested_character_sets(reference_ct_files):
+    report = build_enhanced_sr(reference_ct_files)
+    report.dataset.SpecificCharacterSet = "ISO_IR 100"
+    report = EnhancedSRTID1500.from_dataset(reload(report))
+    # the same code item in groups encoded with different character sets
+    group = report.get_group("1.2.826.0.1.3680043.10.1.1")
+    group.dataset.SpecificCharacterSet = "ISO_IR 192"
+    group.append(code_item("CONTAINS", LESION, LESION))
+    report.get_group("1.2.826.0.1.3680043.10.1.2").append(
+        code_item("CONTAINS", LESION, LESION)
+    )
+    assert_written_as_by_dcmwrite(report)
+
+
+def test_items_encoded_per_character_set():
+    item = (("CodeValue", LESION[0]), ("CodeMeaning", LESION[2]))
+    encoder = _Encoder()
+    latin_1 = encoder.encode_item(item, ("ISO_IR 100",))
+    utf_8 = encoder.encode_item(item, ("ISO_IR 192",))
+    assert latin_1 != utf_8
+    assert latin_1 == _Encoder().encode_item(item, ("ISO_IR 100",))
+    assert utf_8 == _Encoder().encode_item(item, ("ISO_IR 192",))
+
+
+@pytest.mark.parametrize(
+    "iod_class, build, tracking_uid",
+    [
+        (EnhancedSRTID1500, build_enhanced_sr, "1.2.826.0.1.3680043.10.1.1"),
+        (
+            Comprehensive3DSRTID1500,
+            build_comprehensive_3d_sr,
+            "1.2.826.0.1.3680043.10.2.1",
+        ),
+    ],
+)
+def test_new_instance_leaves_dataset_unchanged(
+    reference_ct_files, iod_class, build, tracking_uid
+):
+    dataset = reload(build(reference_ct_files))
+    original = copy.deepcopy(dataset)
+    report = iod_class.from_dataset(dataset)
+    report.remove_group(tracking_uid)
+    report.to_bytes()
+    assert report.dataset.SOPInstanceUID != dataset.SOPInstanceUID
+    assert dataset == original
+    assert dataset.file_meta == original.file_meta
+    assert "PredecessorDocumentsSequence" not in dataset
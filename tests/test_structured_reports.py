@@ -0,0 +1,60 @@
+import pytest
+
+from pydicomutils.IODs.EnhancedSRTID1500 import EnhancedSRTID1500
+
+NEOPLASM = ["108369006", "SCT", "Neoplasm"]
+LUNG = ["39607008", "SCT", "Lung"]
+
+
+@pytest.fixture
+def enhanced_sr(reference_ct_files):
+    enhanced_sr = EnhancedSRTID1500()
+    enhanced_sr.create_empty_iod()
+    enhanced_sr.initiate(reference_ct_files)
+    return enhanced_sr
+
+
+def test_group_filled_in_after_it_was_added(enhanced_sr):
+    group = enhanced_sr.initiate_measurement_group()
+    enhanced_sr.imaging_measurements.append(group)
+    group.extend(
+        enhanced_sr.initiate_content_sequence("Lesion 1", "5.5.5", NEOPLASM, LUNG)
+    )
+    assert enhanced_sr.get_group(tracking_uid="5.5.5") is group
+    assert enhanced_sr.get_group(tracking_id="Lesion 1") is group
+    assert enhanced_sr.remove_group("5.5.5") is group
+    assert enhanced_sr.get_group(tracking_uid="5.5.5") is None
+    assert len(enhanced_sr.imaging_measurements.children) == 0
+
+
+def test_group_filled_in_with_an_existing_tracking_uid(enhanced_sr):
+    for tracking_id in ["Lesion 1", "Lesion 2"]:
+        group = enhanced_sr.initiate_measurement_group()
+        enhanced_sr.imaging_measurements.append(group)
+        group.extend(
+            enhanced_sr.initiate_content_sequence(tracking_id, "5.5.5", NEOPLASM, LUNG)
+        )
+    with pytest.raises(ValueError, match="5.5.5 already exists"):
+        enhanced_sr.get_group(tracking_uid="5.5.5")
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("linear_measurement", 12.5),
+        ("linear_measurement_axis2", 8.0),
+        ("landmark_graphic_data", [2.0, 2.0]),
+        ("unmeasurable_reason", "Obscured"),
+        ("graphic_data_center", [2.0, 2.0]),
+    ],
+)
+def test_measurements_on_an_image_without_dcm_ref(
+    enhanced_sr, reference_ct_files, name, value
+):
+    measurements = {
+        "dcm_ref": [reference_ct_files[0], None],
+        name: [value, value],
+    }
+    with pytest.raises(ValueError, match=f"Row 1 has a {name} but no dcm_ref"):
+        enhanced_sr.add_measurements(measurements, finding=NEOPLASM, finding_site=LUNG)
+    assert len(enhanced_sr.imaging_measurements.children) == 0